@@ -5,4 +5,7 @@ from .training_adapter import TrainingAdapter
 from .llm_adapter import LLMAdapter
 from .llm_data_adapter import LLMDataAdapter
 from .redis_adapter import RedisAdapter
-from .feed_adapter import FeedAdapter
\ No newline at end of file
+from .feed_adapter import FeedAdapter
+from .sync_job_adapter import SyncJobAdapter
+from .feed_cache_adapter import FeedCacheAdapter
+from .token_cache_adapter import StravaTokenCacheAdapter
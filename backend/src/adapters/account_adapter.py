@@ -11,8 +11,10 @@ from config.settings import security
 from config.exceptions import InternalError, NotFoundError, ValidationError, CustomError
 
 class AccountAdapter(AccountPort):
-    def __init__(self,db:AsyncSession):
+    def __init__(self, db:AsyncSession, read_db:AsyncSession = None):
         self.db = db
+        # 조회 전용 (replica). 없으면 primary
+        self.read_db = read_db if read_db is not None else db
     
     async def create_account(self, email: str, pwd: str, name: str, provider: str = "local") -> AccountResponse:
         """계정 생성. 
@@ -74,6 +76,7 @@ class AccountAdapter(AccountPort):
     async def get_account_by_id(self, user_id: UUID) -> AccountResponse:
         """사용자 ID로 유저정보 조회"""
         try:
+            # /me 는 etag 로 캐시. primary
             user = await repo.get_user_by_id(user_id=user_id, db=self.db)
             if not user:
                 raise NotFoundError(detail=f"User {user_id} not found")
@@ -96,7 +99,7 @@ class AccountAdapter(AccountPort):
     async def get_user_info_by_id(self, user_id:UUID)->UserInfoData : 
         try:
             return await repo.get_user_info(user_id=user_id,
-                                            db=self.db)
+                                            db=self.read_db)
         except CustomError:
             raise
         except Exception as e:
@@ -1,7 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from typing import List, Optional
-from schemas.models import FeedResponse
+from typing import List, Optional, Tuple
+from schemas.models import FeedResponse, FeedLikeResponse
 from datetime import datetime
 
 from ports.feed_port import FeedPort
@@ -10,8 +10,11 @@ from infra.db.orm.models import Feed, FeedLikes
 from config.exceptions import CustomError, InternalError, NotFoundError
 
 class FeedAdapter(FeedPort):
-    def __init__(self, db:AsyncSession):
+    def __init__(self, db:AsyncSession, read_db:AsyncSession = None):
         self.db = db
+        # 조회 전용 (replica). 없으면 primary
+        # 캐시 미스 페이지 조회만 replica. 상세 (etag) / 내 좋아요 (쓰기 직후 확인) 는 primary
+        self.read_db = read_db if read_db is not None else db
 
     async def create_feed(self,
                             user_id: UUID,
@@ -47,10 +50,10 @@ class FeedAdapter(FeedPort):
         '''피드 수정'''
         ...
 
-    async def delete_feed(self, feed_id: UUID) -> bool:
-        '''피드 삭제'''
+    async def delete_feed(self, user_id: UUID, feed_id: UUID) -> bool:
+        '''피드 삭제. 작성자 본인 피드만'''
         try:
-            return await repo.delete_feed(db=self.db, feed_id=feed_id)
+            return await repo.delete_feed(db=self.db, feed_id=feed_id, user_id=user_id)
         except CustomError:
             raise
         except Exception as e:
@@ -87,13 +90,18 @@ class FeedAdapter(FeedPort):
             raise InternalError(context="error get_feed", original_exception=e)
         
 
-    async def get_feeds_with_likes(self,user_id: UUID,offset: int = 0,limit: int = 20) -> List[FeedResponse]:
-        '''피드 리스트 받기'''
+    async def get_feeds_with_likes(self,user_id: UUID,
+                                   cursor: Optional[Tuple[datetime, UUID]] = None,
+                                   limit: int = 20,
+                                   replica: bool = False) -> List[FeedResponse]:
+        '''피드 리스트 받기. cursor 이후 (created_at, id 역순)
+            replica: 쓰기 직후가 아닌 캐시 미스 조회만 True
+        '''
         try:
             feeds = await repo.get_feeds_with_likes(
-                                    db=self.db,
+                                    db=self.read_db if replica else self.db,
                                     user_id=user_id,
-                                    offset=offset,
+                                    cursor=cursor,
                                     limit=limit
                                     )
             
@@ -121,27 +129,48 @@ class FeedAdapter(FeedPort):
             raise InternalError(context="error get_feeds_with_likes", original_exception=e)
         
 
-    async def create_feed_like(self, user_id: UUID, feed_id: UUID) -> bool:
-        '''피드 좋아요'''
+    async def get_liked_feed_ids(self, user_id: UUID, feed_ids: List[UUID]) -> set[UUID]:
+        '''feed_ids 중 사용자가 좋아요 한 피드'''
         try:
-            return await repo.create_feed_like(db=self.db,
+            return await repo.get_liked_feed_ids(db=self.db, user_id=user_id, feed_ids=feed_ids)
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context="error get_liked_feed_ids", original_exception=e)
+
+    async def create_feed_like(self, user_id: UUID, feed_id: UUID) -> FeedLikeResponse:
+        '''피드 좋아요. 증가된 좋아요 수 반환'''
+        try:
+            likes_count = await repo.create_feed_like(db=self.db,
                                                user_id=user_id,
                                                feed_id=feed_id
                                                )
+            return FeedLikeResponse(feed_id=feed_id, likes_count=likes_count, my_like=True)
         except CustomError:
             raise
         except Exception as e:
             raise InternalError(context="error create_feed_like", original_exception=e)
 
-    async def delete_feed_like(self, user_id: UUID, feed_id: UUID) -> bool:
-        '''피드 좋아요 해제'''
+    async def delete_feed_like(self, user_id: UUID, feed_id: UUID) -> Tuple[bool, FeedLikeResponse]:
+        '''피드 좋아요 해제. (삭제 여부, 좋아요 수)'''
         try:
-            return await repo.delete_feed_like(db=self.db,
+            removed, likes_count = await repo.delete_feed_like(db=self.db,
                                                user_id=user_id,
                                                feed_id=feed_id
                                                )
+            if likes_count is None:
+                raise NotFoundError(detail=f"requested feed does not exist")
+            return removed, FeedLikeResponse(feed_id=feed_id, likes_count=likes_count, my_like=False)
         except CustomError:
             raise
         except Exception as e:
             raise InternalError(context="error delete_feed_like", original_exception=e)
-        
+
+    async def reconcile_likes_count(self) -> int:
+        '''likes_count 재계산. 수정된 피드 수 반환'''
+        try:
+            return await repo.reconcile_likes_count(db=self.db)
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context="error reconcile_likes_count", original_exception=e)
@@ -0,0 +1,79 @@
+from redis.asyncio import Redis
+
+from ports.feed_cache_port import FeedCachePort
+from infra.db.redis import repo
+from schemas.models import FeedPageResponse
+from config.exceptions import InternalError, CustomError
+from config.settings import feed, db
+
+VERSION_KEY = "feed:cache:version"
+WRITTEN_KEY = "feed:cache:written"
+
+
+class FeedCacheAdapter(FeedCachePort):
+    """redis 피드 페이지 캐시. 모든 사용자 공유 (my_like 는 저장하지 않음)
+        feed:cache:version                         - 캐시 세대. 쓰기시 증가하면 이전 페이지는 모두 무효
+        feed:cache:written                         - 쓰기 직후 표시 (db.read_lag_sec). 있는 동안 캐시 미스는 primary 조회
+        feed:cache:{version}:{cursor}:{page_size}  - 페이지 json (ttl)
+    """
+    def __init__(self, db:Redis):
+        self.db = db
+
+    @staticmethod
+    def _page_key(version:str, cursor:str | None, page_size:int) -> str:
+        return f"feed:cache:{version}:{cursor or 'first'}:{page_size}"
+
+    async def get_version(self) -> str:
+        try:
+            return str(await repo.get_value(redisdb=self.db, k=VERSION_KEY) or 0)
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context="adapter get feed cache version", original_exception=e)
+
+    async def get_page(self, version:str, cursor:str | None, page_size:int) -> FeedPageResponse | None:
+        try:
+            raw = await repo.get_value(redisdb=self.db,
+                                       k=self._page_key(version=version, cursor=cursor, page_size=page_size))
+            if raw is None:
+                return None
+            return FeedPageResponse.model_validate_json(raw)
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context=f"adapter get feed page {cursor}", original_exception=e)
+
+    async def set_page(self, version:str, cursor:str | None, page_size:int, page:FeedPageResponse):
+        """db 조회 전에 읽은 version 으로 저장
+            조회 중 쓰기로 세대가 올라가면 이전 세대 키에 저장되어 새 세대 독자에게 노출되지 않음
+        """
+        try:
+            shared = page.model_copy(deep=True)
+            for item in shared.data:
+                item.my_like = False
+            await repo.set_value(redisdb=self.db,
+                                 k=self._page_key(version=version, cursor=cursor, page_size=page_size),
+                                 v=shared.model_dump_json(),
+                                 ttl=feed.cache_ttl)
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context=f"adapter set feed page {cursor}", original_exception=e)
+
+    async def recently_written(self) -> bool:
+        try:
+            return await repo.get_value(redisdb=self.db, k=WRITTEN_KEY) is not None
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context="adapter get feed written", original_exception=e)
+
+    async def invalidate(self):
+        """세대 증가 + 쓰기 직후 표시. replica 가 따라오기 전 데이터가 새 세대로 캐시되지 않도록"""
+        try:
+            await repo.set_value(redisdb=self.db, k=WRITTEN_KEY, v="1", ttl=db.read_lag_sec)
+            await repo.incr_value(redisdb=self.db, k=VERSION_KEY)
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context="adapter invalidate feed cache", original_exception=e)
@@ -13,8 +13,10 @@ from config.exceptions import InternalError, CustomError
 from config.constants import LLM_LIMIT_DAY
 
 class LLMDataAdapter(LLMDataPort):
-    def __init__(self, db:AsyncSession):
+    def __init__(self, db:AsyncSession, read_db:AsyncSession = None):
         self.db = db
+        # 조회 전용 (replica). 없으면 primary
+        self.read_db = read_db if read_db is not None else db
 
     async def save_llm_result(self, user_id:UUID, 
                               llm_sessions:List[dict], 
@@ -45,6 +47,7 @@ class LLMDataAdapter(LLMDataPort):
 
     async def get_llm_predict(self, user_id:UUID, )->Optional[LLMResponse] :
         try:
+            # /ai/get 은 etag 로 캐시. primary
             saved = await repo.get_llm_predict_by_user_id(db=self.db, user_id=user_id)
 
             if saved:
@@ -1,5 +1,6 @@
 from redis.asyncio import Redis
 from uuid import UUID
+import time
 from ports.redis_port import RedisPort
 from infra.db.redis import repo
 from config.exceptions import InternalError, CustomError
@@ -10,16 +11,18 @@ class RedisAdapter(RedisPort):
         self.db = db
 
     
-    ## 유저+페이지별 etag 키 생성
-    def _etag_key(self, user_id: UUID, page: str) -> str:
+    ## 유저+페이지별 etag 키 생성. user_id 없으면 전체 사용자 공용
+    def _etag_key(self, user_id: UUID | None, page: str) -> str:
+        if user_id is None:
+            return f"page:{page}:etag"
         return f"user:{user_id}:page:{page}:etag"
 
-    async def set_user_etag(self, user_id: UUID, page: str, etag: str):
+    async def set_user_etag(self, user_id: UUID, page: str, etag: str, ttl: int = None):
         try:
             await repo.set_value(redisdb=self.db,
                                  k=self._etag_key(user_id=user_id, page=page),
                                  v=etag,
-                                #  ttl=ETAG_TTL_SEC
+                                 ttl=ttl
                                  )
         except CustomError:
             raise
@@ -55,7 +58,53 @@ class RedisAdapter(RedisPort):
                 original_exception=e
         )
     
-    async def incr_etag_version(self, user_id:UUID, page:str)->str:
+    ## 기간(window)별 etag. 조회 당시 버전 + 내용 etag + 응답 본문
+    def _window_key(self, user_id: UUID, page: str, window: str) -> str:
+        return f"user:{user_id}:page:{page}:window:{window}"
+
+    async def get_window_etag(self, user_id:UUID, page:str, window:str) -> dict | None:
+        """{"version": str, "etag": str, "body": str}. 없으면 None"""
+        try:
+            res = await repo.get_hash(redisdb=self.db,
+                                      k=self._window_key(user_id=user_id, page=page, window=window))
+            return res or None
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context=f"adapter get_window_etag {user_id} {page} {window}", original_exception=e)
+
+    async def set_window_etag(self, user_id:UUID, page:str, window:str,
+                              version:str, etag:str, body:str = None, ttl:int = ETAG_TTL_SEC):
+        try:
+            mapping = {"version": version, "etag": etag}
+            if body is not None:
+                mapping["body"] = body
+            await repo.set_hash(redisdb=self.db,
+                                k=self._window_key(user_id=user_id, page=page, window=window),
+                                mapping=mapping,
+                                ttl=ttl)
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context=f"adapter set_window_etag {user_id} {page} {window}", original_exception=e)
+
+    async def get_or_init_etag_version(self, user_id:UUID | None, page:str)->str:
+        """etag 버전 조회. 없으면 현재 시각(ns)으로 초기화
+            redis 초기화 후 1부터 다시 시작하면 이전 버전 etag 와 겹칠 수 있음
+        """
+        try:
+            key = self._etag_key(user_id=user_id, page=page)
+            await repo.set_value_nx(redisdb=self.db, k=key, v=str(time.time_ns()))
+            return str(await repo.get_value(redisdb=self.db, k=key))
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(
+                context=f"adapter get_or_init_etag_version {user_id} {page}",
+                original_exception=e
+        )
+
+    async def incr_etag_version(self, user_id:UUID | None, page:str)->str:
         """etag 버전 값 증가 """
         try:
             new_version = await repo.incr_value(
@@ -0,0 +1,220 @@
+from redis.asyncio import Redis
+from uuid import UUID, uuid4
+from datetime import datetime, timezone
+
+from ports.sync_job_port import SyncJobPort
+from infra.db.redis import repo
+from schemas.models import SyncJobResponse
+from config.exceptions import InternalError, CustomError
+from config.constants import (SYNC_JOB_TTL_SEC, SYNC_JOB_LEASE_SEC, SYNC_JOB_QUEUED, SYNC_JOB_RUNNING,
+                              SYNC_JOB_DONE, SYNC_JOB_FAILED, SYNC_JOB_MAX_DEFER_SEC, SYNC_JOB_MAX_DEFERS)
+
+QUEUE_KEY = "sync:queue"
+PROCESSING_KEY = "sync:processing"
+DELAYED_KEY = "sync:delayed"
+
+
+class SyncJobAdapter(SyncJobPort):
+    """redis 리스트 기반 sync 작업 큐
+        sync:queue            - 대기중인 job_id 리스트
+        sync:processing       - worker 가 꺼낸 job_id 리스트. 완료/실패시 제거
+        sync:lease:{job_id}   - 실행중 lease (SYNC_JOB_LEASE_SEC). worker 가 죽으면 만료되어 recover 에서 재등록
+        sync:delayed          - 미뤄진 job_id 정렬 집합 (score = 재실행 시각). 시각이 되면 대기열로
+        sync:job:{job_id}     - 작업 상태 hash
+        sync:user:{user_id}   - 사용자별 진행중 job_id (중복 등록 방지)
+    """
+    def __init__(self, db:Redis):
+        self.db = db
+
+    def _job_key(self, job_id:str) -> str:
+        return f"sync:job:{job_id}"
+
+    def _user_key(self, user_id:UUID) -> str:
+        return f"sync:user:{user_id}"
+
+    def _lease_key(self, job_id:str) -> str:
+        return f"sync:lease:{job_id}"
+
+    def _now(self) -> int:
+        return int(datetime.now(timezone.utc).timestamp())
+
+    def _to_job(self, job_id:str, data:dict) -> SyncJobResponse:
+        return SyncJobResponse(
+            job_id=job_id,
+            user_id=data["user_id"],
+            status=data["status"],
+            start_date=data.get("start_date") or None,
+            created_at=data["created_at"],
+            finished_at=data.get("finished_at") or None,
+            error=data.get("error") or None,
+            retry_at=data.get("retry_at") or None,
+        )
+
+    async def _update(self, job:SyncJobResponse, **fields):
+        await repo.set_hash(redisdb=self.db, k=self._job_key(job.job_id),
+                            mapping=fields, ttl=SYNC_JOB_TTL_SEC)
+        for k, v in fields.items():
+            setattr(job, k, v)
+
+    async def _ack(self, job:SyncJobResponse):
+        """처리중 목록 / lease 정리 (완료, 실패)"""
+        await repo.remove_value(redisdb=self.db, k=PROCESSING_KEY, v=job.job_id)
+        await repo.delete_key(redisdb=self.db, k=self._lease_key(job.job_id))
+
+    async def _release_user(self, job:SyncJobResponse):
+        """사용자 중복방지 키 해제 (해당 작업이 잡고 있을 때만)"""
+        user_key = self._user_key(job.user_id)
+        if await repo.get_value(redisdb=self.db, k=user_key) == job.job_id:
+            await repo.delete_key(redisdb=self.db, k=user_key)
+
+    async def enqueue(self, user_id:UUID, start_date:int = None) -> SyncJobResponse:
+        try:
+            job_id = uuid4().hex
+            if not await repo.set_value_nx(redisdb=self.db, k=self._user_key(user_id),
+                                           v=job_id, ttl=SYNC_JOB_TTL_SEC):
+                # 이미 진행중인 작업
+                existing = await repo.get_value(redisdb=self.db, k=self._user_key(user_id))
+                job = await self.get_job(existing) if existing else None
+                if job is not None:
+                    return job
+                # 작업 정보가 만료된 경우 새로 등록
+                await repo.set_value(redisdb=self.db, k=self._user_key(user_id),
+                                     v=job_id, ttl=SYNC_JOB_TTL_SEC)
+
+            data = {
+                "user_id": str(user_id),
+                "status": SYNC_JOB_QUEUED,
+                "start_date": "" if start_date is None else start_date,
+                "created_at": self._now(),
+            }
+            await repo.set_hash(redisdb=self.db, k=self._job_key(job_id),
+                                mapping=data, ttl=SYNC_JOB_TTL_SEC)
+            await repo.push_value(redisdb=self.db, k=QUEUE_KEY, v=job_id)
+            return self._to_job(job_id, data)
+
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context=f"adapter enqueue sync job {user_id}", original_exception=e)
+
+    async def get_job(self, job_id:str) -> SyncJobResponse | None:
+        try:
+            data = await repo.get_hash(redisdb=self.db, k=self._job_key(job_id))
+            if not data:
+                return None
+            return self._to_job(job_id, data)
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context=f"adapter get sync job {job_id}", original_exception=e)
+
+    async def dequeue(self, timeout:int = 5) -> SyncJobResponse | None:
+        try:
+            job_id = await repo.move_value_blocking(redisdb=self.db, src=QUEUE_KEY, dst=PROCESSING_KEY,
+                                                    timeout=timeout)
+            if job_id is None:
+                return None
+            await repo.set_value(redisdb=self.db, k=self._lease_key(job_id), v="1", ttl=SYNC_JOB_LEASE_SEC)
+            job = await self.get_job(job_id)
+            if job is None:
+                # 작업 정보 만료. 처리중 목록에서 제거
+                await repo.remove_value(redisdb=self.db, k=PROCESSING_KEY, v=job_id)
+                await repo.delete_key(redisdb=self.db, k=self._lease_key(job_id))
+            return job
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context="adapter dequeue sync job", original_exception=e)
+
+    async def renew_lease(self, job:SyncJobResponse):
+        try:
+            await repo.set_value(redisdb=self.db, k=self._lease_key(job.job_id), v="1", ttl=SYNC_JOB_LEASE_SEC)
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context=f"adapter renew sync job lease {job.job_id}", original_exception=e)
+
+    async def requeue(self, job:SyncJobResponse):
+        try:
+            await self._requeue(job)
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context=f"adapter requeue sync job {job.job_id}", original_exception=e)
+
+    async def _requeue(self, job:SyncJobResponse) -> bool:
+        await self._update(job, status=SYNC_JOB_QUEUED)
+        # 대기하는 동안 중복 등록 방지 키 유지
+        await repo.set_value(redisdb=self.db, k=self._user_key(job.user_id),
+                             v=job.job_id, ttl=SYNC_JOB_TTL_SEC)
+        moved = await repo.requeue_value(redisdb=self.db, src=PROCESSING_KEY, dst=QUEUE_KEY, v=job.job_id)
+        await repo.delete_key(redisdb=self.db, k=self._lease_key(job.job_id))
+        return moved
+
+    async def defer(self, job:SyncJobResponse, delay:int | None) -> bool:
+        """처리중 작업을 delay 초 뒤로 미루기 (strava 한도 초과). 처리중 목록에서 빼고 lease 해제
+            대기 시간을 모르거나 SYNC_JOB_MAX_DEFER_SEC 초과, 연기 횟수 초과면 미루지 않고 False
+        """
+        try:
+            data = await repo.get_hash(redisdb=self.db, k=self._job_key(job.job_id))
+            defers = int(data.get("defers") or 0)
+            if delay is None or delay > SYNC_JOB_MAX_DEFER_SEC or defers >= SYNC_JOB_MAX_DEFERS:
+                return False
+
+            retry_at = self._now() + delay
+            await repo.set_hash(redisdb=self.db, k=self._job_key(job.job_id),
+                                mapping={"defers": defers + 1}, ttl=SYNC_JOB_TTL_SEC)
+            await self._update(job, status=SYNC_JOB_QUEUED, retry_at=retry_at)
+            await repo.set_value(redisdb=self.db, k=self._user_key(job.user_id),
+                                 v=job.job_id, ttl=SYNC_JOB_TTL_SEC)
+            await repo.add_sorted_value(redisdb=self.db, k=DELAYED_KEY, v=job.job_id, score=retry_at)
+            await self._ack(job)
+            return True
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context=f"adapter defer sync job {job.job_id}", original_exception=e)
+
+    async def promote_delayed(self) -> int:
+        """재실행 시각이 된 미뤄진 작업을 대기열로. 옮긴 작업 수 반환"""
+        try:
+            return await repo.move_due_values(redisdb=self.db, src=DELAYED_KEY, dst=QUEUE_KEY,
+                                              max_score=self._now())
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context="adapter promote delayed sync jobs", original_exception=e)
+
+    async def recover(self) -> int:
+        """worker 가 주기적으로 실행. lease 없는 처리중 작업 = 종료된 worker 가 잡고 있던 작업
+            작업은 멱등 (이미 저장된 활동은 건너뜀) 이라 드물게 중복 실행되어도 안전
+        """
+        try:
+            recovered = 0
+            for job_id in await repo.get_list(redisdb=self.db, k=PROCESSING_KEY):
+                if await repo.get_value(redisdb=self.db, k=self._lease_key(job_id)) is not None:
+                    continue
+                job = await self.get_job(job_id)
+                if job is None:
+                    await repo.remove_value(redisdb=self.db, k=PROCESSING_KEY, v=job_id)
+                    continue
+                if await self._requeue(job):
+                    recovered += 1
+            return recovered
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context="adapter recover sync jobs", original_exception=e)
+
+    async def mark_running(self, job:SyncJobResponse):
+        await self._update(job, status=SYNC_JOB_RUNNING)
+
+    async def mark_done(self, job:SyncJobResponse):
+        await self._update(job, status=SYNC_JOB_DONE, finished_at=self._now())
+        await self._ack(job)
+        await self._release_user(job)
+
+    async def mark_failed(self, job:SyncJobResponse, error:str):
+        await self._update(job, status=SYNC_JOB_FAILED, finished_at=self._now(), error=error)
+        await self._ack(job)
+        await self._release_user(job)
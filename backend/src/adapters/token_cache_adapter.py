@@ -0,0 +1,109 @@
+import time
+from uuid import UUID, uuid4
+from cachetools import TLRUCache
+from redis.asyncio import Redis
+
+from ports.token_cache_port import TokenCachePort
+from infra.db.redis import repo
+from infra.security import decrypt_token
+from config.exceptions import InternalError, CustomError
+from config.settings import strava, security
+
+
+def _local_expiry(key, value, now) -> float:
+    """갱신 시점 (만료 - margin) 과 로컬 ttl 중 빠른 쪽. 다른 replica 의 갱신은 로컬 ttl 안에 반영"""
+    _, expires_at = value
+    return min(expires_at - strava.token_refresh_margin, now + strava.token_cache_local_ttl)
+
+# 프로세스 캐시 (복호화된 토큰). 요청마다 db 조회 + 복호화 없이 반환
+_local = TLRUCache(maxsize=strava.token_cache_size, ttu=_local_expiry, timer=time.time)
+
+
+class StravaTokenCacheAdapter(TokenCachePort):
+    """strava 액세스 토큰 2단 캐시
+        1. 프로세스 LRU  - 복호화된 토큰, min(만료, 로컬 ttl)
+        2. redis         - strava:token:{user_id} 암호화된 토큰 (db 와 동일), 갱신 시점까지 ttl
+        redis 에는 평문 토큰을 두지 않음. 로컬 미스시 redis 값 복호화 (db 조회는 생략)
+        갱신 시점 (만료 - margin) 이 지나면 미스 -> 핸들러에서 갱신
+    strava:token:refresh:{user_id} - replica 간 갱신 락
+    """
+    def __init__(self, db:Redis):
+        self.db = db
+
+    @staticmethod
+    def _key(user_id:UUID) -> str:
+        return f"strava:token:{user_id}"
+
+    @staticmethod
+    def _lock_key(user_id:UUID) -> str:
+        return f"strava:token:refresh:{user_id}"
+
+    async def get(self, user_id:UUID) -> str | None:
+        try:
+            cached = _local.get(user_id)
+            if cached is not None:
+                return cached[0]
+
+            data = await repo.get_hash(redisdb=self.db, k=self._key(user_id))
+            if not data:
+                return None
+            expires_at = int(data["expires_at"])
+            if expires_at - strava.token_refresh_margin <= int(time.time()):
+                return None
+
+            access_token = decrypt_token(token_encrypted=data["access_token"],
+                                         key=security.encryption_key_strava,
+                                         token_type="strava_access")
+            _local[user_id] = (access_token, expires_at)
+            return access_token
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context=f"adapter get strava token cache {user_id}", original_exception=e)
+
+    async def set(self, user_id:UUID, access_token:str, encrypted_access:str, expires_at:int):
+        try:
+            ttl = expires_at - strava.token_refresh_margin - int(time.time())
+            if ttl <= 0:
+                await self.invalidate(user_id)
+                return
+            _local[user_id] = (access_token, expires_at)
+            await repo.set_hash(redisdb=self.db,
+                                k=self._key(user_id),
+                                mapping={"access_token": encrypted_access, "expires_at": expires_at},
+                                ttl=ttl)
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context=f"adapter set strava token cache {user_id}", original_exception=e)
+
+    async def invalidate(self, user_id:UUID):
+        try:
+            _local.pop(user_id, None)
+            await repo.delete_key(redisdb=self.db, k=self._key(user_id))
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context=f"adapter invalidate strava token cache {user_id}", original_exception=e)
+
+    async def acquire_refresh_lock(self, user_id:UUID) -> str | None:
+        try:
+            lock_id = uuid4().hex
+            if await repo.set_value_nx(redisdb=self.db, k=self._lock_key(user_id),
+                                       v=lock_id, ttl=strava.refresh_lock_ttl):
+                return lock_id
+            return None
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context=f"adapter acquire strava refresh lock {user_id}", original_exception=e)
+
+    async def release_refresh_lock(self, user_id:UUID, lock_id:str):
+        try:
+            key = self._lock_key(user_id)
+            if await repo.get_value(redisdb=self.db, k=key) == lock_id:
+                await repo.delete_key(redisdb=self.db, k=key)
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context=f"adapter release strava refresh lock {user_id}", original_exception=e)
@@ -1,5 +1,4 @@
 from typing import List, Tuple
-import asyncio
 from uuid import UUID
 from datetime import datetime, timezone, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -8,14 +7,25 @@ from ports.training_port import TrainingPort
 from schemas.models import (ActivityData, 
                             LapData, 
                             StreamData, 
+                            StreamMetrics,
                             TrainResponse, TrainRequest,
-                            TrainDetailResponse)
+                            TrainDetailResponse,
+                            PersonalRecordResponse)
 from infra.db.storage import activity_repo as repo
-from config.exceptions import InternalError, CustomError
+from infra.db.storage import record_repo
+from infra.db.orm.models import TrainSession, TrainSessionStream
+from infra.etag import session_version
+from infra.stream_codec import decode_stream, decode_stream_arrays, stream_to_arrays, arrays_to_stream
+from domains.stream_downsampler import downsample_stream
+from config.constants import STREAM_PREVIEW_POINTS
+from config.exceptions import InternalError, CustomError, DuplicateError, NotFoundError
 
 class TrainingAdapter(TrainingPort):
-    def __init__(self, db:AsyncSession):
+    def __init__(self, db:AsyncSession, read_db:AsyncSession = None):
         self.db = db
+        # 조회 전용 (replica). 없으면 primary
+        # etag 버전에 묶이는 조회 (스케줄, 세부정보, lap, stream) 는 primary, 기록 / llm 입력은 replica
+        self.read_db = read_db if read_db is not None else db
     
     async def save_session(self, user_id:UUID, 
                      activity:ActivityData,
@@ -40,6 +50,11 @@ class TrainingAdapter(TrainingPort):
             # )
             await repo.add_train_session_stream(db=self.db,session_id=session.id,stream=stream)
             await repo.add_train_session_lap(db=self.db,session_id=session.id,laps=laps)
+            if activity.metrics is not None:
+                await repo.add_train_session_metric(db=self.db,session_id=session.id,metrics=activity.metrics)
+                await record_repo.update_personal_records(db=self.db,
+                                                          user_id=user_id,
+                                                          candidates=[(session.id, session.train_date, activity.metrics.best_efforts)])
             
             return True
             
@@ -48,6 +63,38 @@ class TrainingAdapter(TrainingPort):
         except Exception as e:
             raise InternalError(context="error save_session", original_exception=e)
         
+
+    async def save_sessions(self, user_id:UUID,
+                            sessions:List[Tuple[ActivityData, List[LapData], StreamData]]
+                            )->int:
+        """여러 훈련 세션 (TrainSession , Stream, Lap) 한번의 트랜잭션으로 저장
+            동시 sync 로 중복이 생긴 경우 이미 저장된 활동을 빼고 나머지를 다시 한번에 저장
+            return: 저장된 세션 수
+        """
+        try:
+            while sessions:
+                try:
+                    return await repo.add_train_sessions_bulk(db=self.db,
+                                                              user_id=user_id,
+                                                              sessions=sessions)
+                except DuplicateError:
+                    existing = await self.get_existing_activity_ids(
+                                                user_id=user_id,
+                                                provider="strava",
+                                                activity_ids=[a.activity_id for a, _, _ in sessions
+                                                              if a.provider == "strava"])
+                    remaining = [s for s in sessions
+                                 if not (s[0].provider == "strava" and s[0].activity_id in existing)]
+                    # 이 사용자 세션으로 설명되지 않는 중복 (다른 계정에 연결된 같은 활동)
+                    if len(remaining) == len(sessions):
+                        raise
+                    sessions = remaining
+            return 0
+
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context="error save_sessions", original_exception=e)
         
     async def upload_session(self, user_id:UUID, 
                      session:TrainRequest = None,
@@ -104,28 +151,122 @@ class TrainingAdapter(TrainingPort):
         except Exception as e:
             raise InternalError(context="error get_session_by_activity_id", original_exception=e)
         
-    async def get_session_detail(self, user_id:UUID, session_id:UUID)->TrainDetailResponse:
-        """훈련 세션 세부 정보 받기 (stream, Lap)"""
+    async def get_existing_activity_ids(self, user_id:UUID, provider:str, activity_ids:List[int])->set[int]:
+        """이미 저장된 activity_id 조회 (중복 확인용)"""
         try:
-            laps_orm, stream_orm = await asyncio.gather(
-                repo.get_train_session_laps(user_id=user_id, session_id=session_id, db=self.db),
-                repo.get_train_session_stream(user_id=user_id, session_id=session_id, db=self.db)
-            )
+            return await repo.get_existing_activity_ids(user_id=user_id,
+                                                        provider=provider,
+                                                        activity_ids=activity_ids,
+                                                        db=self.db
+                                                        )
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context="error get_existing_activity_ids", original_exception=e)
+        
+    async def _get_owned_session(self, user_id:UUID, session_id:UUID) -> TrainSession:
+        """세부 정보 조회 공통 소유권 확인"""
+        session = await repo.get_owned_train_session(user_id=user_id, session_id=session_id, db=self.db)
+        if session is None:
+            raise NotFoundError(context=f"invalid session id {session_id}")
+        return session
+
+    async def get_session_detail(self, user_id:UUID, session_id:UUID,
+                                 points:int = None,
+                                 channels:List[str] = None)->TrainDetailResponse:
+        """훈련 세션 세부 정보 받기 (stream, Lap)
+            points / channels: 스트림 다운샘플링, 채널 선택
+        """
+        try:
+            await self._get_owned_session(user_id=user_id, session_id=session_id)
+
+            # 같은 AsyncSession 은 동시 실행 불가. 순차 조회
+            laps_orm = await repo.get_train_session_laps(session_id=session_id, db=self.db)
+            stream_orm = await repo.get_train_session_stream(session_id=session_id, db=self.db)
+
+            # 저장된 분석 결과 (재계산 없음)
+            metric_orm = await repo.get_train_session_metric(session_id=session_id, db=self.db)
 
             laps = [LapData.model_validate(lap) for lap in laps_orm]
-            stream = StreamData.model_validate(stream_orm) if stream_orm else None
+            stream = self._to_stream_data(stream_orm, points=points, channels=channels)
 
             return TrainDetailResponse(
                 laps=laps,
-                stream=stream
+                stream=stream,
+                metrics=StreamMetrics.model_validate(metric_orm) if metric_orm else None
             )
         except CustomError:
             raise
         except Exception as e:
             raise InternalError(context="error get_session_detail", original_exception=e)
+
+    async def get_session_laps(self, user_id:UUID, session_id:UUID)->Tuple[str, List[LapData]]:
+        """훈련 세션 lap 만 받기. (세션 버전, laps)"""
+        try:
+            session = await self._get_owned_session(user_id=user_id, session_id=session_id)
+            laps_orm = await repo.get_train_session_laps(session_id=session_id, db=self.db)
+            return (session_version(session_id=session.id, created_at=session.created_at),
+                    [LapData.model_validate(lap) for lap in laps_orm])
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context="error get_session_laps", original_exception=e)
+
+    async def get_session_stream(self, user_id:UUID, session_id:UUID,
+                                 points:int = None,
+                                 channels:List[str] = None)->Tuple[str, StreamData | None]:
+        """훈련 세션 stream 만 받기. (세션 버전, stream)"""
+        try:
+            session = await self._get_owned_session(user_id=user_id, session_id=session_id)
+            stream_orm = await repo.get_train_session_stream(session_id=session_id, db=self.db)
+            return (session_version(session_id=session.id, created_at=session.created_at),
+                    self._to_stream_data(stream_orm, points=points, channels=channels))
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context="error get_session_stream", original_exception=e)
+        
+    def _to_stream_data(self, stream_orm:TrainSessionStream | None,
+                        points:int = None,
+                        channels:List[str] = None) -> StreamData | None:
+        """바이너리 스트림 디코딩. 이전 json 컬럼 데이터는 그대로 검증
+            points 지정시 LTTB 다운샘플링. 미리 계산된 preview 가 요청 채널로 points 개 이상이면 preview 사용
+            channels 지정시 해당 채널 + time 만
+        """
+        if stream_orm is None:
+            return None
+        if points is None and channels is None:
+            if stream_orm.data is not None:
+                return decode_stream(stream_orm.data)
+            return StreamData.model_validate(stream_orm)
+
+        arrays = None
+        if points is not None and points <= STREAM_PREVIEW_POINTS and stream_orm.preview is not None:
+            preview = self._select_channels(decode_stream_arrays(stream_orm.preview), channels)
+            # 이전에 저장된 preview 는 채널 합집합이라 STREAM_PREVIEW_POINTS 보다 적을 수 있음
+            if preview and max(v.size for v in preview.values()) >= points:
+                arrays = preview
+        if arrays is None:
+            if stream_orm.data is not None:
+                arrays = decode_stream_arrays(stream_orm.data)
+            else:
+                arrays = stream_to_arrays(stream_orm)
+            arrays = self._select_channels(arrays, channels)
+
+        if points is not None:
+            arrays = downsample_stream(arrays, points)
+        return arrays_to_stream(arrays)
+
+    def _select_channels(self, arrays:dict, channels:List[str] = None) -> dict:
+        if channels is None:
+            return arrays
+        return {k: v for k, v in arrays.items() if k in channels or k == "time"}
         
-    async def get_sessions_by_date(self, user_id:UUID, start_date:int = None)-> List[TrainResponse]:
-        """기간 내의 훈련 세션 받기"""
+    async def get_sessions_by_date(self, user_id:UUID, start_date:int = None,
+                                   replica:bool = False)-> List[TrainResponse]:
+        """기간 내의 훈련 세션 받기
+            replica: 캐시되지 않는 조회 (llm 프롬프트 입력) 만 True. 스케줄 etag 는 primary
+        """
         try:
             if start_date is not None:
                 start_date = datetime.fromtimestamp(start_date, tz=timezone.utc)
@@ -133,7 +274,7 @@ class TrainingAdapter(TrainingPort):
                 cur = datetime.now(timezone.utc)
                 start_date = cur - timedelta(days=14)
                 
-            sessions = await repo.get_train_session_by_date(db=self.db,
+            sessions = await repo.get_train_session_by_date(db=self.read_db if replica else self.db,
                                         user_id=user_id,
                                         start_date=start_date)
             return [
@@ -157,6 +298,23 @@ class TrainingAdapter(TrainingPort):
         
         
         
+    async def get_personal_records(self, user_id:UUID, year:int = None)->List[PersonalRecordResponse]:
+        """최고기록 인덱스 조회. 연도 지정이 없으면 거리별 전체 최고기록"""
+        try:
+            records = await record_repo.get_personal_records(db=self.read_db, user_id=user_id, year=year)
+            if year is None:
+                best = {}
+                for r in records:
+                    if r.distance not in best or r.elapsed_time < best[r.distance].elapsed_time:
+                        best[r.distance] = r
+                records = best.values()
+            return [PersonalRecordResponse.model_validate(r) for r in records]
+        
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context="error get_personal_records", original_exception=e)
+        
     async def delete_session(self, user_id:UUID, session_id:UUID)->bool:
         """세션 삭제"""
         try:
@@ -167,6 +325,8 @@ class TrainingAdapter(TrainingPort):
                 raise InternalError(context=f"error delete session. user_id {user_id} not matched to {train_session.user_id} ")
             res = await repo.delete_train_session(train_session=train_session,
                                                      db=self.db)
+            # 삭제된 세션이 최고기록이었을 수 있으므로 인덱스 재생성
+            await record_repo.rebuild_personal_records(db=self.db, user_id=user_id)
             return res
         
         except CustomError:
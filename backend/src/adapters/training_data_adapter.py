@@ -6,17 +6,39 @@ from datetime import datetime, timezone, timedelta
 
 
 from ports.training_data_port import TrainingDataPort
-from typing import Optional, List
-from config.settings import strava
+from typing import Optional, List, AsyncIterator
+from config.settings import strava, security
+from infra.security import decrypt_token
+from config.constants import STRAVA_PER_PAGE, SYNC_DEFAULT_DAYS
+from infra.http_client import get_strava_client
+from infra.db.redis.redis_client import get_redis
+from infra.rate_limiter import StravaRateLimiter, PRIORITY_HIGH, PRIORITY_LOW, short_window_remaining
 from infra.db.storage import third_party_token_repo as repo
 from infra.db.orm.models import ThirdPartyToken
 from schemas.models import LapData, StreamData, ActivityData
-from config.exceptions import InternalError, DBError, CustomError
+from config.exceptions import InternalError, DBError, CustomError, RateLimitError
 
 
 class StravaAdapter(TrainingDataPort):
-    def __init__(self, db:AsyncSession):
+    def __init__(self, db:AsyncSession, client:httpx.AsyncClient = None,
+                 rate_limiter:StravaRateLimiter = None):
         self.db = db
+        # lifespan 에서 생성된 공유 커넥션 풀 사용
+        self.client = client if client is not None else get_strava_client()
+        # 인스턴스간 공유되는 rate limit 카운터 (redis)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else StravaRateLimiter(get_redis())
+    
+    async def _api_get(self, url:str, headers:dict, params:dict = None,
+                       priority:str = PRIORITY_HIGH) -> httpx.Response:
+        """Strava api 호출. rate limit 슬롯 확보 후 요청, 응답 헤더로 사용량 보정"""
+        await self.rate_limiter.acquire(priority=priority)
+        response = await self.client.get(url, headers=headers, params=params)
+        await self.rate_limiter.update_from_headers(response.headers)
+        if response.status_code == 429:
+            await self.rate_limiter.mark_exhausted()
+            raise RateLimitError(context=f"strava 429 {url}", retry_after=short_window_remaining())
+        response.raise_for_status()
+        return response
     
     async def connect(self, auth_code: str) -> dict:
         """플랫폼에 연결. 스트라바 토큰 받기"""
@@ -27,9 +49,7 @@ class StravaAdapter(TrainingDataPort):
                 "code": auth_code,
                 "grant_type": "authorization_code"
             }
-            async with httpx.AsyncClient() as client:
-                response = await client.post(strava.token_url, data=payload)
-            
+            response = await self.client.post(strava.token_url, data=payload)
             response.raise_for_status()
             return response.json()
         except (httpx.HTTPStatusError, httpx.RequestError) as e:
@@ -42,25 +62,26 @@ class StravaAdapter(TrainingDataPort):
         """플랫폼 연결 해제"""
         # 1. DB에서 액세스 토큰 가져오기
         try:
-            access_token = await repo.get_third_party_token_by_user_id(
+            token = await repo.get_third_party_token_by_user_id(
                 db=self.db,
                 provider="strava",
                 user_id=user_id
             )
             
-            if not access_token:
+            if not token:
                 return True  # 이미 끊겨 있음
             
-            
+            access_token = decrypt_token(token_encrypted=token.access_token,
+                                         key=security.encryption_key_strava,
+                                         token_type="strava_access")
             headers = {"Authorization": f"Bearer {access_token}"}
             url = strava.deauth_endpoint
             
             # strava 에서 연결 끊기        
-            async with httpx.AsyncClient() as client:
-                try:
-                    await client.post(url, headers=headers)
-                except httpx.HTTPError:
-                    pass
+            try:
+                await self.client.post(url, headers=headers)
+            except httpx.HTTPError:
+                pass
                 
             # db 에서 토큰 삭제
             await repo.delete_third_party_token(
@@ -92,16 +113,36 @@ class StravaAdapter(TrainingDataPort):
             raise InternalError(context="error get_token_from_db", original_exception=e)
         
     
-    async def fetch_activities(self, access_token:str, after_date: int = None) -> List[ActivityData]:
-        """훈련 활동 데이터 가져오기
-            user_id = 사용자 분류
+    async def get_last_synced_at(self, user_id:UUID) -> Optional[int]:
+        """마지막으로 sync 된 활동 시작시간 (timestamp). 없으면 None"""
+        token = await self.get_token_from_db(user_id=user_id)
+        if token is None:
+            return None
+        return token.last_synced_at
+    
+    async def update_last_synced_at(self, user_id:UUID, last_synced_at:int) -> None:
+        """마지막으로 sync 된 활동 시작시간 갱신"""
+        try:
+            await repo.update_last_synced_at(db=self.db,
+                                             provider="strava",
+                                             user_id=user_id,
+                                             last_synced_at=last_synced_at)
+        except DBError:
+            raise
+        except Exception as e:
+            raise InternalError(context="error update_last_synced_at", original_exception=e)
+    
+    async def iter_activity_pages(self, access_token:str,
+                                  after_date: int = None,
+                                  before_date: int = None,
+                                  per_page: int = STRAVA_PER_PAGE,
+                                  ) -> AsyncIterator[List[ActivityData]]:
+        """훈련 활동 데이터 페이지 단위로 가져오기 (async generator)
             after_date = 시작날짜 (timestamp)
+            before_date = 끝날짜 (timestamp). backfill 용
             
-            return : ActivityData 리스트
+            yield : 페이지별 ActivityData 리스트
         """
-        # get 액세스 토큰
-
-        # 헤더 
         try:
             headers = {"Authorization": f"Bearer {access_token}"}
             
@@ -109,24 +150,49 @@ class StravaAdapter(TrainingDataPort):
             
             # 시작날짜 파라미터로
             if after_date is None:
-                two_weeks_ago = datetime.now(timezone.utc) - timedelta(days=14)
-                after_date = int(two_weeks_ago.timestamp())
+                default_start = datetime.now(timezone.utc) - timedelta(days=SYNC_DEFAULT_DAYS)
+                after_date = int(default_start.timestamp())
                 
             params = {
                 "after": after_date,
-                "per_page": 100   # 최대 200까지 가능
+                "per_page": min(per_page, STRAVA_PER_PAGE)   # 최대 200까지 가능
             }
+            if before_date is not None:
+                params["before"] = before_date
             
-            # activities
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url=url, headers=headers, params=params)
-                response.raise_for_status()
+            page = 1
+            while True:
+                params["page"] = page
+                response = await self._api_get(url=url, headers=headers, params=params)
+                
+                res = response.json()
+                if not res:
+                    return
+                yield self._parse_activity_data(res)
                 
-                return self._parse_activity_data(response.json())
+                # 마지막 페이지
+                if len(res) < params["per_page"]:
+                    return
+                page += 1
+                
+        except CustomError:
+            raise
         except (httpx.HTTPStatusError, httpx.RequestError) as e:
             raise InternalError(context=f"Strava httpx call error", original_exception=e)
         except Exception as e:
-            raise InternalError(context="error fetch_activities", original_exception=e)
+            raise InternalError(context="error iter_activity_pages", original_exception=e)
+    
+    async def fetch_activities(self, access_token:str, after_date: int = None) -> List[ActivityData]:
+        """훈련 활동 데이터 가져오기 (모든 페이지)
+            after_date = 시작날짜 (timestamp)
+            
+            return : ActivityData 리스트
+        """
+        activities = []
+        async for page in self.iter_activity_pages(access_token=access_token,
+                                                   after_date=after_date):
+            activities.extend(page)
+        return activities
         
     def _parse_activity_data(self, res:list) -> List[ActivityData]:
         """액티비티 데이터 포맷 - list > dic """
@@ -161,13 +227,15 @@ class StravaAdapter(TrainingDataPort):
             
             url = strava.api_url + f"activities/{activity_id}/streams"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=headers, params=params)
-                response.raise_for_status()
-                
-                # 데이터 파이단틱 모델로 파싱
-                return self._parse_stream_data(response.json())
+            # stream 은 용량이 크고 급하지 않으므로 낮은 우선순위
+            response = await self._api_get(url, headers=headers, params=params,
+                                           priority=PRIORITY_LOW)
             
+            # 데이터 파이단틱 모델로 파싱
+            return self._parse_stream_data(response.json())
+            
+        except CustomError:
+            raise
         except (httpx.HTTPStatusError, httpx.RequestError) as e:
             raise InternalError(context=f"Strava httpx call error", original_exception=e)
         except Exception as e:
@@ -203,14 +271,14 @@ class StravaAdapter(TrainingDataPort):
             headers = {"Authorization": f"Bearer {access_token}"}
             url = strava.api_url + f"activities/{activity_id}/laps"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-                
-                # 데이터 파싱
-                parsed = self._parse_lap_data(response.json())
-                
-                return parsed
+            response = await self._api_get(url, headers=headers)
+            
+            # 데이터 파싱
+            parsed = self._parse_lap_data(response.json())
+            
+            return parsed
+        except CustomError:
+            raise
         except (httpx.HTTPStatusError, httpx.RequestError) as e:
             raise InternalError(context=f"Strava httpx call error", original_exception=e)
         except Exception as e:
@@ -248,10 +316,9 @@ class StravaAdapter(TrainingDataPort):
         
         
     async def is_token_expired(self, expires_at:int) -> bool:
-        """토큰 만료 검증"""
+        """토큰 만료 검증. 만료 margin 초 전부터 만료로 보고 미리 갱신"""
         now = int(datetime.now(timezone.utc).timestamp())
-        print(f"now: {now} vs expires {expires_at}")
-        return expires_at <= now
+        return expires_at - strava.token_refresh_margin <= now
 
     
     async def refresh_token(self, refresh_token: str) -> dict:
@@ -264,9 +331,7 @@ class StravaAdapter(TrainingDataPort):
                 "refresh_token": refresh_token
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url=strava.token_url, data=payload)
-            
+            response = await self.client.post(url=strava.token_url, data=payload)
             response.raise_for_status()
             return response.json()
     
@@ -5,6 +5,31 @@ REFRESH_TOKEN_EXPIRE_DAYS = 30
 # ETAG TTL
 ETAG_TTL_SEC = 60 * 60 * 24
 ETAG_TRAIN_SESSION = "train_session"
+ETAG_FEED = "feed"  # 전체 사용자 공용
+ETAG_PROFILE = "profile"
+ETAG_LLM = "llm"
+ETAG_SESSION_DETAIL = "session:{session_id}"  # 세션별 버전 (lap, stream etag)
+CACHE_CONTROL_REVALIDATE = "private, no-cache"  # 브라우저 캐시 + 매번 etag 재검증
+
+# STRAVA SYNC
+STRAVA_PER_PAGE = 200  # strava 최대 200
+SYNC_DEFAULT_DAYS = 14  # 첫 sync 기본 기간
+SYNC_OVERLAP_SEC = 60 * 60 * 24  # start_date_local 기준이라 시간대 차이만큼 겹쳐서 요청 (중복은 dedup)
+
+# SYNC JOB
+SYNC_JOB_TTL_SEC = 60 * 60  # job 상태 / 사용자별 중복방지 키 유지시간
+SYNC_JOB_LEASE_SEC = 60  # 실행중 작업 lease. worker 가 주기적으로 연장, 만료되면 worker 종료로 보고 복구
+SYNC_JOB_RECOVER_INTERVAL_SEC = 30  # worker 가 lease 만료 작업을 복구하는 주기
+SYNC_JOB_MAX_DEFER_SEC = 60 * 20  # strava 한도 초과시 작업을 미룰 수 있는 최대 시간 (15분 윈도우 리셋까지). 넘으면 실패 처리
+SYNC_JOB_MAX_DEFERS = 4  # 작업당 최대 연기 횟수
+SYNC_JOB_QUEUED = "queued"
+SYNC_JOB_RUNNING = "running"
+SYNC_JOB_DONE = "done"
+SYNC_JOB_FAILED = "failed"
+
+# STREAM
+STREAM_CHANNELS = ("heartrate", "cadence", "distance", "velocity", "altitude", "time")
+STREAM_PREVIEW_POINTS = 300  # 저장시 미리 계산하는 저해상도 포인트 수
 
 PLATFORM = ['facebook', 'kakao', ]
 
@@ -52,6 +52,15 @@ class NotFoundError(CustomError):
     status_code = 404
     detail="resource coult not be found"
 
+class RateLimitError(CustomError):
+    status_code = 429
+    detail = "too many requests"
+
+    def __init__(self, *args, retry_after:int = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 한도가 리셋될 때까지 남은 시간 (초). 모르면 None
+        self.retry_after = retry_after
+
 class ValidationError(CustomError):
     status_code = 400
     detail = "invalid request"
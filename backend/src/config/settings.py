@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, field_validator
 from pathlib import Path
+from typing import Optional
 
 ENV_DIR = Path(__file__).resolve().parent.parent
 
@@ -28,7 +29,18 @@ class JWTConfig(CommonConfig):
 
 class DatabaseConfig(CommonConfig):
     url: str = Field(default="sqlite+aiosqlite:///./db.sqlite3", alias="DATABASE_URL")
-    echo: bool = Field(default=True, alias="DATABASE_ECHO")
+    # 조회 전용 replica. 없으면 primary 로 조회
+    # etag 버전에 묶이는 조회 / 쓰기 직후 본인 확인 조회는 primary, 나머지 (기록, 피드 캐시 미스 등) 는 replica
+    read_url: Optional[str] = Field(default=None, alias="DATABASE_READ_URL")
+    # replica 지연 허용치 (초). 쓰기 직후 이 시간 동안은 캐시를 채우는 조회도 primary
+    read_lag_sec: int = Field(default=5, alias="DATABASE_READ_LAG_SEC")
+    echo: bool = Field(default=False, alias="DATABASE_ECHO")
+    # 커넥션 풀 (postgres). 인스턴스별 최대 커넥션 = pool_size + max_overflow
+    pool_size: int = Field(default=10, alias="DATABASE_POOL_SIZE")
+    max_overflow: int = Field(default=5, alias="DATABASE_MAX_OVERFLOW")
+    pool_timeout: float = Field(default=10.0, alias="DATABASE_POOL_TIMEOUT")
+    pool_recycle: int = Field(default=60 * 30, alias="DATABASE_POOL_RECYCLE")
+    pool_pre_ping: bool = Field(default=True, alias="DATABASE_POOL_PRE_PING")
 
 class RedisConfig(CommonConfig):
     host: str = Field(default="redis", alias="REDIS_HOST")
@@ -65,6 +77,37 @@ class StravaConfig(CommonConfig):
     api_url: str = Field(default="https://www.strava.com/api/v3/", alias="STRAVA_API_URL")
     auth_endpoint: str = Field(default="https://www.strava.com/oauth/authorize", alias="STRAVA_AUTH_ENDPOINT")
     deauth_endpoint: str = Field(default="https://www.strava.com/oauth/deauthorize", alias="STRAVA_DEAUTH_ENDPOINT")
+    # http 커넥션 풀
+    http2: bool = Field(default=False, alias="STRAVA_HTTP2")
+    max_connections: int = Field(default=100, alias="STRAVA_MAX_CONNECTIONS")
+    max_keepalive_connections: int = Field(default=20, alias="STRAVA_MAX_KEEPALIVE")
+    keepalive_expiry: float = Field(default=30.0, alias="STRAVA_KEEPALIVE_EXPIRY")
+    timeout: float = Field(default=10.0, alias="STRAVA_TIMEOUT")
+    connect_timeout: float = Field(default=5.0, alias="STRAVA_CONNECT_TIMEOUT")
+    # rate limit (앱 전체). 응답 헤더 값이 있으면 헤더 우선
+    rate_limit_15m: int = Field(default=200, alias="STRAVA_RATE_LIMIT_15M")
+    rate_limit_daily: int = Field(default=2000, alias="STRAVA_RATE_LIMIT_DAILY")
+    rate_limit_low_priority_ratio: float = Field(default=0.8, alias="STRAVA_RATE_LIMIT_LOW_RATIO")
+    rate_limit_max_wait: float = Field(default=30.0, alias="STRAVA_RATE_LIMIT_MAX_WAIT")
+    # 액세스 토큰 캐시. 프로세스 LRU 크기 / 로컬 유지 시간 (초, 다른 replica 의 갱신 반영 주기)
+    token_cache_size: int = Field(default=1024, alias="STRAVA_TOKEN_CACHE_SIZE")
+    token_cache_local_ttl: int = Field(default=60, alias="STRAVA_TOKEN_CACHE_LOCAL_SEC")
+    # 만료 margin 초 전부터 미리 갱신 / replica 간 갱신 락 유지 시간 (초, strava 요청 timeout 이상)
+    token_refresh_margin: int = Field(default=300, alias="STRAVA_TOKEN_REFRESH_MARGIN_SEC")
+    refresh_lock_ttl: int = Field(default=15, alias="STRAVA_REFRESH_LOCK_SEC")
+
+class SyncConfig(CommonConfig):
+    # 활동 상세(lap/stream) 동시 요청 수. 프로세스 전체 / 사용자별
+    concurrency: int = Field(default=16, alias="SYNC_CONCURRENCY")
+    user_concurrency: int = Field(default=4, alias="SYNC_USER_CONCURRENCY")
+    # sync job worker 수. app 내부 (0 이면 별도 worker 프로세스만 처리)
+    workers: int = Field(default=1, alias="SYNC_WORKERS")
+
+class FeedConfig(CommonConfig):
+    # likes_count 재계산 주기 (초). 0 이면 실행 안함
+    like_reconcile_interval: int = Field(default=60 * 60, alias="FEED_LIKE_RECONCILE_SEC")
+    # 피드 페이지 redis 캐시 ttl (초). 쓰기시 즉시 무효화, ttl 은 안전장치
+    cache_ttl: int = Field(default=60 * 5, alias="FEED_CACHE_TTL_SEC")
 
 class LLMConfig(CommonConfig):
     secret:str = Field(default="", alias="OPENAI_SECRET")
@@ -77,4 +120,6 @@ google = GoogleConfig()
 jwt_config = JWTConfig()
 security = SecurityConfig()
 strava = StravaConfig()
+sync = SyncConfig()
+feed = FeedConfig()
 llm = LLMConfig()
\ No newline at end of file
@@ -0,0 +1,162 @@
+import numpy as np
+from typing import List, Optional, Dict, Mapping, Union
+
+from schemas.models import StreamData, StreamMetrics
+
+
+
+class StreamAnalyzer:
+    """스트림(초 단위 샘플) 기반 지표 계산. numpy 벡터 연산만 사용"""
+    HR_ZONES = (0.5, 0.6, 0.7, 0.8, 0.9)   # 존1~5 하한 (최대심박 대비)
+    BEST_EFFORTS = {"1k": 1000, "5k": 5000, "10k": 10000}
+    MAX_GRADE = 0.45
+    MINETTI = (155.4, -30.4, -43.3, 46.3, 19.5, 3.6)  # 에너지 비용 (J/kg/m) 5차 다항식 계수
+    CHANNELS = ("time", "distance", "heartrate", "velocity", "altitude", "cadence")
+
+    def __init__(self, max_hr:int=190):
+        self.max_hr = max_hr # 최대심박수 (사용자 정보가 없을 때 기본값)
+        self._zone_bounds = np.asarray(self.HR_ZONES)
+        self._effort_names = list(self.BEST_EFFORTS)
+        self._effort_targets = np.asarray(list(self.BEST_EFFORTS.values()), dtype=np.float64)
+
+    @staticmethod
+    def estimate_max_hr(age:Optional[int]) -> Optional[int]:
+        """나이 기반 최대심박 추정 (Tanaka: 208 - 0.7 * 나이). 나이 정보 없으면 None"""
+        if not age or age <= 0:
+            return None
+        return round(208 - 0.7 * age)
+
+
+    def _to_array(self, values:Optional[List[float]]) -> Optional[np.ndarray]:
+        if not values:
+            return None
+        return np.asarray(values, dtype=np.float64)
+
+    def _as_array(self, values:Optional[np.ndarray]) -> Optional[np.ndarray]:
+        if values is None or len(values) == 0:
+            return None
+        return values
+
+    def _aligned(self, *arrays:Optional[np.ndarray]) -> bool:
+        """채널이 모두 있고 길이가 같은지"""
+        if any(a is None for a in arrays):
+            return False
+        return len({a.size for a in arrays}) == 1 and arrays[0].size > 1
+
+
+    def analyze(self, stream:Union[StreamData, Mapping[str, np.ndarray]],
+                max_hr:Optional[int] = None) -> StreamMetrics:
+        """스트림 지표 계산
+            stream: StreamData 또는 채널 이름 -> ndarray (stream_to_arrays 결과).
+                    배열로 넘기면 list -> ndarray 변환 비용 없음
+            max_hr: 사용자 최대심박. 없으면 생성시 기본값
+
+        return StreamMetrics (계산 불가 항목은 None)
+        """
+        if isinstance(stream, Mapping):
+            time, distance, heartrate, velocity, altitude, cadence = (
+                self._as_array(stream.get(name)) for name in self.CHANNELS)
+        else:
+            time, distance, heartrate, velocity, altitude, cadence = (
+                self._to_array(getattr(stream, name)) for name in self.CHANNELS)
+
+        return StreamMetrics(
+            hr_zones=self.hr_zone_times(time, heartrate, max_hr=max_hr),
+            best_efforts=self.best_efforts(time, distance),
+            gap=self.grade_adjusted_pace(time, distance, altitude),
+            cardiac_drift=self.cardiac_drift(time, velocity, heartrate),
+            cadence_cv=self.cadence_variability(cadence),
+        )
+
+
+    # ------------------------
+    # 심박 존별 시간 (초). 존1 미만은 존1 에 포함
+    # ------------------------
+    def hr_zone_times(self, time:np.ndarray, heartrate:np.ndarray,
+                      max_hr:Optional[int] = None) -> Optional[List[float]]:
+        if not self._aligned(time, heartrate):
+            return None
+        dt = np.diff(time, prepend=time[0])
+        # 존 경계(bpm) 이상에서 보낸 시간의 차분. 경계가 몇 개뿐이라 샘플별 이진탐색보다 빠름
+        bounds = self._zone_bounds[1:] * (max_hr or self.max_hr)
+        above = [dt.sum()] + [dt[heartrate >= bound].sum() for bound in bounds] + [0.0]
+        return [float(above[i] - above[i + 1]) for i in range(len(self.HR_ZONES))]
+
+    # ------------------------
+    # 구간 최고기록 (초). 모든 시작점에서 목표거리 도달 시각을 선형 보간
+    # 시작점이 정렬되어 있어 np.interp 가 직전 위치부터 탐색 (searchsorted 이진탐색보다 빠름)
+    # 목표거리까지 갈 수 없는 뒤쪽 시작점은 제외
+    # ------------------------
+    def best_efforts(self, time:np.ndarray, distance:np.ndarray) -> Optional[Dict[str, float]]:
+        if not self._aligned(time, distance):
+            return None
+        if (np.diff(distance) < 0).any():
+            distance = np.maximum.accumulate(distance)  # gps 튐 보정 (단조 증가)
+        # 목표거리별 마지막 시작점 (distance + target <= 끝 거리)
+        ends = np.searchsorted(distance, distance[-1] - self._effort_targets, side="right")
+        res = {}
+        for name, target, end in zip(self._effort_names, self._effort_targets, ends.tolist()):
+            if distance[-1] - distance[0] < target:
+                continue
+            reach = np.interp(distance[:end] + target, distance, time)
+            reach -= time[:end]
+            res[name] = float(reach.min())
+        return res or None
+
+    # ------------------------
+    # 경사 보정 페이스 (초/km). Minetti 에너지 비용 곡선 사용
+    # 정지/튄 구간은 이동거리 0 으로 두어 마스크 인덱싱 없이 계산
+    # ------------------------
+    def grade_adjusted_pace(self, time:np.ndarray, distance:np.ndarray, altitude:np.ndarray) -> Optional[float]:
+        if not self._aligned(time, distance, altitude):
+            return None
+        dd = np.diff(distance)
+        dh = np.diff(altitude)
+        moving = dd > 0
+        if not moving.any():
+            return None
+
+        dd = np.where(moving, dd, 0.0)
+        grade = np.divide(dh, dd, out=np.zeros_like(dd), where=moving)
+        np.clip(grade, -self.MAX_GRADE, self.MAX_GRADE, out=grade)
+        # Horner (제자리 연산)
+        cost = np.full_like(grade, self.MINETTI[0])
+        for coef in self.MINETTI[1:]:
+            cost *= grade
+            cost += coef
+        adjusted_km = np.dot(dd, cost) / 3.6 / 1000  # 평지 대비
+        if adjusted_km <= 0:
+            return None
+        return float((time[-1] - time[0]) / adjusted_km)
+
+    # ------------------------
+    # 심박 표류 (%). 전반/후반 (속도/심박) 효율 감소율
+    # ------------------------
+    def cardiac_drift(self, time:np.ndarray, velocity:np.ndarray, heartrate:np.ndarray) -> Optional[float]:
+        if not self._aligned(time, velocity, heartrate):
+            return None
+        valid = (heartrate > 0) & (velocity > 0)
+        # 시간이 정렬되어 있으므로 전반/후반은 슬라이스
+        half = np.searchsorted(time, time[0] + (time[-1] - time[0]) / 2, side="right")
+        first, second = slice(None, half), slice(half, None)
+        if not valid[first].any() or not valid[second].any():
+            return None
+
+        # 같은 샘플 수로 나누므로 평균 비 = 합계 비
+        ef_first = np.sum(velocity[first], where=valid[first]) / np.sum(heartrate[first], where=valid[first])
+        ef_second = np.sum(velocity[second], where=valid[second]) / np.sum(heartrate[second], where=valid[second])
+        return float((ef_first - ef_second) / ef_first * 100)
+
+    # ------------------------
+    # 케이던스 변동계수 (표준편차 / 평균)
+    # ------------------------
+    def cadence_variability(self, cadence:np.ndarray) -> Optional[float]:
+        if cadence is None:
+            return None
+        running = cadence > 0
+        count = np.count_nonzero(running)
+        if count < 2:
+            return None
+        mean = np.sum(cadence, where=running) / count
+        std = np.sqrt(np.sum((cadence - mean) ** 2, where=running) / count)
+        return float(std / mean)
@@ -0,0 +1,75 @@
+import numpy as np
+from typing import Dict
+
+
+
+def lttb_indices(x:np.ndarray, y:np.ndarray, threshold:int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets. 차트 모양을 유지하는 샘플 인덱스 선택
+        첫/마지막 점은 항상 포함, 나머지는 버킷마다 삼각형 면적이 가장 큰 점
+    """
+    n = y.size
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # threshold-2 개 버킷 경계 (첫/마지막 점 제외)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    idx = np.empty(threshold, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < edges.size else n
+        # 다음 버킷 평균점
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        xs, ys = x[start:end], y[start:end]
+        area = np.abs((x[a] - avg_x) * (ys - y[a]) - (x[a] - xs) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+
+def _top_up(idx:np.ndarray, n:int, points:int, candidates:np.ndarray) -> np.ndarray:
+    """인덱스가 points 개가 될 때까지 candidates (없으면 전체) 에서 고르게 추가"""
+    for pool in (candidates, np.arange(n)):
+        need = points - idx.size
+        if need <= 0:
+            break
+        extra = np.setdiff1d(pool, idx)
+        if extra.size:
+            pick = np.linspace(0, extra.size - 1, min(need, extra.size)).astype(np.int64)
+            idx = np.union1d(idx, extra[pick])
+    return idx
+
+
+def downsample_stream(arrays:Dict[str, np.ndarray], points:int, x_key:str = "time") -> Dict[str, np.ndarray]:
+    """채널별 배열을 같은 인덱스로 다운샘플링. 길이가 points 보다 길면 결과는 정확히 points 개
+        채널마다 LTTB 인덱스를 뽑아 합집합 사용 (각 채널의 피크 유지)
+        합집합이 겹쳐 모자라면 첫 채널의 LTTB(points) 인덱스에서 채움
+        채널당 3개 미만이 되면 첫 채널의 LTTB 인덱스를 모든 채널에 적용
+    """
+    if not arrays:
+        return arrays
+    n = max(a.size for a in arrays.values())
+    if n <= points:
+        return arrays
+
+    x = arrays.get(x_key)
+    if x is None or x.size != n:
+        x = np.arange(n, dtype=np.float64)
+
+    ys = [v for k, v in arrays.items() if k != x_key and v.size == n]
+    per_channel = points // len(ys) if ys else 0
+    if per_channel >= 3:
+        # 합집합 크기 <= per_channel * 채널 수 <= points
+        idx = np.unique(np.concatenate([lttb_indices(x, y, per_channel) for y in ys]))
+        if idx.size < points:
+            idx = _top_up(idx, n, points, lttb_indices(x, ys[0], points))
+    elif ys and points >= 3:
+        idx = lttb_indices(x, ys[0], points)
+    else:
+        idx = np.linspace(0, n - 1, points).astype(np.int64)
+
+    return {k: (v[idx] if v.size == n else v) for k, v in arrays.items()}
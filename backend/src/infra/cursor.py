@@ -0,0 +1,25 @@
+"""
+keyset 페이지네이션 cursor 인코딩
+(created_at, id) 를 url-safe 문자열로 변환
+"""
+import base64
+from datetime import datetime
+from uuid import UUID
+from typing import Tuple
+
+from config.exceptions import ValidationError
+
+
+def encode_cursor(created_at:datetime, row_id:UUID) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor:str) -> Tuple[datetime, UUID]:
+    """잘못된 cursor 는 400"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except Exception:
+        raise ValidationError(detail="invalid cursor", context=f"decode_cursor {cursor}")
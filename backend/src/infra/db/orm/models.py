@@ -1,7 +1,7 @@
 from uuid import UUID, uuid4
 from typing import Optional, List
 from datetime import datetime, timezone
-from sqlalchemy import Column, JSON, DateTime, BigInteger, Sequence, UniqueConstraint
+from sqlalchemy import Column, JSON, DateTime, BigInteger, Sequence, UniqueConstraint, LargeBinary, Index, Integer
 from sqlmodel import SQLModel, Field, Relationship
 
 # --- User ---
@@ -24,6 +24,7 @@ class User(SQLModel, table=True):
     llms: List["LLM"] = Relationship(back_populates="user", cascade_delete=True)
     feeds: List["Feed"] = Relationship(back_populates="user", cascade_delete=True)
     feed_likes: List["FeedLikes"] = Relationship(back_populates="user", cascade_delete=True)
+    personal_records: List["PersonalRecord"] = Relationship(back_populates="user", cascade_delete=True)
 
 class UserInfo(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid4, primary_key=True)
@@ -45,6 +46,10 @@ class Token(SQLModel, table=True):
     
     user: Optional[User] = Relationship(back_populates="tokens")
 
+    __table_args__ = (
+        Index("ix_token_user_id_device_id", "user_id", "device_id"),
+    )
+
 
 class ThirdPartyToken(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid4, primary_key=True)
@@ -55,6 +60,8 @@ class ThirdPartyToken(SQLModel, table=True):
     refresh_token: str
     expires_at: int 
     extra_data: Optional[str] = None  
+    # 마지막으로 가져온 활동 시작시간 (timestamp). 증분 sync 기준점
+    last_synced_at: Optional[int] = Field(default=None, sa_column=Column(BigInteger, nullable=True))
 
     user: Optional["User"] = Relationship(back_populates="third_party_tokens")
 
@@ -84,15 +91,25 @@ class TrainSession(SQLModel, table=True):
     user: Optional[User] = Relationship(back_populates="train_sessions")
     stream: Optional["TrainSessionStream"] = Relationship(back_populates="session", cascade_delete=True)
     laps: List["TrainSessionLap"] = Relationship(back_populates="session", cascade_delete=True)
+    metric: Optional["TrainSessionMetric"] = Relationship(back_populates="session", cascade_delete=True)
+    personal_records: List["PersonalRecord"] = Relationship(back_populates="session", cascade_delete=True)
 
     __table_args__ = (
         UniqueConstraint("provider", "activity_id", name="uq_provider_activity"),
+        # 기간 조회 (get_train_session_by_date)
+        Index("ix_trainsession_user_id_train_date", "user_id", "train_date"),
+        # sync 중복 확인 (get_existing_activity_ids, get_train_session_by_activity_id)
+        Index("ix_trainsession_user_id_provider_activity_id", "user_id", "provider", "activity_id"),
     )
     
 
 class TrainSessionStream(SQLModel, table=True):
-    # 스트림 데이터는 jsonstring 으로 저장
+    # 스트림 데이터는 압축 바이너리로 저장 (infra/stream_codec)
+    # json 컬럼은 이전 데이터 호환용
     session_id: UUID = Field(foreign_key="trainsession.id", primary_key=True)
+    data: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary, nullable=True))
+    # 차트용 저해상도 (LTTB) 스트림. 같은 포맷
+    preview: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary, nullable=True))
     heartrate: Optional[List[float]] = Field(default=None, sa_column=Column(JSON))
     cadence: Optional[List[float]] = Field(default=None, sa_column=Column(JSON))
     distance: Optional[List[float]] = Field(default=None, sa_column=Column(JSON))
@@ -115,7 +132,41 @@ class TrainSessionLap(SQLModel, table=True):
     elevation_gain:Optional[float] = None
     
     session: Optional[TrainSession] = Relationship(back_populates="laps")
+
+    __table_args__ = (
+        Index("ix_trainsessionlap_session_id", "session_id"),
+    )
     
+class TrainSessionMetric(SQLModel, table=True):
+    # 스트림 분석 결과. 저장시 한번만 계산
+    session_id: UUID = Field(foreign_key="trainsession.id", primary_key=True)
+    hr_zones: Optional[List[float]] = Field(default=None, sa_column=Column(JSON))
+    best_efforts: Optional[dict] = Field(default=None, sa_column=Column(JSON))
+    gap: Optional[float] = None
+    cardiac_drift: Optional[float] = None
+    cadence_cv: Optional[float] = None
+
+    session: Optional[TrainSession] = Relationship(back_populates="metric")
+    
+class PersonalRecord(SQLModel, table=True):
+    # 사용자별 거리/연도별 최고기록 인덱스. 세션 저장시 증분 갱신
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    user_id: UUID = Field(foreign_key="user.id")
+    session_id: UUID = Field(foreign_key="trainsession.id")
+    distance: str  # "1k", "5k", "10k"
+    year: int
+    elapsed_time: float  # seconds
+    train_date: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+
+    user: Optional[User] = Relationship(back_populates="personal_records")
+    session: Optional[TrainSession] = Relationship(back_populates="personal_records")
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "distance", "year", name="uq_user_distance_year"),
+    )
+
 class LLM(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     user_id: UUID = Field(foreign_key="user.id")
@@ -144,10 +195,17 @@ class Feed(SQLModel, table=True):
     title:str
     train_summary:str
     note: Optional[str] = None
+    # 좋아요 수 (좋아요 추가/취소시 같은 트랜잭션에서 증감, 주기적으로 재계산)
+    likes_count: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
 
     user: Optional[User] = Relationship(back_populates="feeds")
     likes: List["FeedLikes"] = Relationship(back_populates="feed", cascade_delete=True)
 
+    __table_args__ = (
+        # 피드 목록 keyset 페이지네이션 (created_at, id) 역순 스캔
+        Index("ix_feed_created_at_id", "created_at", "id"),
+    )
+
 class FeedLikes(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     feed_id: UUID = Field(foreign_key="feed.id")
@@ -33,3 +33,85 @@ async def incr_value(redisdb:Redis, k:str)->int:
         raise DBError(context=f"error delete_key {k}", original_exception=e)
     
 
+async def set_value_nx(redisdb:Redis, k:str, v:str, ttl:int = None) -> bool:
+    """키가 없을때만 저장. 저장 성공 여부 반환"""
+    try:
+        return bool(await redisdb.set(k, v, ex=ttl, nx=True))
+    except Exception as e:
+        raise DBError(context=f"error set_value_nx {k} {v}", original_exception=e)
+
+async def set_hash(redisdb:Redis, k:str, mapping:dict, ttl:int = None):
+    try:
+        async with redisdb.pipeline(transaction=True) as pipe:
+            pipe.hset(k, mapping=mapping)
+            if ttl:
+                pipe.expire(k, ttl)
+            await pipe.execute()
+    except Exception as e:
+        raise DBError(context=f"error set_hash {k}", original_exception=e)
+
+async def get_hash(redisdb:Redis, k:str) -> dict:
+    try:
+        return await redisdb.hgetall(k)
+    except Exception as e:
+        raise DBError(context=f"error get_hash {k}", original_exception=e)
+
+async def push_value(redisdb:Redis, k:str, v:str) -> int:
+    """리스트(큐) 왼쪽에 추가"""
+    try:
+        return await redisdb.lpush(k, v)
+    except Exception as e:
+        raise DBError(context=f"error push_value {k} {v}", original_exception=e)
+
+async def move_value_blocking(redisdb:Redis, src:str, dst:str, timeout:int = 5) -> str | None:
+    """src 리스트 오른쪽에서 꺼내 dst 리스트 왼쪽에 넣기 (처리중 목록으로 이동). timeout 동안 없으면 None"""
+    try:
+        return await redisdb.blmove(src, dst, timeout, "RIGHT", "LEFT")
+    except Exception as e:
+        raise DBError(context=f"error move_value_blocking {src} {dst}", original_exception=e)
+
+async def remove_value(redisdb:Redis, k:str, v:str) -> int:
+    """리스트에서 값 삭제. 삭제된 개수 반환"""
+    try:
+        return await redisdb.lrem(k, 0, v)
+    except Exception as e:
+        raise DBError(context=f"error remove_value {k} {v}", original_exception=e)
+
+async def requeue_value(redisdb:Redis, src:str, dst:str, v:str) -> bool:
+    """src 에서 값을 빼서 dst 오른쪽 (다음 꺼낼 위치) 에 넣기
+        src 에서 실제로 뺀 경우에만 넣음 (동시에 복구해도 중복 등록 없음)
+    """
+    try:
+        if await redisdb.lrem(src, 0, v) == 0:
+            return False
+        await redisdb.rpush(dst, v)
+        return True
+    except Exception as e:
+        raise DBError(context=f"error requeue_value {src} {dst} {v}", original_exception=e)
+
+async def add_sorted_value(redisdb:Redis, k:str, v:str, score:float):
+    """정렬 집합에 추가 (score 갱신)"""
+    try:
+        await redisdb.zadd(k, {v: score})
+    except Exception as e:
+        raise DBError(context=f"error add_sorted_value {k} {v}", original_exception=e)
+
+async def move_due_values(redisdb:Redis, src:str, dst:str, max_score:float) -> int:
+    """정렬 집합 src 에서 score <= max_score 인 값을 dst 리스트 오른쪽 (다음 꺼낼 위치) 으로 이동
+        src 에서 실제로 뺀 경우에만 넣음 (여러 worker 가 동시에 옮겨도 중복 없음). 옮긴 개수 반환
+    """
+    try:
+        moved = 0
+        for v in await redisdb.zrangebyscore(src, "-inf", max_score):
+            if await redisdb.zrem(src, v):
+                await redisdb.rpush(dst, v)
+                moved += 1
+        return moved
+    except Exception as e:
+        raise DBError(context=f"error move_due_values {src} {dst}", original_exception=e)
+
+async def get_list(redisdb:Redis, k:str) -> list:
+    try:
+        return await redisdb.lrange(k, 0, -1)
+    except Exception as e:
+        raise DBError(context=f"error get_list {k}", original_exception=e)
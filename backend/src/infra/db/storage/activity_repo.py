@@ -1,13 +1,126 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, bindparam
 from uuid import UUID
-from typing import List
+from typing import List, Tuple
 from datetime import datetime
 
-from infra.db.orm.models import TrainSession, TrainSessionStream, TrainSessionLap
-from schemas.models import ActivityData, LapData, StreamData
-from config.exceptions import DBError
+from infra.db.orm.models import TrainSession, TrainSessionStream, TrainSessionLap, TrainSessionMetric
+from schemas.models import ActivityData, LapData, StreamData, StreamMetrics
+from infra.stream_codec import encode_stream_arrays, stream_to_arrays
+from domains.stream_downsampler import downsample_stream
+from config.constants import STREAM_PREVIEW_POINTS
+from infra.db.storage.record_repo import merge_personal_records
+from config.exceptions import DBError, DuplicateError
+
+# --- 재사용 statement ---
+# 조회 구문은 모듈 로드시 한번만 만들고 값은 bindparam 으로 전달
+# 호출마다 select() 생성 비용 없이 컴파일 캐시 / asyncpg prepared statement 재사용
+_SESSIONS_BY_DATE = (
+    select(TrainSession)
+    .where(TrainSession.user_id == bindparam("user_id"),
+           TrainSession.train_date >= bindparam("start_date"))
+    .order_by(TrainSession.train_date)
+)
+_SESSION_BY_ID = select(TrainSession).where(TrainSession.id == bindparam("session_id"))
+_OWNED_SESSION = (
+    select(TrainSession)
+    .where(and_(TrainSession.user_id == bindparam("user_id"),
+                TrainSession.id == bindparam("session_id")))
+)
+_SESSION_BY_ACTIVITY_ID = (
+    select(TrainSession)
+    .where(and_(TrainSession.user_id == bindparam("user_id"),
+                TrainSession.activity_id == bindparam("activity_id"),
+                TrainSession.provider == bindparam("provider")))
+)
+_EXISTING_ACTIVITY_IDS = (
+    select(TrainSession.activity_id)
+    .where(and_(TrainSession.user_id == bindparam("user_id"),
+                TrainSession.provider == bindparam("provider"),
+                TrainSession.activity_id.in_(bindparam("activity_ids", expanding=True))))
+)
+_STREAM_BY_SESSION = select(TrainSessionStream).where(TrainSessionStream.session_id == bindparam("session_id"))
+_METRIC_BY_SESSION = select(TrainSessionMetric).where(TrainSessionMetric.session_id == bindparam("session_id"))
+_LAPS_BY_SESSION = select(TrainSessionLap).where(TrainSessionLap.session_id == bindparam("session_id"))
+
+# 같은 활동 중복 저장 (동시 sync) 을 나타내는 제약
+SESSION_UNIQUE_CONSTRAINT = "uq_provider_activity"
+
+
+def _violated_constraint(e:IntegrityError) -> str | None:
+    """위반된 제약 이름. asyncpg (원인 예외) / psycopg (diag) 에서 확인, 알 수 없으면 None"""
+    orig = e.orig
+    for source in (orig, getattr(orig, "__cause__", None), getattr(orig, "diag", None)):
+        name = getattr(source, "constraint_name", None)
+        if name:
+            return name
+    return None
+
+
+def _is_duplicate_session(e:IntegrityError) -> bool:
+    """세션 중복 (provider, activity_id) 위반인지. 최고기록 등 다른 제약 위반은 False"""
+    name = _violated_constraint(e)
+    if name is not None:
+        return name == SESSION_UNIQUE_CONSTRAINT
+    # 제약 이름을 주지 않는 드라이버 (sqlite) 는 메시지의 컬럼으로 판단
+    return "trainsession.activity_id" in str(e.orig)
+
+
+# --- row builders ---
+def _build_train_session(user_id:UUID, activity:ActivityData) -> TrainSession:
+    session_data = {
+        "user_id": user_id,
+        "provider": activity.provider,
+        "train_date": activity.start_date,
+        "distance": activity.distance,
+        "avg_speed": activity.average_speed,
+        "total_time": activity.elapsed_time,
+        "activity_title": activity.activity_title,
+        "analysis_result": activity.analysis_result,
+    }
+
+    # local이면 activity_id 아예 빼서 DB DEFAULT 적용
+    if activity.provider == "strava":
+        session_data["activity_id"] = activity.activity_id
+    
+    return TrainSession(**session_data)
+
+def _build_stream(session_id:UUID, stream:StreamData) -> TrainSessionStream:
+    # stream 데이터 압축 바이너리로 변환 + 저해상도 미리 계산
+    arrays = stream_to_arrays(stream)
+    return TrainSessionStream(
+        session_id=session_id,
+        data=encode_stream_arrays(arrays),
+        preview=encode_stream_arrays(downsample_stream(arrays, STREAM_PREVIEW_POINTS)),
+    )
+
+def _build_metric(session_id:UUID, metrics:StreamMetrics) -> TrainSessionMetric:
+    return TrainSessionMetric(
+        session_id=session_id,
+        hr_zones=metrics.hr_zones,
+        best_efforts=metrics.best_efforts,
+        gap=metrics.gap,
+        cardiac_drift=metrics.cardiac_drift,
+        cadence_cv=metrics.cadence_cv,
+    )
+
+def _build_laps(session_id:UUID, laps:List[LapData]) -> List[TrainSessionLap]:
+    return [
+        TrainSessionLap(
+            session_id=session_id,
+            lap_index=lap.lap_index,
+            distance=lap.distance,
+            elapsed_time=lap.elapsed_time,
+            average_speed=lap.average_speed,
+            max_speed=lap.max_speed,
+            average_heartrate=lap.average_heartrate,
+            max_heartrate=lap.max_heartrate,
+            average_cadence=lap.average_cadence,
+            elevation_gain=lap.elevation_gain
+        )
+        for lap in laps
+    ]
 
 # --- TrainSession ---
 async def add_train_session(db: AsyncSession,
@@ -16,22 +129,7 @@ async def add_train_session(db: AsyncSession,
                             ) -> TrainSession:
     try:
         
-        session_data = {
-            "user_id": user_id,
-            "provider": activity.provider,
-            "train_date": activity.start_date,
-            "distance": activity.distance,
-            "avg_speed": activity.average_speed,
-            "total_time": activity.elapsed_time,
-            "activity_title": activity.activity_title,
-            "analysis_result": activity.analysis_result,
-        }
-
-        # local이면 activity_id 아예 빼서 DB DEFAULT 적용
-        if activity.provider == "strava":
-            session_data["activity_id"] = activity.activity_id
-        
-        session = TrainSession(**session_data)
+        session = _build_train_session(user_id=user_id, activity=activity)
 
         db.add(session)
         await db.commit()
@@ -39,12 +137,56 @@ async def add_train_session(db: AsyncSession,
         return session
     except IntegrityError as e:
         await db.rollback()
-        # raise DBError(context=f"[add_train_session] failed id={user_id}", original_exception=e)
-        return None
+        # 이미 저장된 활동만 스킵
+        if _is_duplicate_session(e):
+            return None
+        raise DBError(context=f"[add_train_session] integrity error {_violated_constraint(e)} id={user_id}",
+                      original_exception=e)
     except Exception as e:
         await db.rollback()
         raise DBError(context=f"[add_train_session] failed id={user_id}", original_exception=e)
     
+async def add_train_sessions_bulk(db: AsyncSession,
+                                  user_id:UUID,
+                                  sessions:List[Tuple[ActivityData, List[LapData], StreamData]],
+                                  ) -> int:
+    """여러 훈련 세션 + 랩 + 스트림 (+ 지표, 최고기록) 을 하나의 트랜잭션으로 저장 (commit 1회)
+        id 는 클라이언트에서 생성(uuid4) 되므로 refresh / RETURNING 불필요.
+        세션 flush 후 랩, 스트림이 executemany 로 묶여서 insert 됨.
+        
+        return: 저장된 세션 수
+    """
+    try:
+        rows = []
+        records = []
+        for activity, laps, stream in sessions:
+            session = _build_train_session(user_id=user_id, activity=activity)
+            rows.append(session)
+            if stream is not None:
+                rows.append(_build_stream(session_id=session.id, stream=stream))
+            if laps:
+                rows.extend(_build_laps(session_id=session.id, laps=laps))
+            if activity.metrics is not None:
+                rows.append(_build_metric(session_id=session.id, metrics=activity.metrics))
+                records.append((session.id, activity.start_date, activity.metrics.best_efforts))
+        
+        db.add_all(rows)
+        # 최고기록 인덱스도 같은 트랜잭션에서 갱신
+        await merge_personal_records(db=db, user_id=user_id, candidates=records)
+        await db.commit()
+        return len(sessions)
+    except IntegrityError as e:
+        await db.rollback()
+        # 세션 중복만 DuplicateError (호출하는 쪽에서 중복 제외 후 재시도)
+        if _is_duplicate_session(e):
+            raise DuplicateError(context=f"[add_train_sessions_bulk] duplicate session id={user_id}",
+                                 original_exception=e)
+        raise DBError(context=f"[add_train_sessions_bulk] integrity error {_violated_constraint(e)} id={user_id}",
+                      original_exception=e)
+    except Exception as e:
+        await db.rollback()
+        raise DBError(context=f"[add_train_sessions_bulk] failed id={user_id}", original_exception=e)
+    
 async def get_train_session_by_date( db: AsyncSession, 
                                     user_id:UUID,
                                     start_date:datetime = None
@@ -52,11 +194,7 @@ async def get_train_session_by_date( db: AsyncSession,
     try:
 
         result = await db.execute(
-            select(TrainSession)
-            .where(TrainSession.user_id == user_id, 
-                   TrainSession.train_date >= start_date
-                   )
-            .order_by(TrainSession.train_date)
+            _SESSIONS_BY_DATE, {"user_id": user_id, "start_date": start_date}
             )
         
         return result.scalars().all()
@@ -67,26 +205,42 @@ async def get_train_session_by_date( db: AsyncSession,
 
 async def get_train_session_by_id(session_id: UUID, db: AsyncSession) -> TrainSession | None:
     try:
-        res = await db.execute(
-            select(TrainSession).where(TrainSession.id == session_id)
-            )
+        res = await db.execute(_SESSION_BY_ID, {"session_id": session_id})
         return res.scalar_one_or_none()
     except Exception as e:
         raise DBError(context=f"[get_train_session_by_id] failed id={session_id}", original_exception=e)
 
+async def get_owned_train_session(user_id: UUID, session_id: UUID, db: AsyncSession) -> TrainSession | None:
+    """사용자 소유 세션만 조회. 세부정보(lap, stream) 조회 전 공통 소유권 확인"""
+    try:
+        res = await db.execute(_OWNED_SESSION, {"user_id": user_id, "session_id": session_id})
+        return res.scalar_one_or_none()
+    except Exception as e:
+        raise DBError(context=f"[get_owned_train_session] failed id={session_id}", original_exception=e)
+
 async def get_train_session_by_activity_id(user_id:UUID, activity_id: int, provider:str, db: AsyncSession) -> TrainSession | None:
     try:
         res = await db.execute(
-            select(TrainSession).where(
-                and_(TrainSession.user_id == user_id, 
-                     TrainSession.activity_id == activity_id,
-                     TrainSession.provider == provider
-                     )
-            ))
+            _SESSION_BY_ACTIVITY_ID,
+            {"user_id": user_id, "activity_id": activity_id, "provider": provider}
+            )
         return res.scalar_one_or_none()
     except Exception as e:
         raise DBError(context=f"[get_session_by_activity_id] failed id={user_id} : {activity_id}", original_exception=e)
 
+async def get_existing_activity_ids(user_id:UUID, provider:str, activity_ids:List[int], db: AsyncSession) -> set[int]:
+    """주어진 activity_id 중 이미 저장된 것만 한번의 쿼리로 조회"""
+    try:
+        if not activity_ids:
+            return set()
+        res = await db.execute(
+            _EXISTING_ACTIVITY_IDS,
+            {"user_id": user_id, "provider": provider, "activity_ids": list(activity_ids)}
+            )
+        return set(res.scalars().all())
+    except Exception as e:
+        raise DBError(context=f"[get_existing_activity_ids] failed id={user_id}", original_exception=e)
+
 async def get_train_sessions_by_user(user_id: UUID, db: AsyncSession) -> list[TrainSession]:
     try:
         res = await db.execute(select(TrainSession).where(TrainSession.user_id == user_id))
@@ -117,15 +271,7 @@ async def delete_train_session(train_session: TrainSession, db: AsyncSession) ->
 # --- TrainSessionStream ---
 async def add_train_session_stream(db: AsyncSession, session_id:UUID, stream:StreamData) -> TrainSessionStream:
     try:
-        # stream 데이터 json 형식으로 변환
-        data = TrainSessionStream(
-            session_id=session_id,
-            heartrate=stream.heartrate,
-            cadence=stream.cadence,
-            distance=stream.distance,
-            velocity=stream.velocity,
-            altitude=stream.altitude
-        )
+        data = _build_stream(session_id=session_id, stream=stream)
         
         db.add(data)
         await db.commit()
@@ -135,20 +281,10 @@ async def add_train_session_stream(db: AsyncSession, session_id:UUID, stream:Str
         await db.rollback()
         raise DBError(context=f"[add_train_session_stream] failed activity_id={session_id}", original_exception=e)
 
-async def get_train_session_stream(user_id:UUID, session_id: UUID, db: AsyncSession) -> TrainSessionStream :
+async def get_train_session_stream(session_id: UUID, db: AsyncSession) -> TrainSessionStream | None:
+    """소유권 확인은 get_owned_train_session 에서"""
     try:
-
-        check = await db.execute(
-            select(TrainSession)
-            .where(
-                and_(TrainSession.user_id == user_id, TrainSession.id == session_id))
-            )
-        valid = check.scalar_one_or_none()
-        if not valid: # user id sessionid mismatch
-            raise DBError(context=f"invalid session id {session_id}", original_exception=None)
-
-
-        res = await db.execute(select(TrainSessionStream).where(TrainSessionStream.session_id == session_id))
+        res = await db.execute(_STREAM_BY_SESSION, {"session_id": session_id})
         return res.scalar_one_or_none()
     except Exception as e:
         raise DBError(context=f"[get_train_session_stream] failed session_id={session_id}", original_exception=e)
@@ -171,26 +307,28 @@ async def delete_train_session_stream(stream: TrainSessionStream, db: AsyncSessi
         await db.rollback()
         raise DBError(context=f"[delete_train_session_stream] failed session_id={stream.session_id}", original_exception=e)
 
+# --- TrainSessionMetric ---
+async def add_train_session_metric(db: AsyncSession, session_id:UUID, metrics:StreamMetrics) -> TrainSessionMetric:
+    try:
+        data = _build_metric(session_id=session_id, metrics=metrics)
+        db.add(data)
+        await db.commit()
+        return data
+    except Exception as e:
+        await db.rollback()
+        raise DBError(context=f"[add_train_session_metric] failed session_id={session_id}", original_exception=e)
+
+async def get_train_session_metric(session_id: UUID, db: AsyncSession) -> TrainSessionMetric | None:
+    try:
+        res = await db.execute(_METRIC_BY_SESSION, {"session_id": session_id})
+        return res.scalar_one_or_none()
+    except Exception as e:
+        raise DBError(context=f"[get_train_session_metric] failed session_id={session_id}", original_exception=e)
+
 # --- TrainSessionLap ---
 async def add_train_session_lap(db: AsyncSession, session_id:UUID, laps: List[LapData]) -> List[TrainSessionLap]:
     try:
-        rows = [
-            TrainSessionLap(
-                session_id=session_id,
-                lap_index=lap.lap_index,
-                distance=lap.distance,
-                elapsed_time=lap.elapsed_time,
-                average_speed=lap.average_speed,
-                max_speed=lap.max_speed,
-                average_heartrate=lap.average_heartrate,
-                max_heartrate=lap.max_heartrate,
-                average_cadence=lap.average_cadence,
-                elevation_gain=lap.elevation_gain
-            )
-            for lap in laps
-        ]
-        
-        
+        rows = _build_laps(session_id=session_id, laps=laps)
         
         db.add_all(rows)
         await db.commit()
@@ -200,21 +338,10 @@ async def add_train_session_lap(db: AsyncSession, session_id:UUID, laps: List[La
         await db.rollback()
         raise DBError(context=f"[add_train_session_lap] failed session_id={session_id}", original_exception=e)
 
-async def get_train_session_laps(user_id:UUID, session_id: UUID, db: AsyncSession) -> list[TrainSessionLap]:
+async def get_train_session_laps(session_id: UUID, db: AsyncSession) -> list[TrainSessionLap]:
+    """소유권 확인은 get_owned_train_session 에서"""
     try:
-        check = await db.execute(
-            select(TrainSession)
-            .where(
-                and_(TrainSession.user_id == user_id, TrainSession.id == session_id))
-            )
-        valid = check.scalar_one_or_none()
-        if not valid: # user id sessionid mismatch
-            raise DBError(context="invalid session id", original_exception=None)
-
-        res = await db.execute(
-            select(TrainSessionLap)
-            .where(TrainSessionLap.session_id == session_id)
-            )
+        res = await db.execute(_LAPS_BY_SESSION, {"session_id": session_id})
         return res.scalars().all()
     except Exception as e:
         raise DBError(context=f"[get_train_session_laps] failed session_id={session_id}", original_exception=e)
@@ -1,8 +1,9 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
-from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy import select, update, delete, and_, func, tuple_, exists, bindparam, Integer
+from sqlalchemy.orm import selectinload
 from uuid import UUID
 from typing import List, Tuple
+from datetime import datetime
 from sqlalchemy.exc import IntegrityError
 
 
@@ -40,9 +41,10 @@ async def update_feed(db: AsyncSession, feed_id: UUID, title: str = None, train_
 		await db.rollback()
 		raise DBError(context=f"[update_feed] failed feed_id={feed_id}", original_exception=e)
 
-async def delete_feed(db: AsyncSession, feed_id: UUID) -> bool:
+async def delete_feed(db: AsyncSession, feed_id: UUID, user_id: UUID) -> bool:
+	"""작성자 본인 피드만 삭제. 없거나 다른 사용자 피드면 False"""
 	try:
-		res = await db.execute(select(Feed).where(Feed.id == feed_id))
+		res = await db.execute(select(Feed).where(and_(Feed.id == feed_id, Feed.user_id == user_id)))
 		feed = res.scalar_one_or_none()
 		if not feed:
 			return False
@@ -53,22 +55,52 @@ async def delete_feed(db: AsyncSession, feed_id: UUID) -> bool:
 		await db.rollback()
 		raise DBError(context=f"[delete_feed] failed feed_id={feed_id}", original_exception=e)
 
+# --- 재사용 statement ---
+# 조회 구문은 모듈 로드시 한번만 만들고 값은 bindparam 으로 전달
+# 호출마다 select() 생성 비용 없이 컴파일 캐시 / asyncpg prepared statement 재사용
+
+# 사용자 좋아요 여부. uq_feed_user_like (feed_id, user_id) 인덱스 조회
+_MY_LIKE = (
+	exists()
+	.where(and_(FeedLikes.feed_id == Feed.id, FeedLikes.user_id == bindparam("user_id")))
+	.label("my_like")
+)
+_FEED_ROW = (
+	select(
+		Feed,
+		Feed.likes_count,
+		_MY_LIKE,
+		User.name.label("user_name")
+	)
+	.join(User, User.id == Feed.user_id)  # Feed 작성자 join
+)
+_FEED_BY_ID = _FEED_ROW.where(Feed.id == bindparam("feed_id"))
+# 첫 페이지 / cursor 이후 페이지. cursor 유무로 구문이 달라 두 개로 나눔
+_FEED_FIRST_PAGE = (
+	_FEED_ROW
+	.order_by(Feed.created_at.desc(), Feed.id.desc())
+	.limit(bindparam("limit", type_=Integer))
+)
+_FEED_NEXT_PAGE = (
+	_FEED_ROW
+	.where(tuple_(Feed.created_at, Feed.id) < tuple_(
+		bindparam("cursor_created_at", type_=Feed.__table__.c.created_at.type),
+		bindparam("cursor_id", type_=Feed.__table__.c.id.type),
+	))
+	.order_by(Feed.created_at.desc(), Feed.id.desc())
+	.limit(bindparam("limit", type_=Integer))
+)
+_LIKED_FEED_IDS = (
+	select(FeedLikes.feed_id)
+	.where(and_(FeedLikes.user_id == bindparam("user_id"),
+				FeedLikes.feed_id.in_(bindparam("feed_ids", expanding=True))))
+)
+_LIKES_COUNT = select(Feed.likes_count).where(Feed.id == bindparam("feed_id"))
+
+
 async def get_feed(db: AsyncSession, user_id:UUID, feed_id: UUID) -> Tuple[Feed, int, bool, str]:
 	try:
-		FL = aliased(FeedLikes)
-		stmt = (
-			select(
-				Feed,
-				func.count(FL.id).label("likes_count"),
-				func.coalesce(func.bool_or(FL.user_id == user_id), False).label("my_like"),
-				User.name.label("user_name")
-			)
-			.join(User, User.id == Feed.user_id)  # Feed 작성자 join
-			.outerjoin(FL, FL.feed_id == Feed.id)
-			.where(Feed.id == feed_id)
-			.group_by(Feed.id, User.name)
-		)
-		res = await db.execute(stmt)
+		res = await db.execute(_FEED_BY_ID, {"user_id": user_id, "feed_id": feed_id})
 		return res.one_or_none()  # (Feed, likes_count, my_like)
 	except Exception as e:
 		raise DBError(context=f"[get_feed] failed feed_id={feed_id}", original_exception=e)
@@ -76,41 +108,56 @@ async def get_feed(db: AsyncSession, user_id:UUID, feed_id: UUID) -> Tuple[Feed,
 
 async def get_feeds_with_likes(db: AsyncSession,
 								user_id: UUID,
-								offset: int = 0,
+								cursor: Tuple[datetime, UUID] | None = None,
 								limit: int = 20
 							) -> List[Tuple[Feed, int, bool, str]]:
     """
     Feed 리스트 + likes_count + my_like를 한 번의 쿼리로 가져오기
+    cursor: 이전 페이지 마지막 (created_at, id). 그보다 오래된 피드부터 (keyset)
+    likes_count 는 컬럼, my_like 는 행별 인덱스 조회. 집계 없이 (created_at, id) 범위 스캔
     반환: List of Tuple(Feed, likes_count, my_like)
     """
     try:
-        FL = aliased(FeedLikes)
-        stmt = (
-            select(
-                Feed,
-                func.count(FL.id).label("likes_count"),
-                func.coalesce(func.bool_or(FL.user_id == user_id), False).label("my_like"),
-				User.name.label("user_name")
+        if cursor is None:
+            res = await db.execute(_FEED_FIRST_PAGE, {"user_id": user_id, "limit": limit})
+        else:
+            res = await db.execute(
+                _FEED_NEXT_PAGE,
+                {"user_id": user_id, "limit": limit,
+                 "cursor_created_at": cursor[0], "cursor_id": cursor[1]}
             )
-			.join(User, User.id == Feed.user_id)
-            .outerjoin(FL, FL.feed_id == Feed.id)
-            .group_by(Feed.id, User.name)
-            .order_by(Feed.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-        )
-        res = await db.execute(stmt)
         return res.all()  # [(Feed, likes_count, my_like), ...]
     except Exception as e:
         raise DBError(context="[get_feeds_with_likes] failed", original_exception=e)
 
 
-async def create_feed_like(db: AsyncSession, feed_id: UUID, user_id: UUID) -> bool:
+async def get_liked_feed_ids(db: AsyncSession, user_id: UUID, feed_ids: List[UUID]) -> set[UUID]:
+	"""feed_ids 중 사용자가 좋아요 한 피드. 캐시된 페이지에 my_like 덮어쓰기용"""
 	try:
-		feed_like = FeedLikes(feed_id=feed_id, user_id=user_id)
-		db.add(feed_like)
+		if not feed_ids:
+			return set()
+		res = await db.execute(_LIKED_FEED_IDS, {"user_id": user_id, "feed_ids": list(feed_ids)})
+		return set(res.scalars().all())
+	except Exception as e:
+		raise DBError(context=f"[get_liked_feed_ids] failed user_id={user_id}", original_exception=e)
+
+
+async def create_feed_like(db: AsyncSession, feed_id: UUID, user_id: UUID) -> int:
+	"""좋아요 추가 + likes_count 증가 (한 트랜잭션)
+	반환값: 증가된 likes_count
+	"""
+	try:
+		db.add(FeedLikes(feed_id=feed_id, user_id=user_id))
+		await db.flush()
+		res = await db.execute(
+			update(Feed)
+			.where(Feed.id == feed_id)
+			.values(likes_count=Feed.likes_count + 1)
+			.returning(Feed.likes_count)
+		)
+		likes_count = res.scalar_one()
 		await db.commit()
-		return True
+		return likes_count
 	except IntegrityError:
 		await db.rollback()
 		raise DuplicateError(detail="liked already.")
@@ -119,21 +166,56 @@ async def create_feed_like(db: AsyncSession, feed_id: UUID, user_id: UUID) -> bo
 		await db.rollback()
 		raise DBError(context=f"[create_feed_like] failed feed_id={feed_id}, user_id={user_id}", original_exception=e)
 
-async def delete_feed_like(db: AsyncSession, feed_id: UUID, user_id: UUID) -> bool:
+async def delete_feed_like(db: AsyncSession, feed_id: UUID, user_id: UUID) -> Tuple[bool, int | None]:
 	"""
-    특정 피드에 대한 사용자의 좋아요 삭제
-    반환값:
-        True  - 삭제 성공
-        False - 삭제할 좋아요가 없음
+    특정 피드에 대한 사용자의 좋아요 삭제 + likes_count 감소 (한 트랜잭션)
+    반환값: (삭제 여부, likes_count)
+        (True, n)     - 삭제 성공. 감소된 likes_count
+        (False, n)    - 삭제할 좋아요가 없음. 현재 likes_count
+        (False, None) - 피드 없음
     """
 	try:
-		res = await db.execute(select(FeedLikes).where(and_(FeedLikes.feed_id == feed_id, FeedLikes.user_id == user_id)))
-		feed_like = res.scalar_one_or_none()
-		if not feed_like:
-			return False
-		await db.delete(feed_like)
+		res = await db.execute(
+			delete(FeedLikes)
+			.where(and_(FeedLikes.feed_id == feed_id, FeedLikes.user_id == user_id))
+		)
+		if res.rowcount == 0:
+			await db.rollback()
+			current = await db.execute(_LIKES_COUNT, {"feed_id": feed_id})
+			return False, current.scalar_one_or_none()
+		res = await db.execute(
+			update(Feed)
+			.where(Feed.id == feed_id)
+			.values(likes_count=Feed.likes_count - 1)
+			.returning(Feed.likes_count)
+		)
+		likes_count = res.scalar_one()
 		await db.commit()
-		return True
+		return True, likes_count
+	except Exception as e:
+		await db.rollback()
+		raise DBError(context=f"[delete_feed_like] failed feed_id={feed_id}, user_id={user_id}", original_exception=e)
+
+
+async def reconcile_likes_count(db: AsyncSession) -> int:
+	"""
+	FeedLikes 기준으로 likes_count 재계산. 어긋난 피드만 갱신
+	반환값: 수정된 피드 수
+	"""
+	try:
+		actual = (
+			select(func.count(FeedLikes.id))
+			.where(FeedLikes.feed_id == Feed.id)
+			.scalar_subquery()
+		)
+		res = await db.execute(
+			update(Feed)
+			.where(Feed.likes_count != actual)
+			.values(likes_count=actual)
+			.execution_options(synchronize_session=False)
+		)
+		await db.commit()
+		return res.rowcount
 	except Exception as e:
 		await db.rollback()
-		raise DBError(context=f"[delete_feed_like] failed feed_id={feed_id}, user_id={user_id}", original_exception=e)
\ No newline at end of file
+		raise DBError(context="[reconcile_likes_count] failed", original_exception=e)
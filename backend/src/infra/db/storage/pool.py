@@ -0,0 +1,77 @@
+"""
+db 커넥션 풀 설정 + prometheus 지표
+app 인스턴스별 (pool_size + max_overflow) 합이 postgres max_connections 안에 들어오도록
+지표 보고 조정
+"""
+import time
+from prometheus_client import Gauge, Histogram, Counter
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from config.settings import DatabaseConfig
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "사용중인 db 커넥션 수",
+    ["engine"],
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "pool_size 초과로 연 커넥션 수 (음수면 아직 열지 않은 기본 커넥션)",
+    ["engine"],
+)
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "커넥션 획득 대기 시간",
+    ["engine"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts",
+    "pool_timeout 초과로 커넥션 획득 실패",
+    ["engine"],
+)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """커넥션 획득 대기 시간 측정 풀"""
+    engine_name = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.labels(self.engine_name).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.labels(self.engine_name).observe(time.perf_counter() - start)
+
+
+def engine_options(config:DatabaseConfig, name:str = "primary", url:str = None) -> dict:
+    """create_async_engine 인자. sqlite 는 풀 설정 없이 기본값"""
+    options = {"echo": config.echo}
+    if (url or config.url).startswith("sqlite"):
+        return options
+
+    # 엔진별 라벨을 가진 풀 클래스
+    pool_class = type(f"TimedQueuePool_{name}", (TimedQueuePool,), {"engine_name": name})
+    options.update(
+        poolclass=pool_class,
+        pool_size=config.pool_size,
+        max_overflow=config.max_overflow,
+        pool_timeout=config.pool_timeout,
+        pool_recycle=config.pool_recycle,
+        pool_pre_ping=config.pool_pre_ping,
+    )
+    return options
+
+
+def register_pool_metrics(engine:AsyncEngine, name:str = "primary"):
+    """scrape 시점에 풀 상태 조회"""
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, TimedQueuePool):
+        return
+    DB_POOL_CHECKED_OUT.labels(name).set_function(pool.checkedout)
+    DB_POOL_OVERFLOW.labels(name).set_function(pool.overflow)
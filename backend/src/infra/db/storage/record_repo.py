@@ -0,0 +1,88 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete
+from uuid import UUID
+from typing import List, Tuple
+from datetime import datetime
+
+from infra.db.orm.models import PersonalRecord, TrainSession, TrainSessionMetric
+from config.exceptions import DBError
+
+# (session_id, train_date, best_efforts {"5k": sec, ...})
+RecordCandidate = Tuple[UUID, datetime, dict]
+
+
+async def merge_personal_records(db: AsyncSession,
+                                 user_id: UUID,
+                                 candidates: List[RecordCandidate]) -> None:
+    """새 세션들의 구간 기록을 기존 인덱스와 비교해서 더 빠른 기록만 반영 (commit 안함)
+        호출하는 쪽 트랜잭션에 포함
+    """
+    # 후보 중 (거리, 연도) 별 최고기록만
+    best = {}
+    for session_id, train_date, efforts in candidates:
+        for distance, elapsed in (efforts or {}).items():
+            key = (distance, train_date.year)
+            if key not in best or elapsed < best[key][0]:
+                best[key] = (elapsed, session_id, train_date)
+    if not best:
+        return
+
+    res = await db.execute(select(PersonalRecord).where(PersonalRecord.user_id == user_id))
+    existing = {(r.distance, r.year): r for r in res.scalars().all()}
+
+    for (distance, year), (elapsed, session_id, train_date) in best.items():
+        record = existing.get((distance, year))
+        if record is None:
+            db.add(PersonalRecord(user_id=user_id,
+                                  session_id=session_id,
+                                  distance=distance,
+                                  year=year,
+                                  elapsed_time=elapsed,
+                                  train_date=train_date))
+        elif elapsed < record.elapsed_time:
+            record.session_id = session_id
+            record.elapsed_time = elapsed
+            record.train_date = train_date
+
+
+async def update_personal_records(db: AsyncSession,
+                                  user_id: UUID,
+                                  candidates: List[RecordCandidate]) -> None:
+    try:
+        await merge_personal_records(db=db, user_id=user_id, candidates=candidates)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise DBError(context=f"[update_personal_records] failed id={user_id}", original_exception=e)
+
+
+async def rebuild_personal_records(db: AsyncSession, user_id: UUID) -> None:
+    """세션 삭제 등으로 기록이 사라진 경우 저장된 지표(metric)로 인덱스 재생성
+        스트림은 읽지 않음
+    """
+    try:
+        res = await db.execute(
+            select(TrainSession.id, TrainSession.train_date, TrainSessionMetric.best_efforts)
+            .join(TrainSessionMetric, TrainSessionMetric.session_id == TrainSession.id)
+            .where(TrainSession.user_id == user_id,
+                   TrainSessionMetric.best_efforts.is_not(None))
+        )
+        candidates = res.all()
+
+        await db.execute(delete(PersonalRecord).where(PersonalRecord.user_id == user_id))
+        await merge_personal_records(db=db, user_id=user_id, candidates=candidates)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise DBError(context=f"[rebuild_personal_records] failed id={user_id}", original_exception=e)
+
+
+async def get_personal_records(db: AsyncSession, user_id: UUID, year: int = None) -> List[PersonalRecord]:
+    try:
+        stmt = select(PersonalRecord).where(PersonalRecord.user_id == user_id)
+        if year is not None:
+            stmt = stmt.where(PersonalRecord.year == year)
+        res = await db.execute(stmt)
+        return res.scalars().all()
+    except Exception as e:
+        raise DBError(context=f"[get_personal_records] failed id={user_id}", original_exception=e)
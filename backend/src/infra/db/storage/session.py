@@ -1,12 +1,24 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from fastapi import Depends
 from config.settings import db
 from sqlmodel import SQLModel
+from infra.db.storage.pool import engine_options, register_pool_metrics
 
 engine = create_async_engine(
     url=db.url,
-    echo=db.echo,
+    **engine_options(db),
 )
+register_pool_metrics(engine)
+
+# 조회 전용 replica (선택)
+read_engine = None
+if db.read_url:
+    read_engine = create_async_engine(
+        url=db.read_url,
+        **engine_options(db, name="replica", url=db.read_url),
+    )
+    register_pool_metrics(read_engine, name="replica")
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
@@ -15,14 +27,32 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False,
 )
 
+ReadSessionLocal = sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+) if read_engine is not None else None
+
 async def create_db_and_tables() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
 
 async def close_db() -> None:
     await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
 
 # Dependency for FastAPI
 async def get_session():
     async with AsyncSessionLocal() as session:
         yield session
+
+# 조회 전용 세션. replica 없으면 요청의 primary 세션 그대로 사용 (커넥션 추가 없음)
+# 라우터는 항상 adapter 에 read_db 로 넘기고, 어떤 조회를 replica 로 보낼지는 adapter 메서드가 결정
+async def get_read_session(primary:AsyncSession = Depends(get_session)):
+    if ReadSessionLocal is None:
+        yield primary
+        return
+    async with ReadSessionLocal() as session:
+        yield session
@@ -1,12 +1,27 @@
 from typing import Optional, List
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, or_, bindparam
 from sqlalchemy.exc import IntegrityError
 from infra.db.orm.models import ThirdPartyToken
 from config.exceptions import DBError
 
 
+# --- 재사용 statement ---
+# 조회 구문은 모듈 로드시 한번만 만들고 값은 bindparam 으로 전달
+# populate_existing: 같은 세션에서 다시 조회해도 db 값 반영 (토큰 갱신 대기 후 재조회)
+_TOKEN_BY_USER = select(ThirdPartyToken).where(
+    ThirdPartyToken.user_id == bindparam("user_id"),
+    ThirdPartyToken.provider == bindparam("provider")
+).execution_options(populate_existing=True)
+_TOKEN_BY_PROVIDER_USER = select(ThirdPartyToken).where(
+    ThirdPartyToken.provider == bindparam("provider"),
+    ThirdPartyToken.provider_user_id == bindparam("provider_user_id")
+)
+_TOKENS_BY_PROVIDER = select(ThirdPartyToken).where(ThirdPartyToken.provider == bindparam("provider"))
+_TOKENS_BY_USER = select(ThirdPartyToken).where(ThirdPartyToken.user_id == bindparam("user_id"))
+
+
 ## third party token functions
 async def create_third_party_token(
     user_id: UUID,
@@ -49,12 +64,7 @@ async def get_third_party_token_by_user_id(
 ) -> Optional[ThirdPartyToken]:
     """사용자 ID와 프로바이더로 토큰을 조회합니다."""
     try:
-        res = await db.execute(
-            select(ThirdPartyToken).where(
-                ThirdPartyToken.user_id == user_id,
-                ThirdPartyToken.provider == provider
-            )
-        )
+        res = await db.execute(_TOKEN_BY_USER, {"user_id": user_id, "provider": provider})
         return res.scalar_one_or_none()
         
     except Exception as e:
@@ -69,10 +79,8 @@ async def get_third_party_token_by_provider_user_id(
     """프로바이더와 프로바이더 사용자 ID로 토큰을 조회합니다."""
     try:
         res = await db.execute(
-            select(ThirdPartyToken).where(
-                ThirdPartyToken.provider == provider,
-                ThirdPartyToken.provider_user_id == provider_user_id
-            )
+            _TOKEN_BY_PROVIDER_USER,
+            {"provider": provider, "provider_user_id": provider_user_id}
         )
         return res.scalar_one_or_none()
         
@@ -111,6 +119,29 @@ async def update_third_party_token(
         raise DBError(context=f"[update_third_party_token] failed id={user_id}", original_exception=e)
 
 
+async def update_last_synced_at(
+    user_id: UUID,
+    provider: str,
+    last_synced_at: int,
+    db: AsyncSession
+) -> None:
+    """마지막 sync 된 활동 시간을 갱신합니다. 기존 값보다 클 때만 갱신."""
+    try:
+        await db.execute(
+            update(ThirdPartyToken).where(
+                ThirdPartyToken.user_id == user_id,
+                ThirdPartyToken.provider == provider,
+                or_(ThirdPartyToken.last_synced_at.is_(None),
+                    ThirdPartyToken.last_synced_at < last_synced_at)
+            ).values(last_synced_at=last_synced_at)
+        )
+        await db.commit()
+        
+    except Exception as e:
+        await db.rollback()
+        raise DBError(context=f"[update_last_synced_at] failed id={user_id}", original_exception=e)
+
+
 async def delete_third_party_token(
     user_id: UUID,
     provider: str,
@@ -144,11 +175,7 @@ async def get_all_tokens_by_provider(
 ) -> List[ThirdPartyToken]:
     """특정 프로바이더의 모든 토큰을 조회합니다."""
     try:
-        res = await db.execute(
-            select(ThirdPartyToken).where(
-                ThirdPartyToken.provider == provider
-            )
-        )
+        res = await db.execute(_TOKENS_BY_PROVIDER, {"provider": provider})
         return res.scalars().all()
         
     except Exception as e:
@@ -161,11 +188,7 @@ async def get_all_user_tokens(
 ) -> List[ThirdPartyToken]:
     """사용자의 모든 서드파티 토큰을 조회합니다."""
     try:
-        res = await db.execute(
-            select(ThirdPartyToken).where(
-                ThirdPartyToken.user_id == user_id
-            )
-        )
+        res = await db.execute(_TOKENS_BY_USER, {"user_id": user_id})
         return res.scalars().all()
         
     except Exception as e:
@@ -1,16 +1,40 @@
 from hashlib import md5
 import json
+from typing import List
 from fastapi.concurrency import run_in_threadpool
 from schemas.models import TrainResponse
 
 
-# def _generate_etag(data) -> str:
-#     encoded = json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
-#     return md5(encoded).hexdigest()
+def _generate_etag(data) -> str:
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+    return md5(encoded).hexdigest()
 
 # async def generate_etag(data) -> str:
 #     return await run_in_threadpool(_generate_etag, data)
 
+def _opaque_tag(tag:str) -> str:
+    return tag.strip().removeprefix("W/").strip('"')
+
+def etag_matches(if_none_match:str | None, etag:str) -> bool:
+    """If-None-Match 목록 비교 (weak 비교). W/ 접두어, 따옴표 유무, 콤마 목록, * 허용"""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = _opaque_tag(etag)
+    return any(_opaque_tag(tag) == target for tag in if_none_match.split(","))
+
+# -------------------- session detail -----------------#
+
+def session_version(session_id, created_at) -> str:
+    """세션 불변 값(id, 생성시각)으로 만든 버전. 저장된 lap/stream 은 수정되지 않음"""
+    return md5(f"{session_id}:{created_at.isoformat()}".encode()).hexdigest()
+
+def session_part_etag(version:str, part:str, *params) -> str:
+    """세션 버전 + 응답 종류(laps, stream) + 요청 옵션별 strong etag"""
+    encoded = json.dumps([version, part, *params], separators=(",", ":")).encode()
+    return f'"{md5(encoded).hexdigest()}"'
+
 # -------------------- serializing -----------------#
 
 def serialize_train_response(item: TrainResponse) -> dict:
@@ -23,3 +47,7 @@ def serialize_train_response(item: TrainResponse) -> dict:
         "activity_title": item.activity_title,
         "analysis_result": item.analysis_result,
     }
+
+def train_sessions_etag(items: List[TrainResponse]) -> str:
+    """훈련 목록 내용 기반 etag. 같은 행이면 버전이 바뀌어도 같은 값"""
+    return _generate_etag([serialize_train_response(item) for item in items])
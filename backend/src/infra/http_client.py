@@ -0,0 +1,47 @@
+import httpx
+from config.settings import strava
+"""
+모듈 레벨 싱글톤 httpx 클라이언트 (Strava)
+요청마다 AsyncClient 를 새로 열지 않고 커넥션 풀 / keep-alive 재사용
+"""
+
+strava_client: httpx.AsyncClient | None = None
+
+async def init_strava_client():
+    """
+    애플리케이션 시작 시 Strava http 클라이언트 초기화
+    """
+    global strava_client
+    if strava_client is None:
+        strava_client = httpx.AsyncClient(
+            http2=strava.http2,  # h2 패키지 필요 (httpx[http2])
+            limits=httpx.Limits(
+                max_connections=strava.max_connections,
+                max_keepalive_connections=strava.max_keepalive_connections,
+                keepalive_expiry=strava.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(
+                strava.timeout,
+                connect=strava.connect_timeout,
+            ),
+        )
+
+
+async def close_strava_client():
+    """
+    애플리케이션 종료 시 커넥션 풀 정리
+    """
+    global strava_client
+    if strava_client is not None:
+        await strava_client.aclose()
+        strava_client = None
+
+
+def get_strava_client() -> httpx.AsyncClient:
+    """
+    이미 초기화된 Strava 클라이언트 반환
+    (init_strava_client() 이후에만 안전하게 호출 가능)
+    """
+    if strava_client is None:
+        raise RuntimeError("Strava 클라이언트가 초기화되지 않았습니다. init_strava_client() 먼저 실행하세요.")
+    return strava_client
@@ -0,0 +1,131 @@
+import asyncio
+import time
+from redis.asyncio import Redis
+from prometheus_client import Gauge
+
+from config.settings import strava
+from config.exceptions import RateLimitError
+"""
+Strava API rate limit 스케줄러
+Strava 는 15분 / 1일 고정 윈도우 (매 00,15,30,45분 / UTC 자정 리셋) 로 앱 전체 호출수를 제한.
+app 인스턴스들이 redis 카운터를 공유해서 호출 전에 슬롯을 확보하고,
+응답의 X-RateLimit-Usage / X-RateLimit-Limit 헤더로 카운터를 보정.
+"""
+
+PRIORITY_HIGH = "high"
+PRIORITY_LOW = "low"   # stream 다운로드 등. 한도 일부를 high 용으로 남겨둠
+
+SHORT_WINDOW_SEC = 60 * 15
+DAY_WINDOW_SEC = 60 * 60 * 24
+
+_KEY_PREFIX = "strava:ratelimit"
+_LIMIT_KEY = f"{_KEY_PREFIX}:limit"
+
+STRAVA_RATELIMIT_REMAINING = Gauge(
+    "strava_ratelimit_remaining",
+    "Strava API 남은 호출 수",
+    ["window"],
+)
+
+
+def short_window_remaining(now: int = None) -> int:
+    """현재 15분 윈도우가 리셋될 때까지 남은 시간 (초)"""
+    now = int(time.time()) if now is None else now
+    return SHORT_WINDOW_SEC - now % SHORT_WINDOW_SEC
+
+
+def _parse_pair(value: str | None) -> tuple[int, int] | None:
+    """'100,1000' 형식 헤더 파싱 (15분, 일)"""
+    if not value:
+        return None
+    try:
+        short, daily = value.split(",")[:2]
+        return int(short), int(daily)
+    except ValueError:
+        return None
+
+
+class StravaRateLimiter:
+    def __init__(self, redisdb: Redis):
+        self.db = redisdb
+
+    def _window_keys(self, now: int) -> tuple[str, str]:
+        return (f"{_KEY_PREFIX}:15m:{now // SHORT_WINDOW_SEC}",
+                f"{_KEY_PREFIX}:day:{now // DAY_WINDOW_SEC}")
+
+    async def _get_limits(self) -> tuple[int, int]:
+        limits = _parse_pair(await self.db.get(_LIMIT_KEY))
+        return limits or (strava.rate_limit_15m, strava.rate_limit_daily)
+
+    def _report(self, limits: tuple[int, int], used: tuple[int, int]):
+        STRAVA_RATELIMIT_REMAINING.labels(window="15m").set(max(limits[0] - used[0], 0))
+        STRAVA_RATELIMIT_REMAINING.labels(window="daily").set(max(limits[1] - used[1], 0))
+
+    async def acquire(self, priority: str = PRIORITY_HIGH):
+        """호출 슬롯 확보. 한도 초과시 다음 윈도우까지 대기
+            대기 시간이 rate_limit_max_wait 를 넘으면 RateLimitError (retry_after: 윈도우 리셋까지 남은 시간)
+            요청 경로를 오래 막지 않도록 긴 대기는 호출자가 처리 (sync worker 는 작업을 미뤘다가 재실행)
+        """
+        deadline = time.monotonic() + strava.rate_limit_max_wait
+        while True:
+            now = int(time.time())
+            short_key, day_key = self._window_keys(now)
+            limits = await self._get_limits()
+            short_limit, day_limit = limits
+            if priority == PRIORITY_LOW:
+                ratio = strava.rate_limit_low_priority_ratio
+                short_limit, day_limit = int(short_limit * ratio), int(day_limit * ratio)
+
+            # 먼저 증가시키고 초과면 되돌림 (인스턴스간 동시 요청에도 초과 승인 없음)
+            async with self.db.pipeline(transaction=True) as pipe:
+                pipe.incr(short_key)
+                pipe.expire(short_key, SHORT_WINDOW_SEC)
+                pipe.incr(day_key)
+                pipe.expire(day_key, DAY_WINDOW_SEC)
+                short_used, _, day_used, _ = await pipe.execute()
+
+            if short_used <= short_limit and day_used <= day_limit:
+                self._report(limits, (short_used, day_used))
+                return
+
+            async with self.db.pipeline(transaction=True) as pipe:
+                pipe.decr(short_key)
+                pipe.decr(day_key)
+                await pipe.execute()
+
+            if day_used > day_limit:
+                wait = DAY_WINDOW_SEC - now % DAY_WINDOW_SEC
+            else:
+                wait = short_window_remaining(now)
+            if time.monotonic() + wait > deadline:
+                raise RateLimitError(context=f"strava rate limit reached. priority={priority} retry in {wait}s",
+                                     retry_after=wait)
+            await asyncio.sleep(wait)
+
+    async def update_from_headers(self, headers):
+        """응답 헤더의 한도/사용량으로 공유 카운터 보정"""
+        limits = _parse_pair(headers.get("X-RateLimit-Limit"))
+        usage = _parse_pair(headers.get("X-RateLimit-Usage"))
+        if limits:
+            await self.db.set(_LIMIT_KEY, f"{limits[0]},{limits[1]}", ex=DAY_WINDOW_SEC)
+        if not usage:
+            return
+
+        short_key, day_key = self._window_keys(int(time.time()))
+        local = await self.db.mget(short_key, day_key)
+        # 서버 사용량이 더 크면 (다른 클라이언트, 재시작 등) 서버 값으로 맞춤
+        for key, local_used, server_used, ttl in (
+            (short_key, local[0], usage[0], SHORT_WINDOW_SEC),
+            (day_key, local[1], usage[1], DAY_WINDOW_SEC),
+        ):
+            if server_used > int(local_used or 0):
+                await self.db.set(key, server_used, ex=ttl)
+
+        self._report(limits or await self._get_limits(), usage)
+
+    async def mark_exhausted(self):
+        """429 응답시 현재 15분 윈도우를 소진 처리"""
+        short_key, _ = self._window_keys(int(time.time()))
+        short_limit, _ = await self._get_limits()
+        await self.db.set(short_key, short_limit, ex=SHORT_WINDOW_SEC)
+        STRAVA_RATELIMIT_REMAINING.labels(window="15m").set(0)
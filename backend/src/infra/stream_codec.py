@@ -0,0 +1,100 @@
+"""훈련 스트림 바이너리 인코딩
+
+JSON float 배열 대신 채널별로 양자화(+delta) 한 정수 배열을 이어붙여 zlib 압축.
+bytea 한 컬럼에 저장하고 numpy 배열로 바로 복원.
+
+    header (비압축) : magic(4s) version(B) channel_count(B)
+    body   (zlib)   : 채널마다 channel_id(B) length(I) + little-endian 정수 배열
+"""
+import struct
+import zlib
+import numpy as np
+
+from schemas.models import StreamData
+
+MAGIC = b"PRCS"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sBB")
+_CHANNEL = struct.Struct("<BI")
+
+# 채널 이름: (channel_id, 양자화 scale, delta 인코딩 여부, 저장 dtype)
+_CHANNELS = {
+    "heartrate": (0, 1, False, "<i2"),     # bpm
+    "cadence":   (1, 1, False, "<i2"),     # spm
+    "distance":  (2, 10, True, "<i4"),     # 0.1 m, 누적값 -> delta
+    "velocity":  (3, 100, False, "<i2"),   # 0.01 m/s
+    "altitude":  (4, 10, True, "<i4"),     # 0.1 m
+    "time":      (5, 1, True, "<i4"),      # sec, 누적값 -> delta
+}
+_CHANNELS_BY_ID = {spec[0]: (name, *spec[1:]) for name, spec in _CHANNELS.items()}
+
+
+def encode_stream_arrays(channels: dict) -> bytes:
+    """채널 이름 -> 배열(list / ndarray / None) 을 바이너리로 인코딩. None 채널은 생략"""
+    body = []
+    count = 0
+    for name, (channel_id, scale, delta, dtype) in _CHANNELS.items():
+        values = channels.get(name)
+        if values is None:
+            continue
+        arr = np.nan_to_num(np.asarray(values, dtype=np.float64))
+        quantized = np.rint(arr * scale).astype(np.int64)
+        if delta:
+            quantized = np.diff(quantized, prepend=0)
+        info = np.iinfo(dtype)
+        quantized = np.clip(quantized, info.min, info.max).astype(dtype)
+
+        body.append(_CHANNEL.pack(channel_id, quantized.size))
+        body.append(quantized.tobytes())
+        count += 1
+
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, count) + zlib.compress(b"".join(body))
+
+
+def decode_stream_arrays(blob: bytes) -> dict[str, np.ndarray]:
+    """바이너리 -> 채널 이름: float64 ndarray"""
+    magic, version, count = _HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("invalid stream blob")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported stream format version {version}")
+
+    body = zlib.decompress(blob[_HEADER.size:])
+    offset = 0
+    res = {}
+    for _ in range(count):
+        channel_id, length = _CHANNEL.unpack_from(body, offset)
+        offset += _CHANNEL.size
+        name, scale, delta, dtype = _CHANNELS_BY_ID[channel_id]
+
+        quantized = np.frombuffer(body, dtype=dtype, count=length, offset=offset)
+        offset += quantized.nbytes
+
+        values = quantized.astype(np.int64)
+        if delta:
+            values = np.cumsum(values)
+        res[name] = values / scale
+    return res
+
+
+def stream_to_arrays(stream: StreamData) -> dict[str, np.ndarray]:
+    """StreamData (또는 이전 json 컬럼 ORM) -> 채널 이름: float64 ndarray"""
+    res = {}
+    for name in _CHANNELS:
+        values = getattr(stream, name, None)
+        if values is not None:
+            res[name] = np.nan_to_num(np.asarray(values, dtype=np.float64))
+    return res
+
+
+def arrays_to_stream(arrays: dict[str, np.ndarray]) -> StreamData:
+    return StreamData(**{name: arr.tolist() for name, arr in arrays.items()})
+
+
+def encode_stream(stream: StreamData) -> bytes:
+    return encode_stream_arrays(stream.model_dump())
+
+
+def decode_stream(blob: bytes) -> StreamData:
+    return arrays_to_stream(decode_stream_arrays(blob))
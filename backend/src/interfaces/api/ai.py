@@ -2,12 +2,14 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from schemas.models import TokenPayload
-from infra.db.storage.session import get_session
+from infra.db.storage.session import get_session, get_read_session
 from adapters import LLMAdapter, TrainingAdapter, AccountAdapter, LLMDataAdapter
 from use_cases.training_llm import LLMHandler
 from use_cases.auth.dependencies import get_current_user, get_test_user
 from config.settings import llm
 from config.exceptions import CustomError
+from config.constants import ETAG_LLM
+from interfaces.api.conditional import ConditionalGet, etag_invalidator
 from config.logger import get_logger
 
 logger = get_logger(__name__)
@@ -17,13 +19,15 @@ logger = get_logger(__name__)
 
 router = APIRouter(prefix="/ai", tags=["ai"])
 
-def get_handler(db:AsyncSession=Depends(get_session))->LLMHandler:
+# 조회 세션 (primary / replica) 선택은 adapter 에서. 프롬프트 입력 (프로필, 훈련 기록) 만 replica
+def get_handler(db:AsyncSession=Depends(get_session),
+                read_db:AsyncSession=Depends(get_read_session))->LLMHandler:
         return LLMHandler(
             db=db,
-            account_adapter=AccountAdapter(db=db),
+            account_adapter=AccountAdapter(db=db, read_db=read_db),
             llm_adapter=LLMAdapter(llm.secret),
-            training_adapter=TrainingAdapter(db=db),
-            llm_data_adapter=LLMDataAdapter(db=db)
+            training_adapter=TrainingAdapter(db=db, read_db=read_db),
+            llm_data_adapter=LLMDataAdapter(db=db, read_db=read_db)
         )
     
 
@@ -31,11 +35,14 @@ def get_handler(db:AsyncSession=Depends(get_session))->LLMHandler:
 @router.post("/session")
 async def llm_prediction(
     payload: TokenPayload = Depends(get_current_user),
+    bump_etag=Depends(etag_invalidator(ETAG_LLM)),
     handler:LLMHandler = Depends(get_handler)
 ):
     # 사용자 데이터 기반 훈련 생성
     try:
-        return await handler.generate_trainings(payload=payload)
+        res = await handler.generate_trainings(payload=payload)
+        await bump_etag()
+        return res
     except CustomError as e:
         if e.original_exception:
             logger.exception(f"{e.context} {str(e.original_exception)}")
@@ -47,10 +54,13 @@ async def llm_prediction(
 @router.post("/coach-advice")
 async def coach_advice(
     payload: TokenPayload = Depends(get_current_user),
+    bump_etag=Depends(etag_invalidator(ETAG_LLM)),
     handler:LLMHandler = Depends(get_handler)
 ):
     try:
-        return await handler.generate_advices(payload=payload)
+        res = await handler.generate_advices(payload=payload)
+        await bump_etag()
+        return res
     # 사용자 데이터 기반 코치 조언 생성
     except CustomError as e:
         if e.original_exception:
@@ -63,10 +73,13 @@ async def coach_advice(
 @router.post("/generate")
 async def generate(
     payload: TokenPayload = Depends(get_current_user),
+    bump_etag=Depends(etag_invalidator(ETAG_LLM)),
     handler:LLMHandler = Depends(get_handler)
 ):
     try:
-        return await handler.generate_trainings_advices(payload=payload)
+        res = await handler.generate_trainings_advices(payload=payload)
+        await bump_etag()
+        return res
     # 사용자 데이터 기반 코치 조언 생성
     except CustomError as e:
         if e.original_exception:
@@ -77,7 +90,7 @@ async def generate(
         raise HTTPException(status_code=500, detail="Internal Server Error")
     
 
-@router.get("/get")
+@router.get("/get", dependencies=[Depends(ConditionalGet(ETAG_LLM))])
 async def get_llm(
     payload: TokenPayload = Depends(get_current_user),
     handler:LLMHandler = Depends(get_handler)
@@ -5,10 +5,11 @@ import urllib.parse
 
 from use_cases.auth.dependencies import get_current_user, validate_current_user
 from infra.db.storage.session import get_session
+from infra.db.redis.redis_client import get_redis, Redis
 from config.logger import get_logger
 from config.exceptions import CustomError
 from use_cases.auth.auth_strava import StravaHandler
-from adapters import StravaAdapter, TokenAdapter
+from adapters import StravaAdapter, TokenAdapter, StravaTokenCacheAdapter
 from config.settings import strava
 from schemas.models import TokenPayload
 
@@ -16,10 +17,13 @@ strava_router = APIRouter(prefix="/strava", tags=['auth-strava'])
 token_adapter = TokenAdapter()
 logger = get_logger(__name__)
 
-def get_handler(db:AsyncSession=Depends(get_session))->StravaHandler:
+def get_handler(db:AsyncSession=Depends(get_session),
+                redisdb:Redis=Depends(get_redis),
+                )->StravaHandler:
     return StravaHandler(
         db=db,
         adapter=StravaAdapter(db),
+        token_cache=StravaTokenCacheAdapter(db=redisdb),
     )
 
 @strava_router.get("/connect")
@@ -70,3 +74,18 @@ async def strava_callback(code:str = Body(..., embed=True),
         logger.exception(f"strava_callback. {str(e)}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
     
+
+
+@strava_router.delete("/disconnect")
+async def disconnect_strava(payload: TokenPayload = Depends(get_current_user),
+                            strava_handler:StravaHandler = Depends(get_handler)):
+    try:
+        return await strava_handler.disconnect(payload=payload)
+
+    except CustomError as e:
+        if e.original_exception:
+            logger.exception(f"{e.context} {str(e.original_exception)}")
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        logger.exception(f"disconnect_strava. {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -0,0 +1,83 @@
+"""
+GET 라우트 조건부 요청 (If-None-Match / ETag)
+리소스별 redis 버전으로 etag 생성. 일치시 핸들러(db) 실행 전에 304
+
+    @router.get("/", dependencies=[Depends(ConditionalGet(ETAG_FEED, shared=True))])
+
+쓰기 라우트는 성공 후 etag_invalidator 의 bump() 로 버전 증가
+"""
+from hashlib import md5
+from uuid import UUID
+from typing import Callable, Awaitable
+from fastapi import Depends, HTTPException, Request, Response
+
+from adapters import RedisAdapter
+from infra.db.redis.redis_client import get_redis, Redis
+from schemas.models import TokenPayload
+from infra.etag import etag_matches
+from use_cases.auth.dependencies import get_current_user, get_etag
+from config.constants import CACHE_CONTROL_REVALIDATE
+from config.exceptions import CustomError
+from config.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _make_etag(version:str, user_id:UUID, request:Request) -> str:
+    """버전 + 사용자 + url 별 etag. 같은 버전이라도 응답이 다른 요청은 etag 도 다름"""
+    raw = f"{version}|{user_id}|{request.url.path}|{request.url.query}"
+    return f'W/"{md5(raw.encode()).hexdigest()}"'
+
+
+class ConditionalGet:
+    """
+    page: 리소스 이름 (redis 버전 키)
+    shared: True 면 전체 사용자 공용 버전 (피드 등), False 면 사용자별
+    """
+    def __init__(self, page:str, shared:bool = False, cache_control:str = CACHE_CONTROL_REVALIDATE):
+        self.page = page
+        self.shared = shared
+        self.cache_control = cache_control
+
+    async def __call__(self,
+                       request:Request,
+                       response:Response,
+                       payload:TokenPayload = Depends(get_current_user),
+                       etag:str | None = Depends(get_etag),
+                       redisdb:Redis = Depends(get_redis),
+                       ) -> str | None:
+        try:
+            version = await RedisAdapter(db=redisdb).get_or_init_etag_version(
+                user_id=None if self.shared else payload.user_id,
+                page=self.page)
+        except CustomError as e:
+            # redis 장애시 조건부 처리 없이 그대로 진행
+            logger.exception(f"conditional get {self.page}. {e.context} {str(e.original_exception)}")
+            return None
+
+        new_etag = _make_etag(version=version, user_id=payload.user_id, request=request)
+        headers = {"ETag": new_etag, "Cache-Control": self.cache_control}
+        if etag_matches(etag, new_etag):
+            raise HTTPException(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+        return new_etag
+
+
+def etag_invalidator(page:str, shared:bool = False):
+    """쓰기 라우트용. 핸들러 성공 후 반환된 bump() 호출
+        커밋 이후에 올려야 이전 데이터가 새 etag 로 캐시되지 않음
+    """
+    async def dependency(payload:TokenPayload = Depends(get_current_user),
+                         redisdb:Redis = Depends(get_redis),
+                         ) -> Callable[[], Awaitable[None]]:
+        adapter = RedisAdapter(db=redisdb)
+        user_id = None if shared else payload.user_id
+
+        async def bump():
+            try:
+                await adapter.incr_etag_version(user_id=user_id, page=page)
+            except CustomError as e:
+                logger.exception(f"etag bump {page}. {e.context} {str(e.original_exception)}")
+        return bump
+    return dependency
@@ -1,40 +1,48 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional, List
+from typing import Optional
 from uuid import UUID
 
-from adapters import FeedAdapter
-from infra.db.storage.session import get_session
+from adapters import FeedAdapter, FeedCacheAdapter
+from infra.db.storage.session import get_session, get_read_session
+from infra.db.redis.redis_client import get_redis, Redis
 from use_cases.feed import FeedHandler
 from use_cases.auth.dependencies import get_current_user
-from schemas.models import TokenPayload, FeedResponse, FeedRequest
+from schemas.models import TokenPayload, FeedResponse, FeedRequest, FeedPageResponse, FeedLikeResponse
 from config.logger import get_logger
 from config.exceptions import CustomError, DuplicateError
+from config.constants import ETAG_FEED
+from interfaces.api.conditional import ConditionalGet, etag_invalidator
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/feed", tags=['feed'])
 
 
+# 조회 세션 (primary / replica) 선택은 adapter 에서. 캐시 미스 페이지만 replica
 def get_handler(db:AsyncSession=Depends(get_session),
+                redisdb:Redis=Depends(get_redis),
+                read_db:AsyncSession=Depends(get_read_session),
                 )->FeedHandler:
-    feed_adapter = FeedAdapter(db=db)
+    feed_adapter = FeedAdapter(db=db, read_db=read_db)
     return FeedHandler(
-        feed_adapter=feed_adapter
+        feed_adapter=feed_adapter,
+        cache_adapter=FeedCacheAdapter(db=redisdb),
         )
 
-# 피드 리스트 (페이징) 불러오기
-@router.get("/", response_model=List[FeedResponse])
+# 피드 리스트 (cursor 페이징) 불러오기
+@router.get("/", response_model=FeedPageResponse,
+            dependencies=[Depends(ConditionalGet(ETAG_FEED, shared=True))])
 async def fetch_feeds_pages(
     payload: TokenPayload = Depends(get_current_user),
     handler:FeedHandler=Depends(get_handler),
-    page_number:int = Query(1, ge=1),
+    cursor: Optional[str] = None,
     page_size: int = Query(5, ge=1, le=100),
     ):
     try:
         return await handler.fetch_feeds(
             payload=payload,
             page_size=page_size,
-            page_number=page_number
+            cursor=cursor
         )
     except CustomError as e:
         if e.original_exception:
@@ -46,7 +54,8 @@ async def fetch_feeds_pages(
     
 
 # 단일 피드 받기
-@router.get("/{feed_id}", response_model=FeedResponse)
+@router.get("/{feed_id}", response_model=FeedResponse,
+            dependencies=[Depends(ConditionalGet(ETAG_FEED, shared=True))])
 async def fetch_feed(
     feed_id:UUID,
     payload: TokenPayload = Depends(get_current_user),
@@ -67,9 +76,12 @@ async def fetch_feed(
 async def create_feed(
     feed_data:FeedRequest,
     payload: TokenPayload = Depends(get_current_user),
+    bump_etag=Depends(etag_invalidator(ETAG_FEED, shared=True)),
     handler:FeedHandler=Depends(get_handler))->bool:
     try:
-        return await handler.create_feed(payload=payload,data=feed_data)
+        res = await handler.create_feed(payload=payload,data=feed_data)
+        await bump_etag()
+        return res
     except CustomError as e:
         if e.original_exception:
             logger.exception(f"{e.context} {str(e.original_exception)}")
@@ -83,9 +95,12 @@ async def create_feed(
 async def delete_feed(
     feed_id:UUID,
     payload: TokenPayload = Depends(get_current_user),
+    bump_etag=Depends(etag_invalidator(ETAG_FEED, shared=True)),
     handler:FeedHandler=Depends(get_handler))->bool:
     try:
-        return await handler.delete_feed(payload=payload, feed_id=feed_id)
+        res = await handler.delete_feed(payload=payload, feed_id=feed_id)
+        await bump_etag()
+        return res
     except CustomError as e:
         if e.original_exception:
             logger.exception(f"{e.context} {str(e.original_exception)}")
@@ -95,13 +110,16 @@ async def delete_feed(
         raise HTTPException(status_code=500, detail="Internal Server Error")
     
 # 피드 좋아요 
-@router.post("/{feed_id}/like", response_model=FeedResponse)
+@router.post("/{feed_id}/like", response_model=FeedLikeResponse)
 async def like_feed(
     feed_id:UUID,
     payload: TokenPayload = Depends(get_current_user),
+    bump_etag=Depends(etag_invalidator(ETAG_FEED, shared=True)),
     handler:FeedHandler=Depends(get_handler)):
     try:
-        return await handler.like_feed(payload=payload, feed_id=feed_id)
+        res = await handler.like_feed(payload=payload, feed_id=feed_id)
+        await bump_etag()
+        return res
     except DuplicateError as e:
         raise HTTPException(status_code=e.status_code, detail=e.detail)
     except CustomError as e:
@@ -113,13 +131,16 @@ async def like_feed(
         raise HTTPException(status_code=500, detail="Internal Server Error")
     
 # 피드 좋아요 취소
-@router.delete("/{feed_id}/unlike", response_model=FeedResponse)
+@router.delete("/{feed_id}/unlike", response_model=FeedLikeResponse)
 async def unlike_feed(
     feed_id:UUID,
     payload: TokenPayload = Depends(get_current_user),
+    bump_etag=Depends(etag_invalidator(ETAG_FEED, shared=True)),
     handler:FeedHandler=Depends(get_handler)):
     try:
-        return await handler.unlike_feed(payload=payload, feed_id=feed_id)
+        res = await handler.unlike_feed(payload=payload, feed_id=feed_id)
+        await bump_etag()
+        return res
         
     except CustomError as e:
         if e.original_exception:
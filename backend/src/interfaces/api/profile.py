@@ -4,24 +4,28 @@ from typing import Optional
 
 from schemas.models import TokenPayload, AccountRequest
 from adapters import AccountAdapter
-from infra.db.storage.session import get_session
+from infra.db.storage.session import get_session, get_read_session
 from use_cases.profile.account import AccountHandler
 from use_cases.auth.dependencies import get_current_user, get_test_user
 from config.logger import get_logger
 from config.exceptions import CustomError
+from config.constants import ETAG_PROFILE
+from interfaces.api.conditional import ConditionalGet, etag_invalidator
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/profile", tags=['profile'])
 
 
 
-def get_handler(db:AsyncSession=Depends(get_session))->AccountHandler:
+# 조회 세션 (primary / replica) 선택은 adapter 에서. /me 는 etag 로 캐시되므로 primary
+def get_handler(db:AsyncSession=Depends(get_session),
+                read_db:AsyncSession=Depends(get_read_session))->AccountHandler:
     return AccountHandler(
         db=db,
-        account_adapter=AccountAdapter(db=db)
+        account_adapter=AccountAdapter(db=db, read_db=read_db)
     )
 
-@router.get("/me")
+@router.get("/me", dependencies=[Depends(ConditionalGet(ETAG_PROFILE))])
 async def get_info(
     payload: TokenPayload = Depends(get_current_user),
     handler:AccountHandler=Depends(get_handler)
@@ -41,14 +45,17 @@ async def get_info(
 async def update_info(
     data:Optional[AccountRequest] = None,
     payload: TokenPayload = Depends(get_current_user),
+    bump_etag=Depends(etag_invalidator(ETAG_PROFILE)),
     handler:AccountHandler=Depends(get_handler)
     ):
      
     try:
-        return await handler.update_info(payload=payload, 
+        res = await handler.update_info(payload=payload, 
                             name=data.name, 
                             pwd=data.pwd, 
                             user_info=data.info)
+        await bump_etag()
+        return res
     except CustomError as e:
         logger.exception(f"{e.context} {str(e.original_exception)}")
         raise HTTPException(status_code=e.status_code, detail=e.detail)
@@ -1,44 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
+from typing import Optional, List
 from uuid import UUID
 
-from adapters import StravaAdapter, TrainingAdapter, RedisAdapter
-from infra.db.storage.session import get_session
+from adapters import StravaAdapter, TrainingAdapter, RedisAdapter, SyncJobAdapter, StravaTokenCacheAdapter
+from infra.db.storage.session import get_session, get_read_session
 from infra.db.redis.redis_client import get_redis, Redis
 from use_cases.train_session.handle_train_session import TrainSessionHandler
-from schemas.models import TokenPayload, TrainRequest, TrainSessionResponse
+from schemas.models import (TokenPayload, TrainRequest, TrainSessionResponse, SyncJobResponse, PersonalRecordResponse,
+                            LapData, StreamData)
 from use_cases.auth.dependencies import get_current_user, get_etag
 from use_cases.auth.auth_strava import StravaHandler
 from config.logger import get_logger
 from config.exceptions import CustomError
+from config.constants import CACHE_CONTROL_REVALIDATE, ETAG_TRAIN_SESSION
+from interfaces.api.conditional import ConditionalGet
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/trainsession", tags=['train-session'])
 
 
+# 조회 세션 (primary / replica) 선택은 adapter 에서
+# 스케줄 / 세부정보 / lap / stream 은 etag, 기간 캐시에 저장되므로 primary. 최고기록은 replica
 def get_handler(db:AsyncSession=Depends(get_session),
                 redisdb:Redis=Depends(get_redis),
+                read_db:AsyncSession=Depends(get_read_session),
                 )->TrainSessionHandler:
     data_adapter = StravaAdapter(db=db)
-    training_adapter = TrainingAdapter(db=db)
-    auth_handler = StravaHandler(db=db, adapter=data_adapter)
+    training_adapter = TrainingAdapter(db=db, read_db=read_db)
+    auth_handler = StravaHandler(db=db, adapter=data_adapter, token_cache=StravaTokenCacheAdapter(db=redisdb))
     redis_adapter = RedisAdapter(db=redisdb)
     return TrainSessionHandler(
         db_adapter=training_adapter,
         data_adapter=data_adapter,
         auth_handler=auth_handler,
-        redis_adapter=redis_adapter
+        redis_adapter=redis_adapter,
+        job_adapter=SyncJobAdapter(db=redisdb),
     )
 
-# 스케줄 새로 로드
-@router.get("/fetch-new-schedules")
+# 스케줄 새로 로드. sync 작업 등록 후 job 반환 (worker 에서 처리)
+@router.get("/fetch-new-schedules", response_model=SyncJobResponse)
 async def fetch_new_schedule(
     date:Optional[int] = None,
     payload: TokenPayload = Depends(get_current_user),
     handler:TrainSessionHandler=Depends(get_handler)):
     try:
-        return await handler.fetch_new_schedules(payload=payload, start_date=date)
+        return await handler.enqueue_new_schedules(payload=payload, start_date=date)
     except CustomError as e:
         if e.original_exception:
             logger.exception(f"{e.context} {str(e.original_exception)}")
@@ -46,6 +53,23 @@ async def fetch_new_schedule(
     except Exception as e:
         logger.exception(f"fetch_new_schedules. {str(e)}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+# sync 작업 상태 조회
+@router.get("/sync-jobs/{job_id}", response_model=SyncJobResponse)
+async def fetch_sync_job(
+    job_id:str,
+    payload: TokenPayload = Depends(get_current_user),
+    handler:TrainSessionHandler=Depends(get_handler)):
+    try:
+        return await handler.get_sync_job(payload=payload, job_id=job_id)
+    except CustomError as e:
+        if e.original_exception:
+            logger.exception(f"{e.context} {str(e.original_exception)}")
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        logger.exception(f"fetch_sync_job. {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
     
 
 # 스케줄 불러오기
@@ -67,14 +91,34 @@ async def fetch_schedule(
         raise HTTPException(status_code=500, detail="Internal Server Error")
     
 
+# 거리별 최고기록
+@router.get("/records", response_model=List[PersonalRecordResponse])
+async def fetch_records(
+    year:Optional[int] = None,
+    payload: TokenPayload = Depends(get_current_user),
+    handler:TrainSessionHandler=Depends(get_handler)):
+    try:
+        return await handler.get_records(payload=payload, year=year)
+    except CustomError as e:
+        if e.original_exception:
+            logger.exception(f"{e.context} {str(e.original_exception)}")
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        logger.exception(f"fetch_records. {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+    
+
 # 스케줄 세부 정보
-@router.get("/{session_id}")
+@router.get("/{session_id}", dependencies=[Depends(ConditionalGet(ETAG_TRAIN_SESSION))])
 async def fetch_schedule_detail(
     session_id:UUID,
+    points:Optional[int] = Query(None, ge=3, le=100000),
+    channels:Optional[str] = None,
     payload: TokenPayload = Depends(get_current_user),
     handler:TrainSessionHandler=Depends(get_handler)):
     try:
-        return await handler.get_schedule_detail(payload=payload, session_id=session_id)
+        return await handler.get_schedule_detail(payload=payload, session_id=session_id,
+                                                 points=points, channels=channels)
     except CustomError as e:
         if e.original_exception:
             logger.exception(f"{e.context} {str(e.original_exception)}")
@@ -84,6 +128,53 @@ async def fetch_schedule_detail(
         raise HTTPException(status_code=500, detail="Internal Server Error")
     
 
+# 세션 lap. 세션별 etag 로 재요청시 304
+@router.get("/{session_id}/laps", response_model=List[LapData])
+async def fetch_schedule_laps(
+    session_id:UUID,
+    response:Response,
+    payload: TokenPayload = Depends(get_current_user),
+    etag:str = Depends(get_etag),
+    handler:TrainSessionHandler=Depends(get_handler)):
+    try:
+        new_etag, laps = await handler.get_schedule_laps(payload=payload, session_id=session_id, etag=etag)
+        response.headers["ETag"] = new_etag
+        response.headers["Cache-Control"] = CACHE_CONTROL_REVALIDATE
+        return laps
+    except CustomError as e:
+        if e.original_exception:
+            logger.exception(f"{e.context} {str(e.original_exception)}")
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        logger.exception(f"fetch_schedule_laps. {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+# 세션 stream. points / channels 조합별 etag
+@router.get("/{session_id}/stream", response_model=Optional[StreamData])
+async def fetch_schedule_stream(
+    session_id:UUID,
+    response:Response,
+    points:Optional[int] = Query(None, ge=3, le=100000),
+    channels:Optional[str] = None,
+    payload: TokenPayload = Depends(get_current_user),
+    etag:str = Depends(get_etag),
+    handler:TrainSessionHandler=Depends(get_handler)):
+    try:
+        new_etag, stream = await handler.get_schedule_stream(payload=payload, session_id=session_id,
+                                                             etag=etag, points=points, channels=channels)
+        response.headers["ETag"] = new_etag
+        response.headers["Cache-Control"] = CACHE_CONTROL_REVALIDATE
+        return stream
+    except CustomError as e:
+        if e.original_exception:
+            logger.exception(f"{e.context} {str(e.original_exception)}")
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        logger.exception(f"fetch_schedule_stream. {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+    
+
 @router.post("/upload")
 async def upload_new_schedule(
     data:Optional[TrainRequest] = None,
@@ -0,0 +1,31 @@
+"""
+피드 좋아요 수 재계산 worker
+likes_count 는 좋아요 추가/취소시 증감. 장애 등으로 어긋난 값을 주기적으로 FeedLikes 기준으로 복구
+수정된 피드가 있으면 좋아요 쓰기와 같이 피드 etag / 페이지 캐시 세대 증가
+"""
+import asyncio
+from redis.asyncio import Redis
+
+from adapters import FeedAdapter, FeedCacheAdapter, RedisAdapter
+from infra.db.storage.session import AsyncSessionLocal
+from config.constants import ETAG_FEED
+from config.logger import get_logger
+from config.exceptions import CustomError
+
+logger = get_logger(__name__)
+
+
+async def run_like_reconciler(redisdb:Redis, interval:int):
+    """interval 초마다 likes_count 재계산 (취소될 때까지 반복)"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with AsyncSessionLocal() as db:
+                fixed = await FeedAdapter(db=db).reconcile_likes_count()
+            if fixed:
+                logger.info(f"like reconciler. fixed {fixed} feeds")
+                # 캐시된 페이지 / 304 응답에 수정된 좋아요 수 반영
+                await FeedCacheAdapter(db=redisdb).invalidate()
+                await RedisAdapter(db=redisdb).incr_etag_version(user_id=None, page=ETAG_FEED)
+        except CustomError as e:
+            logger.exception(f"like reconciler. {e.context} {str(e.original_exception)}")
@@ -0,0 +1,108 @@
+"""
+Strava sync 작업 worker
+redis 큐에서 작업을 꺼내 TrainSessionHandler.fetch_new_schedules 실행.
+app lifespan 안의 task 또는 별도 프로세스 (worker.py) 로 실행
+실행중에는 lease 를 연장. 취소 (종료/배포) 되면 대기열로 되돌리고,
+프로세스가 죽어 lease 가 만료된 작업은 살아있는 worker 가 주기적으로 recover 해서 복구
+strava 한도 초과 (RateLimitError) 작업은 윈도우가 리셋될 때까지 미뤘다가 이어서 실행 (저장된 페이지는 건너뜀)
+"""
+import asyncio
+import time
+from redis.asyncio import Redis
+
+from adapters import (StravaAdapter, TrainingAdapter, RedisAdapter, SyncJobAdapter, StravaTokenCacheAdapter,
+                      AccountAdapter)
+from infra.db.storage.session import AsyncSessionLocal
+from use_cases.train_session.handle_train_session import TrainSessionHandler
+from use_cases.auth.auth_strava import StravaHandler
+from schemas.models import TokenPayload, SyncJobResponse
+from config.logger import get_logger
+from config.exceptions import CustomError, RateLimitError
+from config.constants import SYNC_JOB_LEASE_SEC, SYNC_JOB_RECOVER_INTERVAL_SEC
+
+logger = get_logger(__name__)
+
+
+async def _keep_lease(job:SyncJobResponse, job_adapter:SyncJobAdapter):
+    """작업이 끝날 때까지 lease 연장"""
+    while True:
+        await asyncio.sleep(SYNC_JOB_LEASE_SEC / 3)
+        try:
+            await job_adapter.renew_lease(job)
+        except CustomError as e:
+            logger.exception(f"sync job lease {job.job_id}. {e.context} {str(e.original_exception)}")
+
+
+async def _run_job(job:SyncJobResponse, job_adapter:SyncJobAdapter, redisdb:Redis):
+    heartbeat = asyncio.create_task(_keep_lease(job=job, job_adapter=job_adapter))
+    try:
+        await job_adapter.mark_running(job)
+        # 작업마다 db 세션 새로 열기
+        async with AsyncSessionLocal() as db:
+            data_adapter = StravaAdapter(db=db)
+            handler = TrainSessionHandler(
+                db_adapter=TrainingAdapter(db=db),
+                data_adapter=data_adapter,
+                auth_handler=StravaHandler(db=db, adapter=data_adapter,
+                                           token_cache=StravaTokenCacheAdapter(db=redisdb)),
+                redis_adapter=RedisAdapter(db=redisdb),
+                account_adapter=AccountAdapter(db=db),
+            )
+            # 작업 등록시 인증된 사용자. 토큰 만료 검증은 필요 없음
+            payload = TokenPayload(user_id=job.user_id, exp=0, iat=0)
+            await handler.fetch_new_schedules(payload=payload, start_date=job.start_date)
+        await job_adapter.mark_done(job)
+
+    except RateLimitError as e:
+        if await job_adapter.defer(job, delay=e.retry_after):
+            logger.info(f"sync job {job.job_id} rate limited. retry in {e.retry_after}s")
+        else:
+            await job_adapter.mark_failed(job, error=e.detail)
+    except CustomError as e:
+        if e.original_exception:
+            logger.exception(f"sync job {job.job_id}. {e.context} {str(e.original_exception)}")
+        await job_adapter.mark_failed(job, error=e.detail)
+    except Exception as e:
+        logger.exception(f"sync job {job.job_id}. {str(e)}")
+        await job_adapter.mark_failed(job, error="Internal Server Error")
+    except asyncio.CancelledError:
+        # 종료/배포로 취소. 다른 worker 가 이어서 처리하도록 대기열로 되돌림
+        logger.info(f"sync job {job.job_id} cancelled. requeue")
+        await job_adapter.requeue(job)
+        raise
+    finally:
+        heartbeat.cancel()
+        await asyncio.gather(heartbeat, return_exceptions=True)
+
+
+async def _recover(job_adapter:SyncJobAdapter):
+    """lease 가 만료된 처리중 작업 (죽은 worker 가 잡고 있던 작업) 을 대기열로 복구"""
+    try:
+        recovered = await job_adapter.recover()
+        if recovered:
+            logger.info(f"sync worker. recovered {recovered} jobs")
+    except CustomError as e:
+        logger.exception(f"sync worker recover. {e.context} {str(e.original_exception)}")
+
+
+async def run_sync_worker(redisdb:Redis):
+    """큐가 빌때까지 대기하며 작업 처리 (취소될 때까지 반복)
+        시작시 + SYNC_JOB_RECOVER_INTERVAL_SEC 마다 recover
+        (재시작한 worker 기준으로는 아직 lease 가 살아있는 작업도 만료 후 복구되도록)
+        매 반복마다 재실행 시각이 된 미뤄진 작업을 대기열로
+    """
+    job_adapter = SyncJobAdapter(db=redisdb)
+    next_recover = 0.0
+    while True:
+        if time.monotonic() >= next_recover:
+            await _recover(job_adapter)
+            next_recover = time.monotonic() + SYNC_JOB_RECOVER_INTERVAL_SEC
+        try:
+            await job_adapter.promote_delayed()
+            job = await job_adapter.dequeue()
+            if job is None:
+                continue
+            await _run_job(job=job, job_adapter=job_adapter, redisdb=redisdb)
+        except CustomError as e:
+            # redis 장애 등. worker 는 계속 유지
+            logger.exception(f"sync worker. {e.context} {str(e.original_exception)}")
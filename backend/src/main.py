@@ -1,22 +1,36 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from interfaces.api import routers
 from config import settings
 from infra.db.storage.session import create_db_and_tables, close_db
-from infra.db.redis.redis_client import init_redis, close_redis
+from infra.db.redis.redis_client import init_redis, close_redis, get_redis
+from infra.http_client import init_strava_client, close_strava_client
+from interfaces.worker.sync_worker import run_sync_worker
+from interfaces.worker.feed_worker import run_like_reconciler
 
 @asynccontextmanager
 async def lifespan(app:FastAPI):
     ## db 시작
     # await create_db_and_tables() ## alembic 으로만 schema 관리
     await init_redis()
+    await init_strava_client()
+    ## app 내부 sync worker
+    workers = [asyncio.create_task(run_sync_worker(get_redis())) for _ in range(settings.sync.workers)]
+    ## app 내부 worker 사용시 주기 작업도 같이 (별도 worker 프로세스 사용시 그쪽에서 실행)
+    if settings.sync.workers > 0 and settings.feed.like_reconcile_interval > 0:
+        workers.append(asyncio.create_task(run_like_reconciler(get_redis(), settings.feed.like_reconcile_interval)))
     yield
+    for w in workers:
+        w.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
     ## db 종료
     await close_db()
     await close_redis()
+    await close_strava_client()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -0,0 +1,32 @@
+"""피드 페이지 캐시 포트"""
+from abc import ABC, abstractmethod
+
+from schemas.models import FeedPageResponse
+
+
+class FeedCachePort(ABC):
+
+    @abstractmethod
+    async def get_version(self) -> str:
+        """현재 캐시 세대. 요청당 한번 읽어 get_page / set_page 에 같이 전달"""
+        ...
+
+    @abstractmethod
+    async def get_page(self, version:str, cursor:str | None, page_size:int) -> FeedPageResponse | None:
+        """캐시된 피드 페이지 (사용자 무관 데이터). 없으면 None"""
+        ...
+
+    @abstractmethod
+    async def set_page(self, version:str, cursor:str | None, page_size:int, page:FeedPageResponse):
+        """피드 페이지 캐시 저장. version 은 db 조회 전에 읽은 세대"""
+        ...
+
+    @abstractmethod
+    async def recently_written(self) -> bool:
+        """피드 쓰기 직후 (replica 지연 허용치 이내) 여부. True 면 캐시 미스 조회는 primary"""
+        ...
+
+    @abstractmethod
+    async def invalidate(self):
+        """피드 생성/삭제/좋아요 변경시 전체 페이지 무효화"""
+        ...
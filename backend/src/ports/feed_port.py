@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from uuid import UUID
-from typing import List, Optional
-from schemas.models import FeedResponse
+from typing import List, Optional, Tuple
+from schemas.models import FeedResponse, FeedLikeResponse
 from datetime import datetime
 
 class FeedPort(ABC):
@@ -30,8 +30,8 @@ class FeedPort(ABC):
         ...
 
     @abstractmethod
-    async def delete_feed(self, feed_id: UUID) -> bool:
-        '''피드 삭제'''
+    async def delete_feed(self, user_id: UUID, feed_id: UUID) -> bool:
+        '''피드 삭제. 작성자 본인 피드만'''
         ...
 
     @abstractmethod
@@ -43,18 +43,29 @@ class FeedPort(ABC):
     async def get_feeds_with_likes(
         self,
         user_id: UUID,
+        cursor: Optional[Tuple[datetime, UUID]] = None,
         limit: int = 20,
-        offset: int = 0
+        replica: bool = False
     ) -> List[FeedResponse]:
-        '''피드 리스트 받기'''
+        '''피드 리스트 받기. cursor 이후 (created_at, id 역순). replica: 쓰기 직후가 아닌 조회만 True'''
         ...
 
     @abstractmethod
-    async def create_feed_like(self, user_id: UUID, feed_id: UUID) -> bool:
-        '''피드 좋아요'''
+    async def get_liked_feed_ids(self, user_id: UUID, feed_ids: List[UUID]) -> set[UUID]:
+        '''feed_ids 중 사용자가 좋아요 한 피드'''
         ...
 
     @abstractmethod
-    async def delete_feed_like(self, user_id: UUID, feed_id: UUID) -> bool:
-        '''피드 좋아요 해제'''
+    async def create_feed_like(self, user_id: UUID, feed_id: UUID) -> FeedLikeResponse:
+        '''피드 좋아요. 증가된 좋아요 수 반환'''
+        ...
+
+    @abstractmethod
+    async def delete_feed_like(self, user_id: UUID, feed_id: UUID) -> Tuple[bool, FeedLikeResponse]:
+        '''피드 좋아요 해제. (삭제 여부, 좋아요 수)'''
+        ...
+
+    @abstractmethod
+    async def reconcile_likes_count(self) -> int:
+        '''likes_count 재계산. 수정된 피드 수 반환'''
         ...
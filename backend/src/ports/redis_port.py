@@ -8,7 +8,7 @@ from uuid import UUID
 class RedisPort(ABC):
 
     @abstractmethod
-    async def set_user_etag(self, user_id: UUID, page: str, etag: str):
+    async def set_user_etag(self, user_id: UUID, page: str, etag: str, ttl: int = None):
         ...
     
     @abstractmethod
@@ -20,5 +20,20 @@ class RedisPort(ABC):
         ...
 
     @abstractmethod
-    async def incr_etag_version(self, user_id:UUID, page:str)->str:
+    async def get_window_etag(self, user_id:UUID, page:str, window:str) -> dict | None:
+        """기간별 etag {"version", "etag", "body"}"""
+        ...
+
+    @abstractmethod
+    async def set_window_etag(self, user_id:UUID, page:str, window:str,
+                              version:str, etag:str, body:str = None, ttl:int = None):
+        ...
+
+    @abstractmethod
+    async def get_or_init_etag_version(self, user_id:UUID | None, page:str)->str:
+        """etag 버전 조회. 없으면 초기화. user_id 없으면 전체 사용자 공용"""
+        ...
+
+    @abstractmethod
+    async def incr_etag_version(self, user_id:UUID | None, page:str)->str:
         ...
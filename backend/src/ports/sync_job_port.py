@@ -0,0 +1,60 @@
+"""훈련 데이터 sync 작업 큐 포트"""
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from schemas.models import SyncJobResponse
+
+
+class SyncJobPort(ABC):
+
+    @abstractmethod
+    async def enqueue(self, user_id:UUID, start_date:int = None) -> SyncJobResponse:
+        """sync 작업 등록. 사용자별로 진행중인 작업이 있으면 기존 작업 반환"""
+        ...
+
+    @abstractmethod
+    async def get_job(self, job_id:str) -> SyncJobResponse | None:
+        """작업 상태 조회"""
+        ...
+
+    @abstractmethod
+    async def dequeue(self, timeout:int = 5) -> SyncJobResponse | None:
+        """대기중인 작업 꺼내기 (worker). 완료/실패 처리 전까지 처리중 목록에 남음"""
+        ...
+
+    @abstractmethod
+    async def renew_lease(self, job:SyncJobResponse):
+        """실행중 작업 lease 연장 (worker heartbeat)"""
+        ...
+
+    @abstractmethod
+    async def requeue(self, job:SyncJobResponse):
+        """처리중 작업을 다시 대기열로 (worker 종료/취소)"""
+        ...
+
+    @abstractmethod
+    async def defer(self, job:SyncJobResponse, delay:int | None) -> bool:
+        """처리중 작업을 delay 초 뒤로 미루기. 미룰 수 없으면 (한도 초과) False"""
+        ...
+
+    @abstractmethod
+    async def promote_delayed(self) -> int:
+        """재실행 시각이 된 미뤄진 작업을 대기열로. 옮긴 작업 수 반환"""
+        ...
+
+    @abstractmethod
+    async def recover(self) -> int:
+        """lease 가 만료된 처리중 작업을 대기열로 복구. 복구된 작업 수 반환"""
+        ...
+
+    @abstractmethod
+    async def mark_running(self, job:SyncJobResponse):
+        ...
+
+    @abstractmethod
+    async def mark_done(self, job:SyncJobResponse):
+        ...
+
+    @abstractmethod
+    async def mark_failed(self, job:SyncJobResponse, error:str):
+        ...
@@ -0,0 +1,31 @@
+"""서드파티 액세스 토큰 캐시 포트"""
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+
+class TokenCachePort(ABC):
+
+    @abstractmethod
+    async def get(self, user_id:UUID) -> str | None:
+        """만료 전 액세스 토큰 (복호화). 없으면 None"""
+        ...
+
+    @abstractmethod
+    async def set(self, user_id:UUID, access_token:str, encrypted_access:str, expires_at:int):
+        """액세스 토큰 캐시 저장. expires_at 까지만 유효"""
+        ...
+
+    @abstractmethod
+    async def invalidate(self, user_id:UUID):
+        """캐시 삭제 (프로세스 / 공유 캐시 모두). 연결 해제, 갱신 실패, 저장하려는 토큰이 이미 갱신 시점을 지난 경우"""
+        ...
+
+    @abstractmethod
+    async def acquire_refresh_lock(self, user_id:UUID) -> str | None:
+        """replica 간 토큰 갱신 락. 획득시 lock id, 다른 곳에서 갱신중이면 None"""
+        ...
+
+    @abstractmethod
+    async def release_refresh_lock(self, user_id:UUID, lock_id:str):
+        """갱신 락 해제 (lock_id 가 잡고 있을 때만)"""
+        ...
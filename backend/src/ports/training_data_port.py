@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional, List, AsyncIterator
 from uuid import UUID
 
 from schemas.models import LapData, StreamData, ActivityData
@@ -23,6 +23,25 @@ class TrainingDataPort(ABC):
         """토큰 받기"""
         ...
     
+    @abstractmethod
+    async def get_last_synced_at(self, user_id:UUID) -> Optional[int]:
+        """마지막으로 sync 된 활동 시작시간 (timestamp)"""
+        ...
+    
+    @abstractmethod
+    async def update_last_synced_at(self, user_id:UUID, last_synced_at:int) -> None:
+        """마지막으로 sync 된 활동 시작시간 갱신"""
+        ...
+    
+    @abstractmethod
+    def iter_activity_pages(self, access_token:str,
+                            after_date: int = None,
+                            before_date: int = None,
+                            per_page: int = 200,
+                            ) -> AsyncIterator[List[ActivityData]]:
+        """서드파티 훈련 활동 데이터 페이지 단위로 가져오기 (async generator)"""
+        ...
+    
     @abstractmethod
     async def fetch_activities(self, access_token:str, after_date: int = None) -> List[ActivityData]:
         """서드파티 기간내 모든 훈련 활동 데이터 리스트 가져오기"""
@@ -1,13 +1,14 @@
 """훈련 데이터 db 핸들링 포트"""
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Tuple
 from uuid import UUID
 
 from schemas.models import (ActivityData, 
                             LapData, 
                             StreamData, 
                             TrainResponse, TrainRequest,
-                            TrainDetailResponse)
+                            TrainDetailResponse,
+                            PersonalRecordResponse)
 
 class TrainingPort(ABC):
     @abstractmethod
@@ -20,6 +21,13 @@ class TrainingPort(ABC):
         ...
         
 
+    @abstractmethod
+    async def save_sessions(self, user_id:UUID,
+                            sessions:List[Tuple[ActivityData, List[LapData], StreamData]]
+                            )->int:
+        """여러 훈련 세션 (TrainSession , Stream, Lap) 한번에 저장. 저장된 세션 수 반환"""
+        ...
+
     @abstractmethod
     async def upload_session(self, user_id:UUID, 
                      session:TrainRequest = None,
@@ -35,13 +43,38 @@ class TrainingPort(ABC):
         ...
         
     @abstractmethod
-    async def get_session_detail(self, user_id:UUID, session_id:UUID)->TrainDetailResponse:
-        """훈련 세션 세부 정보 받기 (stream, Lap)"""
+    async def get_existing_activity_ids(self, user_id:UUID, provider:str, activity_ids:List[int])->set[int]:
+        """이미 저장된 activity_id 조회 (중복 확인용)"""
+        ...
+        
+    @abstractmethod
+    async def get_session_detail(self, user_id:UUID, session_id:UUID,
+                                 points:int = None,
+                                 channels:List[str] = None)->TrainDetailResponse:
+        """훈련 세션 세부 정보 받기 (stream, Lap). 스트림 다운샘플링 옵션"""
+        ...
+        
+    @abstractmethod
+    async def get_session_laps(self, user_id:UUID, session_id:UUID)->Tuple[str, List[LapData]]:
+        """훈련 세션 lap 만 받기. (세션 버전, laps)"""
+        ...
+
+    @abstractmethod
+    async def get_session_stream(self, user_id:UUID, session_id:UUID,
+                                 points:int = None,
+                                 channels:List[str] = None)->Tuple[str, StreamData | None]:
+        """훈련 세션 stream 만 받기. (세션 버전, stream)"""
+        ...
+
+    @abstractmethod
+    async def get_sessions_by_date(self, user_id:UUID, start_date:int = None,
+                                   replica:bool = False)-> List[TrainResponse]:
+        """기간 내의 훈련 세션 받기. replica: 캐시되지 않는 조회만 True"""
         ...
         
     @abstractmethod
-    async def get_sessions_by_date(self, user_id:UUID, start_date:int)-> List[TrainResponse]:
-        """기간 내의 훈련 세션 받기"""
+    async def get_personal_records(self, user_id:UUID, year:int = None)->List[PersonalRecordResponse]:
+        """최고기록 인덱스 조회"""
         ...
         
     @abstractmethod
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
 from uuid import UUID
 
 
@@ -46,6 +46,16 @@ class StreamData(BaseModel):
     class Config:
         from_attributes = True  # ORM 객체 지원
 
+class StreamMetrics(BaseModel):
+    hr_zones: Optional[List[float]] = None  # 존1~5 시간 (초)
+    best_efforts: Optional[Dict[str, float]] = None  # {"1k": 초, "5k": 초, "10k": 초}
+    gap: Optional[float] = None  # 경사 보정 페이스 (초/km)
+    cardiac_drift: Optional[float] = None  # %
+    cadence_cv: Optional[float] = None
+
+    class Config:
+        from_attributes = True  # ORM 객체 지원
+
 class ActivityData(BaseModel):
     activity_id: Optional[int] = None
     provider: Optional[str] = None
@@ -60,6 +70,7 @@ class ActivityData(BaseModel):
     average_cadence:Optional[float] = None
     activity_title:Optional[str] = None
     analysis_result : Optional[str] = None
+    metrics: Optional[StreamMetrics] = None
 
 class UserInfoData(BaseModel):
     height: Optional[float] = None
@@ -154,6 +165,27 @@ class TrainSessionResponse(BaseModel):
 class TrainDetailResponse(BaseModel):
     laps:Optional[List[LapData]] = None
     stream : Optional[StreamData] = None
+    metrics: Optional[StreamMetrics] = None
+
+class SyncJobResponse(BaseModel):
+    job_id:str
+    user_id:UUID
+    status:str
+    start_date:Optional[int] = None
+    created_at:int
+    finished_at:Optional[int] = None
+    error:Optional[str] = None
+    retry_at:Optional[int] = None  # strava 한도 초과로 미뤄진 경우 재실행 예정 시각
+
+class PersonalRecordResponse(BaseModel):
+    distance:str
+    elapsed_time:float
+    year:int
+    session_id:UUID
+    train_date:datetime
+
+    class Config:
+        from_attributes = True  # ORM 객체 지원
 
 class LLMResponse(BaseModel):
     sessions:Optional[List[LLMSessionResult]] = None
@@ -170,3 +202,12 @@ class FeedResponse(BaseModel):
     note:Optional[str] = None
     likes_count:int
     my_like: bool
+
+class FeedLikeResponse(BaseModel):
+    feed_id:UUID
+    likes_count:int
+    my_like:bool
+
+class FeedPageResponse(BaseModel):
+    data:List[FeedResponse]
+    next_cursor:Optional[str] = None  # 다음 페이지 요청 cursor. 마지막 페이지면 None
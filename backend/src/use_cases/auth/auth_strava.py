@@ -1,10 +1,19 @@
+import asyncio
+import time
+from uuid import UUID
+from weakref import WeakValueDictionary
+from typing import Callable
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config.logger import get_logger
 from config.exceptions import CustomError, InternalError, NotFoundError, ValidationError
-from config.settings import security
+from config.settings import security, strava
 from ports.training_data_port import TrainingDataPort
+from ports.token_cache_port import TokenCachePort
 from schemas.models import TokenPayload
 from infra.security import encrypt_token, decrypt_token
+from infra.db.orm.models import ThirdPartyToken
+from infra.db.storage.session import AsyncSessionLocal
 from infra.db.storage.third_party_token_repo import (
     get_third_party_token_by_user_id,
     create_third_party_token,
@@ -12,11 +21,37 @@ from infra.db.storage.third_party_token_repo import (
 )
 
 
+logger = get_logger(__name__)
+
+# 다른 replica 의 토큰 갱신 대기시 캐시 확인 간격 (초)
+REFRESH_WAIT_SEC = 0.2
+
+# 만료 임박 토큰의 백그라운드 갱신 task (사용자당 하나). 참조를 유지해서 gc 로 취소되지 않도록
+_background_refreshes: dict[UUID, asyncio.Task] = {}
+
+# 사용자별 토큰 갱신 lock (프로세스 내 single-flight)
+_refresh_locks: "WeakValueDictionary[UUID, asyncio.Lock]" = WeakValueDictionary()
+
+def _get_refresh_lock(user_id:UUID) -> asyncio.Lock:
+    lock = _refresh_locks.get(user_id)
+    if lock is None:
+        lock = asyncio.Lock()
+        _refresh_locks[user_id] = lock
+    return lock
+
+def _is_expired_now(expires_at:int) -> bool:
+    """실제 만료 여부 (갱신 margin 미적용)"""
+    return expires_at <= int(time.time())
+
 
 class StravaHandler:
-    def __init__(self, db: AsyncSession, adapter: TrainingDataPort):
+    def __init__(self, db: AsyncSession, adapter: TrainingDataPort, token_cache: TokenCachePort = None,
+                 session_factory: Callable[[], AsyncSession] = AsyncSessionLocal):
         self.db = db
         self.strava_adapter = adapter
+        self.token_cache = token_cache
+        # 백그라운드 갱신용 db 세션 (요청 세션은 응답 후 닫힘)
+        self.session_factory = session_factory
 
         
     async def connect(self, payload:TokenPayload, code:str)->dict:
@@ -74,6 +109,12 @@ class StravaHandler:
                     db=self.db
                 )
 
+            # 재연결시 이전 토큰 캐시 교체
+            await self._cache_token(user_id=payload.user_id,
+                                    access_token=strava_token.get("access_token"),
+                                    encrypted_access=encrypted_access,
+                                    expires_at=strava_token.get("expires_at"))
+
             return {"status": "ok","msg":"Strava connected successfully"}
         
         except CustomError:
@@ -81,15 +122,30 @@ class StravaHandler:
         except Exception as e:
             raise InternalError(context="error strava connect", original_exception=e)
         
-        
-
     
-        
+    async def disconnect(self, payload:TokenPayload)->dict:
+        """strava 연결 해제. db 토큰 삭제 후 토큰 캐시 (프로세스 / redis) 도 삭제
+            다른 replica 의 프로세스 캐시는 로컬 ttl (STRAVA_TOKEN_CACHE_LOCAL_SEC) 안에 만료
+        """
+        try:
+            if not payload:
+                raise ValidationError(detail="User not authenticated")
+            await self.strava_adapter.disconnect(user_id=payload.user_id)
+            await self._invalidate_cache(user_id=payload.user_id)
+            return {"status": "ok", "msg": "Strava disconnected"}
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context="error strava disconnect", original_exception=e)
+
     async def get_access_and_refresh_if_expired(self, payload:TokenPayload)->str:
             """ 
             현재 액세스 토큰 만료 검증.
             만료시 재발급 및 db 업데이트.
             유효 액세스 토큰 반환
+            캐시 hit 이면 db 조회 / 복호화 없이 반환 (캐시는 갱신 시점 전까지만 유효)
+            만료 margin 초 전부터는 현재 토큰을 바로 반환하고 백그라운드에서 갱신
+            실제로 만료된 경우에만 갱신을 기다림. 갱신은 사용자당 하나만 (single-flight)
                 parameter: 
                     payload: 사용자 액세스 토큰 payload
                 return: access_token (str)
@@ -98,54 +154,175 @@ class StravaHandler:
             try: 
                 if not payload:
                     raise ValidationError(detail="User not authenticated")
+
+                if self.token_cache is not None:
+                    cached = await self.token_cache.get(user_id=payload.user_id)
+                    if cached is not None:
+                        return cached
             
                 # 기존 토큰 get
-                existing_token = await get_third_party_token_by_user_id(
-                    user_id=payload.user_id,
-                    provider="strava",
-                    db=self.db
-                )
-                if not existing_token:
-                    raise NotFoundError(detail="Strava token not found")
+                existing_token = await self._get_token(user_id=payload.user_id)
                 
                 # 토큰 검증
                 if not await self.strava_adapter.is_token_expired(expires_at=existing_token.expires_at):
-                    return decrypt_token(token_encrypted=existing_token.access_token,
-                                  key=security.encryption_key_strava,
-                                    token_type="strava_access"
-                                  )
-
-                # 토큰 만료시
-                # 리프레시토큰으로 새 토큰 발급 받기
-                decrypted_refresh = decrypt_token(token_encrypted=existing_token.refresh_token,
-                                                  key=security.encryption_key_strava,
-                                                    token_type="strava_access"
-                                                  )
-                strava_token = await self.strava_adapter.refresh_token(decrypted_refresh)
-
-                # 토큰 암호화
-                # refresh_token, access_token, 
-                encrypted_access = encrypt_token(data=strava_token.get("access_token"),
-                                                    key=security.encryption_key_strava,
-                                                    token_type="strava_access"
-                                                    )
-                encrypted_refresh = encrypt_token(data=strava_token.get("refresh_token"),
-                                                    key=security.encryption_key_strava,
-                                                    token_type="strava_refresh"
-                                                    )
-                    # 기존 토큰 업데이트
-                await update_third_party_token(
-                    user_id=payload.user_id,
-                    provider="strava",
-                    access_token=encrypted_access,
-                    refresh_token=encrypted_refresh,
-                    expires_at=strava_token.get("expires_at"),
-                    db=self.db
-                )
-                return strava_token.get('access_token')
+                    return await self._use_token(user_id=payload.user_id, token=existing_token)
+
+                # 만료 임박. 아직 유효하므로 요청은 기다리지 않음
+                if not _is_expired_now(existing_token.expires_at):
+                    self._schedule_refresh(user_id=payload.user_id)
+                    return self._decrypt_access(existing_token)
+
+                # 토큰 만료
+                return await self._refresh_single_flight(user_id=payload.user_id, current=existing_token)
             
             except CustomError:
                 raise
             except Exception as e:
                 raise InternalError(context="error get_access_and_refresh_if_expired", original_exception=e)
-    
+
+
+    def _schedule_refresh(self, user_id:UUID):
+        """백그라운드 갱신 시작. 이미 진행중이면 무시"""
+        task = _background_refreshes.get(user_id)
+        if task is not None and not task.done():
+            return
+        task = asyncio.create_task(self._refresh_in_background(user_id=user_id))
+        _background_refreshes[user_id] = task
+        task.add_done_callback(lambda t: _background_refreshes.pop(user_id, None)
+                               if _background_refreshes.get(user_id) is t else None)
+
+    async def _refresh_in_background(self, user_id:UUID):
+        """요청과 분리된 db 세션으로 갱신. 실패해도 토큰이 만료되면 요청 경로에서 다시 갱신"""
+        try:
+            async with self.session_factory() as db:
+                # strava adapter 의 갱신 호출은 db 를 사용하지 않음 (http client 만)
+                handler = StravaHandler(db=db, adapter=self.strava_adapter, token_cache=self.token_cache,
+                                        session_factory=self.session_factory)
+                token = await handler._get_token(user_id=user_id)
+                await handler._refresh_single_flight(user_id=user_id, current=token)
+        except CustomError as e:
+            logger.exception(f"strava background refresh {user_id}. {e.context} {str(e.original_exception)}")
+        except Exception as e:
+            logger.exception(f"strava background refresh {user_id}. {str(e)}")
+
+    async def _refresh_single_flight(self, user_id:UUID, current:ThirdPartyToken)->str:
+        """
+        토큰 갱신은 사용자당 하나만
+            프로세스 내: 사용자별 asyncio lock. 대기한 요청은 앞선 갱신 결과 사용
+            replica 간: redis 락. 락이 없는 쪽은 캐시에 새 토큰이 올라올 때까지 대기
+        갱신중이라도 현재 토큰이 아직 유효하면 (만료 임박 구간) 기다리지 않고 현재 토큰 사용
+        """
+        lock = _get_refresh_lock(user_id)
+        if lock.locked() and not _is_expired_now(current.expires_at):
+            return self._decrypt_access(current)
+
+        async with lock:
+            # 앞선 요청이 갱신했으면 그 결과 사용
+            token = await self._get_token(user_id=user_id)
+            if not await self.strava_adapter.is_token_expired(expires_at=token.expires_at):
+                return await self._use_token(user_id=user_id, token=token)
+
+            lock_id = None
+            if self.token_cache is not None:
+                deadline = time.monotonic() + strava.refresh_lock_ttl
+                while (lock_id := await self.token_cache.acquire_refresh_lock(user_id=user_id)) is None:
+                    # 다른 replica 가 갱신중
+                    if not _is_expired_now(token.expires_at):
+                        return self._decrypt_access(token)
+                    cached = await self.token_cache.get(user_id=user_id)
+                    if cached is not None:
+                        return cached
+                    if time.monotonic() > deadline:
+                        break
+                    await asyncio.sleep(REFRESH_WAIT_SEC)
+
+            try:
+                # 락 대기중 다른 replica 가 갱신을 끝냈을 수 있음
+                if lock_id is not None:
+                    token = await self._get_token(user_id=user_id)
+                    if not await self.strava_adapter.is_token_expired(expires_at=token.expires_at):
+                        return await self._use_token(user_id=user_id, token=token)
+                return await self._refresh(user_id=user_id, token=token)
+            finally:
+                if lock_id is not None:
+                    await self.token_cache.release_refresh_lock(user_id=user_id, lock_id=lock_id)
+
+
+    async def _refresh(self, user_id:UUID, token:ThirdPartyToken)->str:
+        """리프레시토큰으로 새 토큰 발급 + db / 캐시 갱신
+            갱신 실패시 (strava 에서 연결 해제 등) 캐시된 이전 토큰을 더 쓰지 않도록 캐시 삭제
+        """
+        decrypted_refresh = decrypt_token(token_encrypted=token.refresh_token,
+                                          key=security.encryption_key_strava,
+                                            token_type="strava_access"
+                                          )
+        try:
+            strava_token = await self.strava_adapter.refresh_token(decrypted_refresh)
+        except Exception:
+            await self._invalidate_cache(user_id=user_id)
+            raise
+
+        # 토큰 암호화
+        # refresh_token, access_token, 
+        encrypted_access = encrypt_token(data=strava_token.get("access_token"),
+                                            key=security.encryption_key_strava,
+                                            token_type="strava_access"
+                                            )
+        encrypted_refresh = encrypt_token(data=strava_token.get("refresh_token"),
+                                            key=security.encryption_key_strava,
+                                            token_type="strava_refresh"
+                                            )
+            # 기존 토큰 업데이트
+        await update_third_party_token(
+            user_id=user_id,
+            provider="strava",
+            access_token=encrypted_access,
+            refresh_token=encrypted_refresh,
+            expires_at=strava_token.get("expires_at"),
+            db=self.db
+        )
+        # 갱신된 토큰으로 캐시 교체
+        await self._cache_token(user_id=user_id,
+                                access_token=strava_token.get("access_token"),
+                                encrypted_access=encrypted_access,
+                                expires_at=strava_token.get("expires_at"))
+        return strava_token.get('access_token')
+
+
+    async def _get_token(self, user_id:UUID)->ThirdPartyToken:
+        token = await get_third_party_token_by_user_id(
+            user_id=user_id,
+            provider="strava",
+            db=self.db
+        )
+        if not token:
+            raise NotFoundError(detail="Strava token not found")
+        return token
+
+    @staticmethod
+    def _decrypt_access(token:ThirdPartyToken)->str:
+        return decrypt_token(token_encrypted=token.access_token,
+                             key=security.encryption_key_strava,
+                             token_type="strava_access"
+                             )
+
+    async def _use_token(self, user_id:UUID, token:ThirdPartyToken)->str:
+        """db 토큰 복호화 후 캐시"""
+        access_token = self._decrypt_access(token)
+        await self._cache_token(user_id=user_id,
+                                access_token=access_token,
+                                encrypted_access=token.access_token,
+                                expires_at=token.expires_at)
+        return access_token
+
+    async def _invalidate_cache(self, user_id:UUID):
+        if self.token_cache is not None:
+            await self.token_cache.invalidate(user_id=user_id)
+
+    async def _cache_token(self, user_id:UUID, access_token:str, encrypted_access:str, expires_at:int):
+        """db 에 저장된 현재 토큰으로 캐시 갱신"""
+        if self.token_cache is not None:
+            await self.token_cache.set(user_id=user_id,
+                                       access_token=access_token,
+                                       encrypted_access=encrypted_access,
+                                       expires_at=expires_at)
@@ -1,31 +1,59 @@
-from typing import List
 from uuid import UUID
 
 from ports.feed_port import FeedPort
-from schemas.models import TokenPayload, FeedResponse, FeedRequest
-from config.exceptions import CustomError, InternalError, ValidationError
+from ports.feed_cache_port import FeedCachePort
+from schemas.models import TokenPayload, FeedResponse, FeedRequest, FeedPageResponse, FeedLikeResponse
+from infra.cursor import encode_cursor, decode_cursor
+from config.exceptions import CustomError, InternalError, NotFoundError
 
 
 
 class FeedHandler:
     def __init__(self,
-                 feed_adapter:FeedPort
+                 feed_adapter:FeedPort,
+                 cache_adapter:FeedCachePort = None
                  ):
         self.feed_adapter = feed_adapter
+        self.cache_adapter = cache_adapter
 
 
 
-    async def fetch_feeds(self, payload:TokenPayload, page_size:int=20, page_number:int=1)->List[FeedResponse]:
+    async def fetch_feeds(self, payload:TokenPayload, page_size:int=20, cursor:str=None)->FeedPageResponse:
+        '''cursor 기반 피드 목록. 한 개 더 조회해서 다음 페이지 유무 판단
+            페이지는 redis 공유 캐시 (사용자 무관), my_like 만 사용자별로 덮어쓰기
+            캐시 미스는 replica 에서 조회. 쓰기 직후에는 primary (지연 데이터가 새 세대로 캐시되지 않도록)
+        '''
         try:
-            # 페이지 계산
-            offset = (page_number-1) * page_size
-            limit = page_size
-
-            
-            return await self.feed_adapter.get_feeds_with_likes(user_id=payload.user_id,
-                                                                limit=limit,
-                                                                offset=offset
-                                                                )
+            key = decode_cursor(cursor) if cursor else None
+
+            # 캐시 세대는 db 조회 전에 한번만 읽기 (조회 중 쓰기가 있으면 이전 세대에 저장)
+            version = None
+            if self.cache_adapter is not None:
+                version = await self.cache_adapter.get_version()
+                cached = await self.cache_adapter.get_page(version=version, cursor=cursor, page_size=page_size)
+                if cached is not None:
+                    liked = await self.feed_adapter.get_liked_feed_ids(user_id=payload.user_id,
+                                                                       feed_ids=[f.feed_id for f in cached.data])
+                    for item in cached.data:
+                        item.my_like = item.feed_id in liked
+                    return cached
+
+            replica = self.cache_adapter is not None and not await self.cache_adapter.recently_written()
+            feeds = await self.feed_adapter.get_feeds_with_likes(user_id=payload.user_id,
+                                                                 cursor=key,
+                                                                 limit=page_size + 1,
+                                                                 replica=replica
+                                                                 )
+            next_cursor = None
+            if len(feeds) > page_size:
+                feeds = feeds[:page_size]
+                last = feeds[-1]
+                next_cursor = encode_cursor(last.created_at, last.feed_id)
+
+            page = FeedPageResponse(data=feeds, next_cursor=next_cursor)
+            if self.cache_adapter is not None:
+                await self.cache_adapter.set_page(version=version, cursor=cursor, page_size=page_size, page=page)
+            return page
     
         except CustomError:
             raise
@@ -53,6 +81,7 @@ class FeedHandler:
                                         train_summary=data.train_summary,
                                         note=data.note
                                         )
+            await self._invalidate_cache()
             return res
     
         except CustomError:
@@ -61,55 +90,53 @@ class FeedHandler:
             raise InternalError(context="error upload_feed", original_exception=e)
 
     async def delete_feed(self, payload:TokenPayload, feed_id:UUID)->bool:
+        '''피드 삭제. 작성자 조건으로 바로 삭제 (소유권 확인용 재조회 없음)'''
         try:
-            #1. check user_id match
-            exist = await self.feed_adapter.get_feed(user_id=payload.user_id,
-                                                     feed_id=feed_id)
-            
-            if exist.user_id != payload.user_id:
-                raise ValidationError(context=f"user id {payload.user_id} mismatch feed user_id {exist.user_id}. can't delete others feed")
-
-
-            return await self.feed_adapter.delete_feed(feed_id=feed_id)
+            res = await self.feed_adapter.delete_feed(user_id=payload.user_id, feed_id=feed_id)
+            if not res:
+                raise NotFoundError(detail="requested feed does not exist",
+                                    context=f"feed {feed_id} not found or not owned by {payload.user_id}")
+            await self._invalidate_cache()
+            return res
     
         except CustomError:
             raise
         except Exception as e:
             raise InternalError(context="error delete_feed", original_exception=e)
 
-    async def like_feed(self, payload:TokenPayload, feed_id:UUID)->FeedResponse:
+    async def like_feed(self, payload:TokenPayload, feed_id:UUID)->FeedLikeResponse:
         '''좋아요 추가. 
             db 유니크 제약으로 같은 게시글 중복 좋아요 방지
+            증가된 좋아요 수는 쓰기 결과로 바로 반환
         '''
         try:
-            # new like
             res = await self.feed_adapter.create_feed_like(user_id=payload.user_id,
-                                                             feed_id=feed_id
-                                                             )
-            if not res:
-                raise InternalError()
-            
-            return await self.feed_adapter.get_feed(user_id=payload.user_id,
-                                                    feed_id=feed_id)
+                                                           feed_id=feed_id
+                                                           )
+            await self._invalidate_cache()
+            return res
             
         except CustomError:
             raise
         except Exception as e:
-            raise InternalError(context="error delete_feed", original_exception=e)
+            raise InternalError(context="error like_feed", original_exception=e)
 
-    async def unlike_feed(self, payload:TokenPayload, feed_id:UUID)->FeedResponse:
+    async def unlike_feed(self, payload:TokenPayload, feed_id:UUID)->FeedLikeResponse:
         '''좋아요 취소. '''
         try:
-            # new like
-            await self.feed_adapter.delete_feed_like(user_id=payload.user_id,
-                                                             feed_id=feed_id
-                                                             )
-            
-            return await self.feed_adapter.get_feed(user_id=payload.user_id,
-                                                    feed_id=feed_id)
-
+            removed, res = await self.feed_adapter.delete_feed_like(user_id=payload.user_id,
+                                                                    feed_id=feed_id
+                                                                    )
+            if removed:
+                await self._invalidate_cache()
+            return res
 
         except CustomError:
             raise
         except Exception as e:
-            raise InternalError(context="error delete_feed", original_exception=e)
+            raise InternalError(context="error unlike_feed", original_exception=e)
+
+    async def _invalidate_cache(self):
+        '''피드 쓰기 후 공유 페이지 캐시 무효화'''
+        if self.cache_adapter is not None:
+            await self.cache_adapter.invalidate()
@@ -1,25 +1,50 @@
 """
 training data 관련 유스케이스
 """
-from typing import List
+from typing import List, Tuple
 from uuid import UUID, uuid4
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
+from weakref import WeakValueDictionary
 import asyncio
 
 from adapters.training_data_adapter import TrainingDataPort
 from adapters.training_adapter import TrainingPort
 from adapters.redis_adapter import RedisPort
+from ports.sync_job_port import SyncJobPort
+from ports.account_port import AccountPort
 from schemas.models import (TokenPayload, 
                             TrainResponse, 
                             TrainRequest, 
                             LapData, 
+                            StreamData,
+                            ActivityData,
                             TrainDetailResponse,
-                            TrainSessionResponse
+                            TrainSessionResponse,
+                            SyncJobResponse,
+                            PersonalRecordResponse
                             )
 from use_cases.auth.auth_strava import StravaHandler
 from domains.data_analyzer import DataAnalyzer
-from config.exceptions import (CustomError, InternalError, NotModifiedError, ValidationError)
-from config.constants import ETAG_TRAIN_SESSION
+from domains.stream_analyzer import StreamAnalyzer
+from infra.etag import session_part_etag, train_sessions_etag, etag_matches
+from infra.stream_codec import stream_to_arrays
+from config.exceptions import (CustomError, InternalError, NotModifiedError, ValidationError, NotFoundError)
+from config.constants import (ETAG_TRAIN_SESSION, ETAG_SESSION_DETAIL, ETAG_TTL_SEC,
+                              SYNC_OVERLAP_SEC, STREAM_CHANNELS)
+from config.settings import sync
+
+
+# 활동 상세 fetch 동시성 제한
+# 프로세스 전체 상한 + 사용자별 상한 (한 사용자가 전체 슬롯을 점유하지 못하도록)
+_fetch_semaphore = asyncio.Semaphore(sync.concurrency)
+_user_semaphores: "WeakValueDictionary[UUID, asyncio.Semaphore]" = WeakValueDictionary()
+
+def _get_user_semaphore(user_id:UUID) -> asyncio.Semaphore:
+    sem = _user_semaphores.get(user_id)
+    if sem is None:
+        sem = asyncio.Semaphore(sync.user_concurrency)
+        _user_semaphores[user_id] = sem
+    return sem
 
 
 class TrainSessionHandler:
@@ -27,25 +52,61 @@ class TrainSessionHandler:
                  db_adapter: TrainingPort,
                  redis_adapter: RedisPort,
                  auth_handler: StravaHandler,
+                 job_adapter: SyncJobPort = None,
+                 account_adapter: AccountPort = None,
                  ):
         self.data_adapter = data_adapter
         self.db_adapter = db_adapter
         self.redis_adapter = redis_adapter
         self.auth_handler = auth_handler
+        self.job_adapter = job_adapter
+        self.account_adapter = account_adapter
         self.analyzer = DataAnalyzer()
+        self.stream_analyzer = StreamAnalyzer()
         self.etagpage = ETAG_TRAIN_SESSION
         
     
     ## 스트라바 액세스 토큰 불러오기
     async def _get_access_token(self, payload:TokenPayload):
         return await self.auth_handler.get_access_and_refresh_if_expired(payload=payload)
+
+    async def _get_max_hr(self, user_id:UUID) -> int | None:
+        """사용자 정보(나이)로 추정한 최대심박. 정보가 없으면 None (분석기 기본값 사용)"""
+        if self.account_adapter is None:
+            return None
+        info = await self.account_adapter.get_user_info_by_id(user_id=user_id)
+        return StreamAnalyzer.estimate_max_hr(info.age if info is not None else None)
         
 
     
         
+    async def enqueue_new_schedules(self, payload:TokenPayload, start_date:int = None) -> SyncJobResponse:
+        """새 활동 sync 작업 등록. 요청 안에서 sync 하지 않고 worker 가 처리
+            사용자별로 진행중인 작업이 있으면 그 작업 반환
+        """
+        try:
+            return await self.job_adapter.enqueue(user_id=payload.user_id,
+                                                  start_date=start_date)
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context="error enqueue_new_schedules", original_exception=e)
+
+    async def get_sync_job(self, payload:TokenPayload, job_id:str) -> SyncJobResponse:
+        """sync 작업 상태 조회"""
+        try:
+            job = await self.job_adapter.get_job(job_id=job_id)
+            if job is None or job.user_id != payload.user_id:
+                raise NotFoundError(detail="sync job not found")
+            return job
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context="error get_sync_job", original_exception=e)
+        
     async def fetch_new_schedules(self, payload:TokenPayload, start_date:int = None) -> bool:
         """주어진 기간 이후의 활동들을 받아서 db에 저장.
-                    1. 주어진 날 이후의 데이터 받기
+                    1. 주어진 날 (없으면 마지막 sync 시점) 이후의 데이터 페이지 단위로 받기
                     2. db에 데이터 저장. db에 겹치는 활동은 저장안함
                     3. 리턴
         """
@@ -58,41 +119,42 @@ class TrainSessionHandler:
                 raise ValidationError(detail="invalid token")
             
             
-            # 액티비티 리스트 
-            activity_list = await self.data_adapter.fetch_activities(access_token=access_token,
-                                                          after_date=start_date)
+            # 증분 sync. 날짜 지정이 없으면 마지막 sync 시점 이후만 요청
+            last_synced = await self.data_adapter.get_last_synced_at(user_id=payload.user_id)
+            after_date = start_date
+            if after_date is None and last_synced is not None:
+                after_date = last_synced - SYNC_OVERLAP_SEC
+            # 요청 구간이 기존 기준점과 이어질 때만 기준점 갱신 (중간 공백 방지)
+            move_mark = last_synced is None or after_date is None or after_date <= last_synced
+            # 심박 존 기준. sync 작업당 한번만 조회
+            max_hr = await self._get_max_hr(payload.user_id)
 
-            # 각 액티비티
-            # schedules = []
-            for activity in activity_list:
-                
-                # 기존 db에 있는지 확인. 이미 fetch 됐었던 데이터면 패스
-                db_session = await self.db_adapter.get_session_by_activity_id(user_id=payload.user_id,
-                                                                        provider="strava",
-                                                                        activity_id=activity.activity_id)
-                if db_session is not None:
-                    continue 
-
-                lap_data, stream_data = await asyncio.gather(
-                    self.data_adapter.fetch_activity_lap(access_token=access_token,
-                                                            activity_id=activity.activity_id),
+            # 액티비티 페이지 단위로 처리. 전체를 메모리에 올리지 않음
+            async for activity_list in self.data_adapter.iter_activity_pages(access_token=access_token,
+                                                                             after_date=after_date):
+
+                # 기존 db에 있는지 한번에 확인. 이미 fetch 됐었던 데이터면 패스
+                existing = await self.db_adapter.get_existing_activity_ids(
+                                                user_id=payload.user_id,
+                                                provider="strava",
+                                                activity_ids=[a.activity_id for a in activity_list])
+                new_activities = [a for a in activity_list if a.activity_id not in existing]
+
+                # lap/stream 동시 fetch -> 도착 순서대로 분석
+                analyzed = await self._fetch_and_analyze(user_id=payload.user_id,
+                                                         access_token=access_token,
+                                                         activities=new_activities,
+                                                         max_hr=max_hr)
                     
-                    self.data_adapter.fetch_activity_stream(access_token=access_token,
-                                                            activity_id=activity.activity_id)
-                )
-                
-                train_res = self.analyzer.analyze(activity=activity,
-                                                            laps=lap_data,
-                                                            stream=stream_data)
-                activity.activity_title = train_res.get("title", "러닝")
-                activity.analysis_result = train_res.get("detail", "세부내용 없음")  
+                ## db 저장. 분석이 끝난 뒤 하나의 트랜잭션으로 한번에
+                await self.db_adapter.save_sessions(user_id=payload.user_id,
+                                                    sessions=analyzed)
                 
-                ## db 저장
-                await self.db_adapter.save_session(user_id=payload.user_id,
-                                             activity=activity,
-                                             laps=lap_data,
-                                             stream=stream_data
-                                             )
+                # 페이지 저장 완료 후 기준점 갱신
+                if move_mark:
+                    latest = max(int(a.start_date.timestamp()) for a in activity_list)
+                    await self.data_adapter.update_last_synced_at(user_id=payload.user_id,
+                                                                  last_synced_at=latest)
                 
             # 데이터 수정 시점 : etag 만료 
             await self.redis_adapter.incr_etag_version(user_id=payload.user_id,
@@ -108,52 +170,219 @@ class TrainSessionHandler:
             raise InternalError(context="error fetch_new_schedules", original_exception=e)
 
     
+    async def _fetch_activity_detail(self, user_sem:asyncio.Semaphore,
+                                     access_token:str,
+                                     activity:ActivityData
+                                     ) -> Tuple[ActivityData, List[LapData], StreamData]:
+        """세마포어 범위 안에서 lap + stream 가져오기"""
+        # 사용자 슬롯 먼저 획득. 대기중에 전역 슬롯을 점유하지 않도록
+        async with user_sem, _fetch_semaphore:
+            lap_data, stream_data = await asyncio.gather(
+                self.data_adapter.fetch_activity_lap(access_token=access_token,
+                                                        activity_id=activity.activity_id),
+                
+                self.data_adapter.fetch_activity_stream(access_token=access_token,
+                                                        activity_id=activity.activity_id)
+            )
+        return activity, lap_data, stream_data
+
+    async def _fetch_and_analyze(self, user_id:UUID,
+                                 access_token:str,
+                                 activities:List[ActivityData],
+                                 max_hr:int = None
+                                 ) -> List[Tuple[ActivityData, List[LapData], StreamData]]:
+        """활동별 lap/stream 을 동시성 제한하에 fetch, 완료되는 순서대로 분석
+            max_hr: 사용자 최대심박 (심박 존 경계). 없으면 분석기 기본값
+        
+            return: [(activity, laps, stream), ...]
+        """
+        user_sem = _get_user_semaphore(user_id)
+        tasks = [
+            asyncio.create_task(self._fetch_activity_detail(user_sem=user_sem,
+                                                            access_token=access_token,
+                                                            activity=activity))
+            for activity in activities
+        ]
+        results = []
+        try:
+            for fut in asyncio.as_completed(tasks):
+                activity, lap_data, stream_data = await fut
+                
+                train_res = self.analyzer.analyze(activity=activity,
+                                                laps=lap_data,
+                                                stream=stream_data)
+                activity.activity_title = train_res.get("title", "러닝")
+                activity.analysis_result = train_res.get("detail", "세부내용 없음")  
+                # 스트림 지표는 저장시 한번만 계산
+                activity.metrics = self.stream_analyzer.analyze(stream_to_arrays(stream_data),
+                                                                max_hr=max_hr)
+                results.append((activity, lap_data, stream_data))
+        finally:
+            # 하나라도 실패시 남은 요청 취소. 취소 완료까지 대기 (http 요청이 남지 않도록)
+            # 이미 끝난 task 의 예외도 같이 회수
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+                    
+        return results
+    
     async def get_schedules(self, payload:TokenPayload, etag:str = None, start_date:int = None) -> TrainSessionResponse:
         """db 에서 스케줄 받기
-            etag 받아서 확인. 변경사항 없을시 304 NotModified 에러 출력.
-            사용자 etag 와 데이터 etag 가 매치하지 않을 경우 데이터 내보내기 
+            etag 는 조회 기간(window)별 내용 해시. 변경사항 없을시 304 NotModified 에러 출력.
+            1. 기간 etag 가 현재 버전에서 계산된 값이고 사용자 etag 와 같으면 db 조회 없이 304
+               etag 가 다르면 redis 에 저장된 응답 본문 반환 (db 조회 없음)
+            2. 버전이 바뀐 경우 db 조회 후 내용 해시 비교. 해당 기간 데이터가 그대로면 304
             
             return: {"etag": str, "data": List[TrainResponse]}
         """
         try:
-            redis_etag = await self.redis_adapter.get_user_etag(user_id=payload.user_id,page=ETAG_TRAIN_SESSION)
-            # 사용자 etag 가 서버와 매칭할 경우 304 
-            if redis_etag is not None and etag is not None and redis_etag == etag :
-                raise NotModifiedError(context="data not modified")
+            start_date = self._schedule_start(start_date)
+            window = str(start_date)
+            version = await self.redis_adapter.get_or_init_etag_version(user_id=payload.user_id,
+                                                                        page=ETAG_TRAIN_SESSION)
+            cached = await self.redis_adapter.get_window_etag(user_id=payload.user_id,
+                                                              page=ETAG_TRAIN_SESSION,
+                                                              window=window)
+            if cached is not None and cached.get("version") == version:
+                # 사용자 etag 가 현재 버전 기준 기간 etag 와 매칭할 경우 304 
+                if cached.get("etag") and etag_matches(etag, cached["etag"]):
+                    raise NotModifiedError(context="data not modified")
+                # 같은 버전에서 만든 응답 그대로 사용
+                if cached.get("body"):
+                    return TrainSessionResponse.model_validate_json(cached["body"])
 
-            # etag 미스매치. 데이터 불러오기
+            # 버전 변경 또는 etag 미스매치. 데이터 불러오기
             data =  await self.db_adapter.get_sessions_by_date(user_id=payload.user_id,
                                                 start_date=start_date)
             
-            # 처음 요청시
-            if redis_etag is None:
-                redis_etag = await self.redis_adapter.incr_etag_version(user_id=payload.user_id,
-                                                                  page=ETAG_TRAIN_SESSION)
-
-
-            # 데이터 + 갱신 etag 반환 
-            return TrainSessionResponse(
-                etag=redis_etag,
+            new_etag = train_sessions_etag(data)
+            res = TrainSessionResponse(
+                etag=new_etag,
                 data=data
             )
+            # 버전이 올라가면 (fetch_new_schedules, upload, delete) 본문도 같이 무효
+            await self.redis_adapter.set_window_etag(user_id=payload.user_id,
+                                                     page=ETAG_TRAIN_SESSION,
+                                                     window=window,
+                                                     version=version,
+                                                     etag=new_etag,
+                                                     body=res.model_dump_json())
+            # 다른 기간만 변경된 경우
+            if etag_matches(etag, new_etag):
+                raise NotModifiedError(context="data not modified")
+
+            # 데이터 + 갱신 etag 반환 
+            return res
 
         except CustomError:
             raise
         except Exception as e:
             raise InternalError(context="error get_schedules", original_exception=e)
 
-    async def get_schedule_detail(self, payload:TokenPayload, session_id:UUID = None)->TrainDetailResponse:
-        """db 에서 스케줄 세부정보 받기"""
+    def _schedule_start(self, start_date:int = None) -> int:
+        """조회 시작 시각 (etag 기간 키로도 사용)
+            기본 기간(최근 14일)은 UTC 자정 기준으로 고정. 같은 날 안에서는 키와 조회 범위가 항상 일치
+        """
+        if start_date is not None:
+            return start_date
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        return int((today - timedelta(days=14)).timestamp())
+
+    async def get_schedule_detail(self, payload:TokenPayload, session_id:UUID = None,
+                                  points:int = None, channels:str = None)->TrainDetailResponse:
+        """db 에서 스케줄 세부정보 받기
+            points: 차트용 스트림 포인트 수 (LTTB)
+            channels: 콤마 구분 채널 목록 ex) "heartrate,velocity"
+        """
         try:
-            
             return await self.db_adapter.get_session_detail(user_id=payload.user_id,
-                                                session_id=session_id)
+                                                session_id=session_id,
+                                                points=points,
+                                                channels=self._parse_channels(channels))
         except CustomError:
             raise
         except Exception as e:
             raise InternalError(context="error get_schedule_detail", original_exception=e)
 
+    async def get_schedule_laps(self, payload:TokenPayload, session_id:UUID,
+                                etag:str = None)->Tuple[str, List[LapData]]:
+        """세션 lap 만 받기. 세션 버전이 redis 에 있고 etag 일치시 db 조회 없이 304
+            return: (etag, laps)
+        """
+        try:
+            await self._check_session_etag(payload=payload, session_id=session_id,
+                                           etag=etag, part="laps")
+
+            version, laps = await self.db_adapter.get_session_laps(user_id=payload.user_id,
+                                                                   session_id=session_id)
+            await self._set_session_version(payload=payload, session_id=session_id, version=version)
+            return session_part_etag(version, "laps"), laps
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context="error get_schedule_laps", original_exception=e)
+
+    async def get_schedule_stream(self, payload:TokenPayload, session_id:UUID,
+                                  etag:str = None,
+                                  points:int = None, channels:str = None)->Tuple[str, StreamData | None]:
+        """세션 stream 만 받기. points / channels 조합별 etag
+            return: (etag, stream)
+        """
+        try:
+            channel_list = self._parse_channels(channels)
+            params = (points, sorted(channel_list) if channel_list else None)
+            await self._check_session_etag(payload=payload, session_id=session_id,
+                                           etag=etag, part="stream", params=params)
+
+            version, stream = await self.db_adapter.get_session_stream(user_id=payload.user_id,
+                                                                       session_id=session_id,
+                                                                       points=points,
+                                                                       channels=channel_list)
+            await self._set_session_version(payload=payload, session_id=session_id, version=version)
+            return session_part_etag(version, "stream", *params), stream
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context="error get_schedule_stream", original_exception=e)
+
+    def _parse_channels(self, channels:str = None) -> List[str] | None:
+        """콤마 구분 채널 문자열 검증"""
+        if not channels:
+            return None
+        channel_list = [c.strip() for c in channels.split(",") if c.strip()]
+        invalid = set(channel_list) - set(STREAM_CHANNELS)
+        if invalid:
+            raise ValidationError(detail=f"invalid channels {sorted(invalid)}")
+        return channel_list
+
+    async def _check_session_etag(self, payload:TokenPayload, session_id:UUID,
+                                  etag:str, part:str, params:tuple = ()):
+        """redis 의 세션 버전으로 etag 비교. 사용자별 키라 소유권 확인된 세션만 매칭"""
+        if etag is None:
+            return
+        version = await self.redis_adapter.get_user_etag(user_id=payload.user_id,
+                                                         page=ETAG_SESSION_DETAIL.format(session_id=session_id))
+        if version is not None and etag_matches(etag, session_part_etag(version, part, *params)):
+            raise NotModifiedError(context="data not modified")
+
+    async def _set_session_version(self, payload:TokenPayload, session_id:UUID, version:str):
+        await self.redis_adapter.set_user_etag(user_id=payload.user_id,
+                                               page=ETAG_SESSION_DETAIL.format(session_id=session_id),
+                                               etag=version,
+                                               ttl=ETAG_TTL_SEC)
+
     
+    async def get_records(self, payload:TokenPayload, year:int = None)->List[PersonalRecordResponse]:
+        """거리별 최고기록. 인덱스만 조회 (스트림 스캔 없음)"""
+        try:
+            return await self.db_adapter.get_personal_records(user_id=payload.user_id,
+                                                              year=year)
+        except CustomError:
+            raise
+        except Exception as e:
+            raise InternalError(context="error get_records", original_exception=e)
+
     async def upload_new_schedule(self, payload:TokenPayload, session:TrainRequest)->bool:
         """db에 사용자가 직접 입력한 훈련 저장 train_session 만"""
         try:
@@ -181,6 +410,8 @@ class TrainSessionHandler:
             res = await self.db_adapter.delete_session(user_id=payload.user_id,
                                                        session_id=session_id
                                                        )
+            await self.redis_adapter.remove_user_etag(user_id=payload.user_id,
+                                                      page=ETAG_SESSION_DETAIL.format(session_id=session_id))
         
             # redis etag 버전 갱신
             await self.redis_adapter.incr_etag_version(user_id=payload.user_id,
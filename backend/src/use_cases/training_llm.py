@@ -28,7 +28,7 @@ class LLMHandler:
         try:
             user_info, sessions = await asyncio.gather(
                 self.account_adapter.get_user_info_by_id(user_id=payload.user_id),
-                self.training_adapter.get_sessions_by_date(user_id=payload.user_id)
+                self.training_adapter.get_sessions_by_date(user_id=payload.user_id, replica=True)
             )
             res = await self.llm_adapter.generate_training_plan(user_info=user_info,
                                                             training_sessions=sessions)
@@ -45,7 +45,7 @@ class LLMHandler:
         try:
             user_info, sessions = await asyncio.gather(
                 self.account_adapter.get_user_info_by_id(user_id=payload.user_id),
-                self.training_adapter.get_sessions_by_date(user_id=payload.user_id)
+                self.training_adapter.get_sessions_by_date(user_id=payload.user_id, replica=True)
             )
 
             res = await self.llm_adapter.generate_coach_advice(user_info=user_info,
@@ -63,7 +63,7 @@ class LLMHandler:
         try:
             user_info, sessions, is_available = await asyncio.gather(
                 self.account_adapter.get_user_info_by_id(user_id=payload.user_id),
-                self.training_adapter.get_sessions_by_date(user_id=payload.user_id),
+                self.training_adapter.get_sessions_by_date(user_id=payload.user_id, replica=True),
                 # if exist, check period
                 self.llm_data_adapter.is_llm_call_available(user_id=payload.user_id)
 
@@ -0,0 +1,40 @@
+"""
+sync worker + 주기 작업 단독 실행 (web 과 별도로 스케일)
+    python -m worker
+SIGTERM (docker stop / 배포) 을 받으면 worker task 를 취소해서 실행중 작업을 대기열로 되돌린 뒤 종료
+"""
+import asyncio
+import signal
+
+from config.settings import sync, feed
+from infra.db.storage.session import close_db
+from infra.db.redis.redis_client import init_redis, close_redis, get_redis
+from infra.http_client import init_strava_client, close_strava_client
+from interfaces.worker.sync_worker import run_sync_worker
+from interfaces.worker.feed_worker import run_like_reconciler
+from config.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+async def main():
+    await init_redis()
+    await init_strava_client()
+    try:
+        tasks = [run_sync_worker(get_redis()) for _ in range(max(sync.workers, 1))]
+        if feed.like_reconcile_interval > 0:
+            tasks.append(run_like_reconciler(get_redis(), feed.like_reconcile_interval))
+        consumers = asyncio.gather(*tasks)
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, consumers.cancel)
+        try:
+            await consumers
+        except asyncio.CancelledError:
+            logger.info("worker stopped")
+    finally:
+        await close_db()
+        await close_redis()
+        await close_strava_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,19 @@
+"""
+테스트 공통 설정
+settings 는 import 시점에 env 를 읽으므로 필수 값만 테스트용으로 채움
+"""
+import os
+from cryptography.fernet import Fernet
+
+_TEST_KEY = Fernet.generate_key().decode()
+os.environ.setdefault("ENCRYPTION_KEY_REFRESH", _TEST_KEY)
+os.environ.setdefault("ENCRYPTION_KEY_STRAVA", _TEST_KEY)
+
+
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    """async 테스트 (pytest.mark.anyio) 는 asyncio 로만 실행"""
+    return "asyncio"
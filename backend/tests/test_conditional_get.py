@@ -0,0 +1,127 @@
+"""
+조건부 GET 엔드포인트 테스트 (ConditionalGet / etag_invalidator, fakeredis)
+- 같은 버전의 etag (weak 포함) 면 핸들러 실행 없이 304
+- 쓰기 라우트의 bump() 이후 새 etag 로 200
+- etag 는 사용자별 (공용 버전이라도 사용자마다 다름)
+"""
+from uuid import UUID, uuid4
+
+import fakeredis
+import httpx
+import pytest
+from fastapi import FastAPI, Depends, Header
+
+from interfaces.api.conditional import ConditionalGet, etag_invalidator
+from infra.db.redis.redis_client import get_redis
+from schemas.models import TokenPayload
+from use_cases.auth.dependencies import get_current_user
+from config.constants import ETAG_PROFILE, ETAG_FEED
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def app():
+    """사용자별 (profile), 공용 (feed) 조회 + 쓰기 라우트. 조회 핸들러 실행 횟수 기록"""
+    app = FastAPI()
+    app.state.calls = []
+    redisdb = fakeredis.FakeAsyncRedis(decode_responses=True)
+
+    async def current_user(x_user:str = Header(...)) -> TokenPayload:
+        return TokenPayload(user_id=UUID(x_user), exp=0, iat=0)
+    app.dependency_overrides[get_current_user] = current_user
+    app.dependency_overrides[get_redis] = lambda: redisdb
+
+    @app.get("/me", dependencies=[Depends(ConditionalGet(ETAG_PROFILE))])
+    async def get_me():
+        app.state.calls.append("me")
+        return {"ok": True}
+
+    @app.post("/me")
+    async def update_me(bump_etag=Depends(etag_invalidator(ETAG_PROFILE))):
+        await bump_etag()
+        return {"ok": True}
+
+    @app.get("/feed", dependencies=[Depends(ConditionalGet(ETAG_FEED, shared=True))])
+    async def get_feed():
+        app.state.calls.append("feed")
+        return {"ok": True}
+
+    @app.post("/feed")
+    async def create_feed(bump_etag=Depends(etag_invalidator(ETAG_FEED, shared=True))):
+        await bump_etag()
+        return {"ok": True}
+    return app
+
+
+@pytest.fixture
+async def client(app):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+def _user() -> dict:
+    return {"X-User": str(uuid4())}
+
+
+async def test_matching_weak_etag_returns_304(app, client):
+    user = _user()
+    res = await client.get("/me", headers=user)
+    assert res.status_code == 200
+    etag = res.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    for if_none_match in (etag, etag.removeprefix("W/"), f'"stale", {etag}'):
+        res = await client.get("/me", headers={**user, "If-None-Match": if_none_match})
+        assert res.status_code == 304
+        assert res.headers["ETag"] == etag
+    assert app.state.calls == ["me"]  # 304 는 핸들러 실행 전
+
+    # url (쿼리) 이 다르면 다른 etag
+    res = await client.get("/me?x=1", headers={**user, "If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+
+
+async def test_write_bumps_version(app, client):
+    user = _user()
+    etag = (await client.get("/me", headers=user)).headers["ETag"]
+
+    assert (await client.post("/me", headers=user)).status_code == 200
+    res = await client.get("/me", headers={**user, "If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+    # 새 etag 로는 다시 304
+    res = await client.get("/me", headers={**user, "If-None-Match": res.headers["ETag"]})
+    assert res.status_code == 304
+    assert app.state.calls == ["me", "me"]
+
+
+async def test_user_scoped_etags_differ_between_users(app, client):
+    alice, bob = _user(), _user()
+    alice_etag = (await client.get("/me", headers=alice)).headers["ETag"]
+    bob_etag = (await client.get("/me", headers=bob)).headers["ETag"]
+    assert alice_etag != bob_etag
+
+    # 다른 사용자의 etag 로는 304 아님
+    res = await client.get("/me", headers={**bob, "If-None-Match": alice_etag})
+    assert res.status_code == 200
+
+    # 사용자별 버전: alice 의 쓰기는 bob 의 etag 를 바꾸지 않음
+    await client.post("/me", headers=alice)
+    assert (await client.get("/me", headers={**bob, "If-None-Match": bob_etag})).status_code == 304
+    assert (await client.get("/me", headers={**alice, "If-None-Match": alice_etag})).status_code == 200
+
+
+async def test_shared_version_is_bumped_by_any_user(client):
+    alice, bob = _user(), _user()
+    alice_etag = (await client.get("/feed", headers=alice)).headers["ETag"]
+    bob_etag = (await client.get("/feed", headers=bob)).headers["ETag"]
+    # 공용 버전이라도 etag 는 사용자별 (응답의 my_like 가 다름)
+    assert alice_etag != bob_etag
+    assert (await client.get("/feed", headers={**bob, "If-None-Match": alice_etag})).status_code == 200
+
+    # bob 의 새 글은 alice 의 etag 도 무효화
+    await client.post("/feed", headers=bob)
+    assert (await client.get("/feed", headers={**alice, "If-None-Match": alice_etag})).status_code == 200
+    assert (await client.get("/feed", headers={**bob, "If-None-Match": bob_etag})).status_code == 200
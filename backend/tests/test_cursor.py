@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from infra.cursor import encode_cursor, decode_cursor
+from config.exceptions import ValidationError
+
+
+def test_round_trip():
+    created_at = datetime(2026, 10, 17, 8, 30, 15, 123456, tzinfo=timezone.utc)
+    row_id = uuid4()
+    assert decode_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id)
+
+
+def test_round_trip_naive_datetime():
+    """sqlite 는 tz 없는 datetime 반환"""
+    created_at = datetime(2026, 1, 1, 0, 0, 0)
+    row_id = uuid4()
+    assert decode_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id)
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(datetime.now(timezone.utc), uuid4())
+    assert "=" not in cursor
+    assert "+" not in cursor and "/" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "!!!", encode_cursor(datetime.now(), uuid4())[:-5]])
+def test_malformed_cursor_is_400(cursor):
+    with pytest.raises(ValidationError) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
@@ -0,0 +1,149 @@
+"""
+피드 페이지 캐시 테스트 (aiosqlite + fakeredis)
+- 쓰기 (좋아요, 좋아요 취소, 새 글) 는 캐시 세대를 올려 이전 페이지를 무효화
+- 공유 페이지에는 my_like 를 저장하지 않고, 캐시 hit 시 요청 사용자 기준으로 덮어씀
+"""
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import fakeredis
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+
+from adapters import FeedAdapter, FeedCacheAdapter
+from infra.db.orm.models import User, Feed
+from use_cases.feed import FeedHandler
+from schemas.models import TokenPayload, FeedRequest, FeedPageResponse
+
+pytestmark = pytest.mark.anyio
+
+PAGE = 2
+
+
+@pytest.fixture
+async def env():
+    """(handler, cache, alice, bob, feed_ids 최신순)"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    now = datetime.now(timezone.utc)
+    alice, bob = uuid4(), uuid4()
+    feed_ids = [uuid4() for _ in range(3)]
+    async with engine.begin() as conn:
+        await conn.execute(User.__table__.insert(), [
+            {"id": user_id, "email": f"{name}@test.com", "name": name, "created_at": now, "provider": "local"}
+            for user_id, name in ((alice, "alice"), (bob, "bob"))])
+        await conn.execute(Feed.__table__.insert(), [
+            {"id": feed_id, "user_id": alice, "created_at": now - timedelta(minutes=i), "train_date": now,
+             "title": f"t{i}", "train_summary": "s", "likes_count": 0}
+            for i, feed_id in enumerate(feed_ids)])
+
+    cache = FeedCacheAdapter(db=fakeredis.FakeAsyncRedis(decode_responses=True))
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        handler = FeedHandler(feed_adapter=FeedAdapter(db=db), cache_adapter=cache)
+        yield (handler, cache, TokenPayload(user_id=alice, exp=0, iat=0),
+               TokenPayload(user_id=bob, exp=0, iat=0), feed_ids)
+    await engine.dispose()
+
+
+@pytest.fixture
+def db_pages(env, monkeypatch):
+    """캐시 미스로 db 에서 읽은 페이지 수"""
+    handler = env[0]
+    calls = []
+    get_feeds = handler.feed_adapter.get_feeds_with_likes
+
+    async def counting(**kwargs):
+        calls.append(kwargs["user_id"])
+        return await get_feeds(**kwargs)
+    monkeypatch.setattr(handler.feed_adapter, "get_feeds_with_likes", counting)
+    return calls
+
+
+def _likes(page:FeedPageResponse) -> dict:
+    return {f.feed_id: (f.likes_count, f.my_like) for f in page.data}
+
+
+async def test_like_unlike_and_new_post_bump_generation(env, db_pages):
+    handler, cache, alice, bob, feed_ids = env
+    versions = [await cache.get_version()]
+
+    await handler.fetch_feeds(payload=alice, page_size=PAGE)
+    await handler.fetch_feeds(payload=alice, page_size=PAGE)
+    assert len(db_pages) == 1  # 같은 세대는 캐시 hit
+
+    await handler.like_feed(payload=bob, feed_id=feed_ids[0])
+    versions.append(await cache.get_version())
+    page = await handler.fetch_feeds(payload=alice, page_size=PAGE)
+    assert len(db_pages) == 2
+    assert _likes(page)[feed_ids[0]] == (1, False)
+
+    await handler.unlike_feed(payload=bob, feed_id=feed_ids[0])
+    versions.append(await cache.get_version())
+    page = await handler.fetch_feeds(payload=alice, page_size=PAGE)
+    assert _likes(page)[feed_ids[0]] == (0, False)
+
+    # 좋아요가 없던 글의 취소는 쓰기가 아님 -> 세대 유지
+    await handler.unlike_feed(payload=bob, feed_id=feed_ids[0])
+    assert await cache.get_version() == versions[-1]
+
+    await handler.create_feed(payload=bob, data=FeedRequest(train_date=datetime.now(timezone.utc),
+                                                           title="new", train_summary="s"))
+    versions.append(await cache.get_version())
+    page = await handler.fetch_feeds(payload=alice, page_size=PAGE)
+    assert page.data[0].title == "new"  # 이전 세대 첫 페이지가 아닌 새 글 포함 페이지
+
+    assert len(set(versions)) == len(versions)
+    assert len(db_pages) == 4
+
+
+async def test_page_stored_under_stale_generation_is_not_served(env):
+    handler, cache, alice, _, _ = env
+    version = await cache.get_version()
+    page = await handler.feed_adapter.get_feeds_with_likes(user_id=alice.user_id, limit=PAGE + 1)
+
+    # db 조회 중 쓰기 발생 -> 조회 전에 읽은 세대로 저장
+    await cache.invalidate()
+    await cache.set_page(version=version, cursor=None, page_size=PAGE, page=FeedPageResponse(data=page[:PAGE]))
+    assert await cache.get_page(version=await cache.get_version(), cursor=None, page_size=PAGE) is None
+
+
+async def test_cached_page_never_shares_my_like(env, db_pages):
+    handler, cache, alice, bob, feed_ids = env
+    await handler.like_feed(payload=alice, feed_id=feed_ids[0])
+
+    # alice 가 캐시를 채움
+    page = await handler.fetch_feeds(payload=alice, page_size=PAGE)
+    assert _likes(page)[feed_ids[0]] == (1, True)
+    # 공유 캐시에는 my_like 없음
+    stored = await cache.get_page(version=await cache.get_version(), cursor=None, page_size=PAGE)
+    assert not any(f.my_like for f in stored.data)
+
+    # bob 은 같은 캐시 페이지 + 자기 좋아요
+    page = await handler.fetch_feeds(payload=bob, page_size=PAGE)
+    assert _likes(page)[feed_ids[0]] == (1, False)
+    page = await handler.fetch_feeds(payload=alice, page_size=PAGE)
+    assert _likes(page)[feed_ids[0]] == (1, True)
+    assert len(db_pages) == 1
+
+    # bob 이 캐시를 채워도 alice 에게 bob 의 my_like 가 보이지 않음
+    await handler.like_feed(payload=bob, feed_id=feed_ids[1])
+    page = await handler.fetch_feeds(payload=bob, page_size=PAGE)
+    assert _likes(page) == {feed_ids[0]: (1, False), feed_ids[1]: (1, True)}
+    page = await handler.fetch_feeds(payload=alice, page_size=PAGE)
+    assert _likes(page) == {feed_ids[0]: (1, True), feed_ids[1]: (1, False)}
+    assert len(db_pages) == 2
+
+
+async def test_next_page_cache_is_keyed_by_cursor(env, db_pages):
+    handler, _, alice, bob, feed_ids = env
+    first = await handler.fetch_feeds(payload=alice, page_size=PAGE)
+    second = await handler.fetch_feeds(payload=alice, page_size=PAGE, cursor=first.next_cursor)
+    assert [f.feed_id for f in first.data + second.data] == feed_ids
+    assert second.next_cursor is None
+
+    again = await handler.fetch_feeds(payload=bob, page_size=PAGE, cursor=first.next_cursor)
+    assert [f.feed_id for f in again.data] == [f.feed_id for f in second.data]
+    assert len(db_pages) == 2
@@ -0,0 +1,229 @@
+"""
+핫 쿼리 인덱스 회귀 테스트 (d8f3a6b21c57_hot_query_indexes, ix_feed_created_at_id)
+
+1. 마이그레이션이 기대한 인덱스 (이름, 테이블, 컬럼) 를 생성/삭제하는지 (postgres 방언 offline SQL)
+2. 모델 메타데이터에도 같은 인덱스가 선언되어 있는지 (autogenerate 와 일치)
+3. 시드 데이터를 넣은 sqlite 에서 repo 의 모듈 레벨 statement 실행 계획이 인덱스를 타는지
+4. TEST_POSTGRES_URL 이 있으면 postgres EXPLAIN 으로 Seq Scan 이 없는지 (CI 에 postgres 가 있을 때만)
+"""
+import importlib.util
+import io
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+from sqlmodel import SQLModel
+
+from infra.db.orm.models import User, TrainSession, TrainSessionLap, TrainSessionStream, TrainSessionMetric, Feed, FeedLikes, Token
+from infra.db.storage import activity_repo, feed_repo
+
+MIGRATION = Path(__file__).resolve().parent.parent / "alembic" / "versions" / "d8f3a6b21c57_hot_query_indexes.py"
+
+HOT_INDEXES = {
+    "ix_token_user_id_device_id": ("token", ["user_id", "device_id"]),
+    "ix_trainsession_user_id_train_date": ("trainsession", ["user_id", "train_date"]),
+    "ix_trainsession_user_id_provider_activity_id": ("trainsession", ["user_id", "provider", "activity_id"]),
+    "ix_trainsessionlap_session_id": ("trainsessionlap", ["session_id"]),
+}
+
+USERS = 20
+SESSIONS_PER_USER = 50
+LAPS_PER_SESSION = 5
+FEEDS = 500
+
+
+# ------------------------
+# 마이그레이션 / 메타데이터
+# ------------------------
+def _migration_sql(step:str) -> str:
+    spec = importlib.util.spec_from_file_location("hot_query_indexes", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    buf = io.StringIO()
+    ctx = MigrationContext.configure(dialect_name="postgresql", opts={"as_sql": True, "output_buffer": buf})
+    with Operations.context(ctx):
+        getattr(module, step)()
+    return buf.getvalue()
+
+
+def test_migration_creates_hot_indexes():
+    sql = _migration_sql("upgrade")
+    for name, (table, columns) in HOT_INDEXES.items():
+        assert f"CREATE INDEX {name} ON {table} ({', '.join(columns)})" in sql
+
+
+def test_migration_downgrade_drops_hot_indexes():
+    sql = _migration_sql("downgrade")
+    for name in HOT_INDEXES:
+        assert f"DROP INDEX {name}" in sql
+
+
+def test_models_declare_hot_indexes():
+    declared = {
+        index.name: (table.name, [c.name for c in index.columns])
+        for table in SQLModel.metadata.tables.values()
+        for index in table.indexes
+    }
+    for name, expected in HOT_INDEXES.items():
+        assert declared.get(name) == expected
+    assert declared.get("ix_feed_created_at_id") == ("feed", ["created_at", "id"])
+
+
+# ------------------------
+# sqlite 실행 계획
+# ------------------------
+@pytest.fixture(scope="module")
+def seeded():
+    """모델 메타데이터로 스키마 생성 + 시드 데이터 + ANALYZE"""
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    ids = _seed(engine)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    yield engine, ids
+    engine.dispose()
+
+
+def _seed(engine) -> dict:
+    now = datetime.now(timezone.utc)
+    users = [{"id": uuid4(), "email": f"user{i}@test.com", "name": f"user{i}", "created_at": now, "provider": "local"}
+             for i in range(USERS)]
+    sessions, laps, streams, metrics, tokens = [], [], [], [], []
+    activity_id = 1
+    for user in users:
+        tokens.append({"id": uuid4(), "user_id": user["id"], "device_id": uuid4(),
+                       "refresh_token": "r", "expires_at": 0})
+        for d in range(SESSIONS_PER_USER):
+            session_id = uuid4()
+            sessions.append({"id": session_id, "user_id": user["id"], "provider": "strava",
+                             "activity_id": activity_id, "created_at": now,
+                             "train_date": now - timedelta(days=d), "distance": 5000.0})
+            activity_id += 1
+            streams.append({"session_id": session_id})
+            metrics.append({"session_id": session_id})
+            laps.extend({"id": uuid4(), "session_id": session_id, "lap_index": i, "distance": 1000.0,
+                         "elapsed_time": 300, "average_speed": 3.3, "max_speed": 4.0}
+                        for i in range(LAPS_PER_SESSION))
+    feeds = [{"id": uuid4(), "user_id": users[i % USERS]["id"], "created_at": now - timedelta(minutes=i),
+              "train_date": now, "title": "t", "train_summary": "s", "likes_count": 0}
+             for i in range(FEEDS)]
+    likes = [{"id": uuid4(), "feed_id": feed["id"], "user_id": user["id"], "created_at": now}
+             for feed in feeds[:100] for user in users[:5]]
+
+    with engine.begin() as conn:
+        for model, rows in ((User, users), (Token, tokens), (TrainSession, sessions),
+                            (TrainSessionLap, laps), (TrainSessionStream, streams),
+                            (TrainSessionMetric, metrics), (Feed, feeds), (FeedLikes, likes)):
+            conn.execute(model.__table__.insert(), rows)
+    return {"user_id": users[0]["id"], "session_id": sessions[0]["id"], "feed": feeds[50]}
+
+
+def _plan(engine, stmt, **params) -> list[str]:
+    sql = stmt.params(**params).compile(dialect=engine.dialect,
+                                        compile_kwargs={"literal_binds": True, "render_postcompile": True})
+    with engine.connect() as conn:
+        return [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def _assert_no_full_scan(plan:list[str]):
+    """인덱스 없이 테이블 전체를 읽는 단계 / 정렬용 임시 b-tree 가 없어야 함"""
+    for step in plan:
+        assert not re.fullmatch(r"SCAN \S+", step), plan
+        assert "TEMP B-TREE" not in step, plan
+
+
+def _assert_uses(plan:list[str], table:str, index:str):
+    assert any(re.match(rf"(SEARCH|SCAN) {table} USING (COVERING )?INDEX {index}\b", step) for step in plan), plan
+
+
+def test_schedule_by_date_uses_index(seeded):
+    engine, ids = seeded
+    plan = _plan(engine, activity_repo._SESSIONS_BY_DATE,
+                 user_id=ids["user_id"], start_date=datetime.now(timezone.utc) - timedelta(days=14))
+    _assert_no_full_scan(plan)
+    _assert_uses(plan, "trainsession", "ix_trainsession_user_id_train_date")
+
+
+def test_session_detail_lookups_use_index(seeded):
+    engine, ids = seeded
+    _assert_no_full_scan(_plan(engine, activity_repo._OWNED_SESSION,
+                               user_id=ids["user_id"], session_id=ids["session_id"]))
+    laps = _plan(engine, activity_repo._LAPS_BY_SESSION, session_id=ids["session_id"])
+    _assert_no_full_scan(laps)
+    _assert_uses(laps, "trainsessionlap", "ix_trainsessionlap_session_id")
+    _assert_no_full_scan(_plan(engine, activity_repo._STREAM_BY_SESSION, session_id=ids["session_id"]))
+    _assert_no_full_scan(_plan(engine, activity_repo._METRIC_BY_SESSION, session_id=ids["session_id"]))
+
+
+def test_sync_dedup_lookups_use_index(seeded):
+    engine, ids = seeded
+    _assert_no_full_scan(_plan(engine, activity_repo._EXISTING_ACTIVITY_IDS,
+                               user_id=ids["user_id"], provider="strava", activity_ids=[1, 2, 3]))
+    _assert_no_full_scan(_plan(engine, activity_repo._SESSION_BY_ACTIVITY_ID,
+                               user_id=ids["user_id"], activity_id=1, provider="strava"))
+
+
+def test_feed_pages_use_keyset_index(seeded):
+    engine, ids = seeded
+    first = _plan(engine, feed_repo._FEED_FIRST_PAGE, user_id=ids["user_id"], limit=21)
+    _assert_no_full_scan(first)
+    _assert_uses(first, "feed", "ix_feed_created_at_id")
+
+    feed = ids["feed"]
+    following = _plan(engine, feed_repo._FEED_NEXT_PAGE, user_id=ids["user_id"], limit=21,
+                      cursor_created_at=feed["created_at"], cursor_id=feed["id"])
+    _assert_no_full_scan(following)
+    _assert_uses(following, "feed", "ix_feed_created_at_id")
+
+
+def test_feed_my_like_uses_unique_index(seeded):
+    engine, ids = seeded
+    plan = _plan(engine, feed_repo._LIKED_FEED_IDS, user_id=ids["user_id"], feed_ids=[ids["feed"]["id"]])
+    _assert_no_full_scan(plan)
+
+
+# ------------------------
+# postgres 실행 계획 (선택)
+# ------------------------
+PG_URL = os.getenv("TEST_POSTGRES_URL")
+
+
+@pytest.mark.skipif(not PG_URL, reason="TEST_POSTGRES_URL 없음 (postgres EXPLAIN 생략)")
+def test_postgres_hot_queries_avoid_seq_scan():
+    """전용 테스트 DB 에서만 실행 (끝나면 drop_all). 시드 규모가 작아 enable_seqscan=off 로 인덱스 사용 가능 여부를 확인"""
+    engine = create_engine(PG_URL.replace("postgresql+asyncpg", "postgresql+psycopg2"))
+    SQLModel.metadata.create_all(engine)
+    try:
+        ids = _seed(engine)
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+        feed = ids["feed"]
+        cases = [
+            (activity_repo._SESSIONS_BY_DATE, "ix_trainsession_user_id_train_date",
+             dict(user_id=ids["user_id"], start_date=datetime.now(timezone.utc) - timedelta(days=14))),
+            (activity_repo._LAPS_BY_SESSION, "ix_trainsessionlap_session_id",
+             dict(session_id=ids["session_id"])),
+            (feed_repo._FEED_FIRST_PAGE, "ix_feed_created_at_id",
+             dict(user_id=ids["user_id"], limit=21)),
+            (feed_repo._FEED_NEXT_PAGE, "ix_feed_created_at_id",
+             dict(user_id=ids["user_id"], limit=21, cursor_created_at=feed["created_at"], cursor_id=feed["id"])),
+        ]
+        with engine.connect() as conn:
+            conn.execute(text("SET enable_seqscan = off"))
+            for stmt, index, params in cases:
+                sql = stmt.params(**params).compile(dialect=postgresql.dialect(),
+                                                    compile_kwargs={"literal_binds": True, "render_postcompile": True})
+                plan = "\n".join(row[0] for row in conn.exec_driver_sql(f"EXPLAIN {sql}"))
+                assert "Seq Scan" not in plan, plan
+                assert index in plan, plan
+    finally:
+        SQLModel.metadata.drop_all(engine)
+        engine.dispose()
@@ -0,0 +1,96 @@
+"""
+Strava rate limit 카운터 테스트 (fakeredis, 시각 고정)
+"""
+import fakeredis
+import pytest
+
+from infra import rate_limiter
+from infra.rate_limiter import StravaRateLimiter, PRIORITY_HIGH, PRIORITY_LOW, SHORT_WINDOW_SEC, DAY_WINDOW_SEC
+from config.exceptions import RateLimitError
+
+pytestmark = pytest.mark.anyio
+
+# 하루 시작 + 15분 윈도우 두번째 칸 + 100초
+NOW = DAY_WINDOW_SEC * 20000 + SHORT_WINDOW_SEC + 100
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    monkeypatch.setattr(rate_limiter.time, "time", lambda: NOW)
+    monkeypatch.setattr(rate_limiter.strava, "rate_limit_15m", 10)
+    monkeypatch.setattr(rate_limiter.strava, "rate_limit_daily", 100)
+    monkeypatch.setattr(rate_limiter.strava, "rate_limit_low_priority_ratio", 0.5)
+    monkeypatch.setattr(rate_limiter.strava, "rate_limit_max_wait", 0)
+    return StravaRateLimiter(fakeredis.FakeAsyncRedis(decode_responses=True))
+
+
+async def _used(limiter) -> tuple[int, int]:
+    short_key, day_key = limiter._window_keys(NOW)
+    short, day = await limiter.db.mget(short_key, day_key)
+    return int(short or 0), int(day or 0)
+
+
+async def test_acquire_counts_both_windows(limiter):
+    for _ in range(3):
+        await limiter.acquire()
+    assert await _used(limiter) == (3, 3)
+    short_key, day_key = limiter._window_keys(NOW)
+    assert 0 < await limiter.db.ttl(short_key) <= SHORT_WINDOW_SEC
+    assert 0 < await limiter.db.ttl(day_key) <= DAY_WINDOW_SEC
+
+
+async def test_windows_are_fixed_slots():
+    limiter = StravaRateLimiter(fakeredis.FakeAsyncRedis(decode_responses=True))
+    start = NOW - NOW % SHORT_WINDOW_SEC
+    assert limiter._window_keys(start) == limiter._window_keys(start + SHORT_WINDOW_SEC - 1)
+    assert limiter._window_keys(start)[0] != limiter._window_keys(start + SHORT_WINDOW_SEC)[0]
+    assert limiter._window_keys(start)[1] == limiter._window_keys(start + SHORT_WINDOW_SEC)[1]
+
+
+async def test_exceed_rolls_back_and_reports_retry_after(limiter):
+    for _ in range(10):
+        await limiter.acquire()
+    with pytest.raises(RateLimitError) as e:
+        await limiter.acquire()
+    # 초과분은 되돌림
+    assert await _used(limiter) == (10, 10)
+    assert e.value.retry_after == SHORT_WINDOW_SEC - 100
+
+
+async def test_low_priority_keeps_headroom_for_high(limiter):
+    for _ in range(5):
+        await limiter.acquire(priority=PRIORITY_LOW)
+    with pytest.raises(RateLimitError):
+        await limiter.acquire(priority=PRIORITY_LOW)
+    assert await _used(limiter) == (5, 5)
+    # 남겨둔 한도는 high 로 사용 가능
+    await limiter.acquire(priority=PRIORITY_HIGH)
+    assert await _used(limiter) == (6, 6)
+
+
+async def test_daily_limit_waits_until_midnight(limiter, monkeypatch):
+    monkeypatch.setattr(rate_limiter.strava, "rate_limit_daily", 2)
+    await limiter.acquire()
+    await limiter.acquire()
+    with pytest.raises(RateLimitError) as e:
+        await limiter.acquire()
+    assert e.value.retry_after == DAY_WINDOW_SEC - NOW % DAY_WINDOW_SEC
+    assert await _used(limiter) == (2, 2)
+
+
+async def test_headers_raise_local_counters_and_limits(limiter):
+    await limiter.acquire()
+    await limiter.update_from_headers({"X-RateLimit-Limit": "20,200", "X-RateLimit-Usage": "7,50"})
+    assert await _used(limiter) == (7, 50)
+    assert await limiter._get_limits() == (20, 200)
+
+    # 로컬 카운터가 더 크면 그대로 (다른 인스턴스가 방금 확보한 슬롯)
+    await limiter.update_from_headers({"X-RateLimit-Usage": "3,10"})
+    assert await _used(limiter) == (7, 50)
+
+
+async def test_mark_exhausted_blocks_current_window(limiter):
+    await limiter.mark_exhausted()
+    with pytest.raises(RateLimitError):
+        await limiter.acquire()
+    assert (await _used(limiter))[0] == 10
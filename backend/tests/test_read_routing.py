@@ -0,0 +1,127 @@
+"""
+primary / replica 조회 라우팅 테스트
+primary 에만 데이터가 있고 replica 는 비어있는 (지연된) 상태로 두고, 조회 결과로 어느 세션을 썼는지 확인
+"""
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import fakeredis
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+
+from adapters import TrainingAdapter, FeedAdapter, AccountAdapter, LLMDataAdapter, FeedCacheAdapter
+from infra.db.orm.models import (User, UserInfo, TrainSession, TrainSessionLap, TrainSessionStream,
+                                 PersonalRecord, Feed, FeedLikes, LLM)
+from use_cases.feed import FeedHandler
+from schemas.models import TokenPayload
+from interfaces.api import feed as feed_api, train_session as train_session_api, profile as profile_api
+
+pytestmark = pytest.mark.anyio
+
+
+async def _engine():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    return engine
+
+
+@pytest.fixture
+async def sessions():
+    """(primary, replica, ids). replica 는 스키마만 있음"""
+    primary_engine, replica_engine = await _engine(), await _engine()
+    now = datetime.now(timezone.utc)
+    user_id, session_id, feed_id = uuid4(), uuid4(), uuid4()
+    rows = [
+        (User, [{"id": user_id, "email": "a@test.com", "name": "a", "created_at": now, "provider": "local"}]),
+        (UserInfo, [{"id": uuid4(), "user_id": user_id, "age": 30}]),
+        (TrainSession, [{"id": session_id, "user_id": user_id, "provider": "local", "activity_id": 1,
+                         "created_at": now, "train_date": now, "distance": 5000.0}]),
+        (TrainSessionLap, [{"id": uuid4(), "session_id": session_id, "lap_index": 0, "distance": 1000.0,
+                            "elapsed_time": 300, "average_speed": 3.3, "max_speed": 4.0}]),
+        (TrainSessionStream, [{"session_id": session_id}]),
+        (PersonalRecord, [{"id": uuid4(), "user_id": user_id, "session_id": session_id, "distance": "5k",
+                           "year": now.year, "elapsed_time": 1500.0, "train_date": now}]),
+        (Feed, [{"id": feed_id, "user_id": user_id, "created_at": now, "train_date": now,
+                 "title": "t", "train_summary": "s", "likes_count": 1}]),
+        (FeedLikes, [{"id": uuid4(), "feed_id": feed_id, "user_id": user_id, "created_at": now}]),
+        (LLM, [{"id": uuid4(), "user_id": user_id, "executed_at": now - timedelta(days=1)}]),
+    ]
+    async with primary_engine.begin() as conn:
+        for model, data in rows:
+            await conn.execute(model.__table__.insert(), data)
+
+    async with AsyncSession(primary_engine) as primary, AsyncSession(replica_engine) as replica:
+        yield primary, replica, {"user_id": user_id, "session_id": session_id, "feed_id": feed_id}
+    await primary_engine.dispose()
+    await replica_engine.dispose()
+
+
+async def test_training_adapter_routing(sessions):
+    primary, replica, ids = sessions
+    adapter = TrainingAdapter(db=primary, read_db=replica)
+    user_id, session_id = ids["user_id"], ids["session_id"]
+
+    # etag / 기간 캐시에 묶이는 조회 -> primary
+    assert len(await adapter.get_sessions_by_date(user_id=user_id)) == 1
+    assert len((await adapter.get_session_detail(user_id=user_id, session_id=session_id)).laps) == 1
+    assert len((await adapter.get_session_laps(user_id=user_id, session_id=session_id))[1]) == 1
+    _, stream = await adapter.get_session_stream(user_id=user_id, session_id=session_id)
+    assert stream is not None
+    # 캐시되지 않는 조회 -> replica
+    assert await adapter.get_sessions_by_date(user_id=user_id, replica=True) == []
+    assert await adapter.get_personal_records(user_id=user_id) == []
+
+
+async def test_feed_adapter_routing(sessions):
+    primary, replica, ids = sessions
+    adapter = FeedAdapter(db=primary, read_db=replica)
+    user_id, feed_id = ids["user_id"], ids["feed_id"]
+
+    assert (await adapter.get_feed(user_id=user_id, feed_id=feed_id)).my_like
+    assert await adapter.get_liked_feed_ids(user_id=user_id, feed_ids=[feed_id]) == {feed_id}
+    assert len(await adapter.get_feeds_with_likes(user_id=user_id)) == 1
+    assert await adapter.get_feeds_with_likes(user_id=user_id, replica=True) == []
+
+
+async def test_account_and_llm_adapter_routing(sessions):
+    primary, replica, ids = sessions
+    user_id = ids["user_id"]
+
+    account = AccountAdapter(db=primary, read_db=replica)
+    assert (await account.get_account_by_id(user_id=user_id)).id == user_id  # /me etag -> primary
+    assert await account.get_user_info_by_id(user_id=user_id) is None  # llm 입력 -> replica
+
+    llm_data = LLMDataAdapter(db=primary, read_db=replica)
+    assert await llm_data.get_llm_predict(user_id=user_id) is not None  # /ai/get etag -> primary
+
+
+async def test_feed_cache_miss_reads_replica_except_right_after_write(sessions):
+    primary, replica, ids = sessions
+    payload = TokenPayload(user_id=ids["user_id"], exp=0, iat=0)
+    cache = FeedCacheAdapter(db=fakeredis.FakeAsyncRedis(decode_responses=True))
+    handler = FeedHandler(feed_adapter=FeedAdapter(db=primary, read_db=replica), cache_adapter=cache)
+
+    # 평소 캐시 미스 -> replica
+    assert (await handler.fetch_feeds(payload=payload)).data == []
+
+    # 쓰기 직후 -> 새 세대 캐시를 primary 데이터로 채움
+    await cache.invalidate()
+    assert await cache.recently_written()
+    page = await handler.fetch_feeds(payload=payload)
+    assert [f.feed_id for f in page.data] == [ids["feed_id"]]
+    assert page.data[0].my_like
+
+
+async def test_routers_pass_read_session(sessions, monkeypatch):
+    """라우터 handler 는 모두 read_db 를 adapter 에 넘김 (선택은 adapter 가 결정)"""
+    primary, replica, _ = sessions
+    monkeypatch.setattr(train_session_api, "StravaAdapter", lambda db: None)  # strava http client 불필요
+    redisdb = fakeredis.FakeAsyncRedis(decode_responses=True)
+
+    assert feed_api.get_handler(db=primary, redisdb=redisdb, read_db=replica).feed_adapter.read_db is replica
+    assert train_session_api.get_handler(db=primary, redisdb=redisdb,
+                                         read_db=replica).db_adapter.read_db is replica
+    assert profile_api.get_handler(db=primary, read_db=replica).account_adapter.read_db is replica
@@ -0,0 +1,155 @@
+"""
+훈련 세션 일괄 저장 테스트 (TrainingAdapter.save_sessions)
+- 한번의 commit 으로 저장
+- 동시 sync 로 생긴 세션 중복만 이미 저장된 활동을 빼고 다시 일괄 저장
+- 다른 제약 위반 (최고기록 uq_user_distance_year) 은 중복으로 취급하지 않음
+"""
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+
+from adapters import TrainingAdapter
+from infra.db.orm.models import User, TrainSession, TrainSessionLap, PersonalRecord
+from infra.db.storage import activity_repo
+from schemas.models import ActivityData, LapData, StreamData, StreamMetrics
+from config.exceptions import DBError, DuplicateError
+
+pytestmark = pytest.mark.anyio
+
+TRAIN_DATE = datetime(2025, 5, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+async def user_id(db):
+    user_id = uuid4()
+    await db.execute(User.__table__.insert(), [{"id": user_id, "email": "a@test.com", "name": "a",
+                                                "created_at": TRAIN_DATE, "provider": "local"}])
+    await db.commit()
+    return user_id
+
+
+def _session(activity_id:int, five_k:float = 1500.0):
+    activity = ActivityData(activity_id=activity_id, provider="strava", distance=5000.0, elapsed_time=1500,
+                            start_date=TRAIN_DATE,
+                            metrics=StreamMetrics(best_efforts={"5k": five_k}))
+    laps = [LapData(lap_index=0, distance=1000.0, elapsed_time=300, average_speed=3.3, max_speed=4.0)]
+    return activity, laps, StreamData(time=[0, 1, 2], distance=[0, 4, 8])
+
+
+async def _count(db, model) -> int:
+    return (await db.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+@pytest.fixture
+def commits(db, monkeypatch):
+    """commit 횟수 기록"""
+    calls = []
+    commit = db.commit
+
+    async def counting_commit():
+        calls.append(1)
+        await commit()
+    monkeypatch.setattr(db, "commit", counting_commit)
+    return calls
+
+
+@pytest.fixture
+def no_per_session_save(monkeypatch):
+    async def fail(*args, **kwargs):
+        raise AssertionError("per-session save used")
+    monkeypatch.setattr(activity_repo, "add_train_session", fail)
+
+
+async def test_saves_all_sessions_in_one_commit(db, user_id, commits, no_per_session_save):
+    adapter = TrainingAdapter(db=db)
+    assert await adapter.save_sessions(user_id=user_id, sessions=[_session(1), _session(2), _session(3)]) == 3
+    assert len(commits) == 1
+    assert await _count(db, TrainSession) == 3
+    assert await _count(db, TrainSessionLap) == 3
+    assert await _count(db, PersonalRecord) == 1
+
+
+async def test_duplicate_retries_remaining_sessions_as_one_bulk(db, user_id, commits, no_per_session_save):
+    adapter = TrainingAdapter(db=db)
+    # 다른 sync 가 먼저 저장한 활동
+    assert await adapter.save_sessions(user_id=user_id, sessions=[_session(2)]) == 1
+    commits.clear()
+
+    assert await adapter.save_sessions(user_id=user_id,
+                                       sessions=[_session(1), _session(2, five_k=1400.0), _session(3)]) == 2
+    assert len(commits) == 1  # 실패한 일괄 저장은 rollback, 재시도 1회만 commit
+    assert sorted((await db.execute(select(TrainSession.activity_id))).scalars().all()) == [1, 2, 3]
+    # 중복 활동의 기록은 반영되지 않음
+    assert (await db.execute(select(PersonalRecord.elapsed_time))).scalar_one() == 1500.0
+
+
+async def test_all_duplicates_saves_nothing(db, user_id):
+    adapter = TrainingAdapter(db=db)
+    await adapter.save_sessions(user_id=user_id, sessions=[_session(1), _session(2)])
+    assert await adapter.save_sessions(user_id=user_id, sessions=[_session(1), _session(2)]) == 0
+    assert await _count(db, TrainSession) == 2
+
+
+async def test_duplicate_owned_by_another_user_is_raised(db, user_id):
+    other = uuid4()
+    await db.execute(User.__table__.insert(), [{"id": other, "email": "b@test.com", "name": "b",
+                                                "created_at": TRAIN_DATE, "provider": "local"}])
+    await db.commit()
+    adapter = TrainingAdapter(db=db)
+    await adapter.save_sessions(user_id=other, sessions=[_session(1)])
+
+    with pytest.raises(DuplicateError):
+        await adapter.save_sessions(user_id=user_id, sessions=[_session(1), _session(2)])
+    assert await _count(db, TrainSession) == 1
+
+
+async def test_personal_record_violation_is_not_a_duplicate(db, user_id, monkeypatch):
+    adapter = TrainingAdapter(db=db)
+    await adapter.save_sessions(user_id=user_id, sessions=[_session(1)])
+
+    # 기존 기록을 못 본 채로 같은 (사용자, 거리, 연도) 기록 추가 (동시 갱신 경합)
+    async def racing_merge(db, user_id, candidates):
+        for session_id, train_date, efforts in candidates:
+            for distance, elapsed in efforts.items():
+                db.add(PersonalRecord(user_id=user_id, session_id=session_id, distance=distance,
+                                      year=train_date.year, elapsed_time=elapsed, train_date=train_date))
+    monkeypatch.setattr(activity_repo, "merge_personal_records", racing_merge)
+
+    with pytest.raises(DBError):
+        await adapter.save_sessions(user_id=user_id, sessions=[_session(2, five_k=1400.0)])
+    assert await _count(db, TrainSession) == 1
+    assert await _count(db, PersonalRecord) == 1
+
+
+class _Cause(Exception):
+    def __init__(self, constraint_name):
+        self.constraint_name = constraint_name
+
+
+@pytest.mark.parametrize("constraint, duplicate", [
+    ("uq_provider_activity", True),
+    ("uq_user_distance_year", False),
+])
+def test_constraint_name_from_driver_exception(constraint, duplicate):
+    # asyncpg: dbapi 예외의 원인 (__cause__) 에 constraint_name
+    orig = Exception("duplicate key value violates unique constraint")
+    orig.__cause__ = _Cause(constraint)
+    e = IntegrityError("INSERT ...", {}, orig)
+    assert activity_repo._violated_constraint(e) == constraint
+    assert activity_repo._is_duplicate_session(e) is duplicate
@@ -0,0 +1,159 @@
+"""
+모듈 레벨 bindparam statement vs 호출마다 select() 를 새로 만드는 기존 방식 비교
+
+- 동등성: 두 방식이 같은 결과를 돌려주는지 (항상 실행)
+- 마이크로 벤치마크: RUN_BENCHMARK=1 일 때만 실행 (CI 타이밍 흔들림 방지)
+    RUN_BENCHMARK=1 python -m pytest -q -s tests/test_statement_benchmark.py
+"""
+import os
+import timeit
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, select, and_, exists, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from sqlmodel import SQLModel
+
+from infra.db.orm.models import User, TrainSession, Feed, FeedLikes
+from infra.db.storage import activity_repo, feed_repo
+
+PAGE = 21
+
+
+# ------------------------
+# 기존 방식 (호출마다 구문 생성)
+# ------------------------
+def _inline_sessions_by_date(user_id, start_date):
+    return (
+        select(TrainSession)
+        .where(TrainSession.user_id == user_id, TrainSession.train_date >= start_date)
+        .order_by(TrainSession.train_date)
+    )
+
+
+def _inline_feed_page(user_id, limit, cursor=None):
+    stmt = (
+        select(
+            Feed,
+            Feed.likes_count,
+            exists().where(and_(FeedLikes.feed_id == Feed.id, FeedLikes.user_id == user_id)).label("my_like"),
+            User.name.label("user_name")
+        )
+        .join(User, User.id == Feed.user_id)
+    )
+    if cursor is not None:
+        stmt = stmt.where(tuple_(Feed.created_at, Feed.id) < tuple_(*cursor))
+    return stmt.order_by(Feed.created_at.desc(), Feed.id.desc()).limit(limit)
+
+
+def _inline_liked_feed_ids(user_id, feed_ids):
+    return select(FeedLikes.feed_id).where(and_(FeedLikes.user_id == user_id, FeedLikes.feed_id.in_(feed_ids)))
+
+
+# ------------------------
+# 케이스: (이름, 기존 방식 실행, 모듈 레벨 실행)
+# ------------------------
+def _cases(ids):
+    user_id, start_date = ids["user_id"], ids["start_date"]
+    cursor = (ids["cursor"]["created_at"], ids["cursor"]["id"])
+    feed_ids = ids["feed_ids"]
+    return [
+        ("sessions_by_date",
+         lambda s: s.execute(_inline_sessions_by_date(user_id, start_date)).scalars().all(),
+         lambda s: s.execute(activity_repo._SESSIONS_BY_DATE,
+                             {"user_id": user_id, "start_date": start_date}).scalars().all()),
+        ("feed_first_page",
+         lambda s: s.execute(_inline_feed_page(user_id, PAGE)).all(),
+         lambda s: s.execute(feed_repo._FEED_FIRST_PAGE, {"user_id": user_id, "limit": PAGE}).all()),
+        ("feed_next_page",
+         lambda s: s.execute(_inline_feed_page(user_id, PAGE, cursor)).all(),
+         lambda s: s.execute(feed_repo._FEED_NEXT_PAGE,
+                             {"user_id": user_id, "limit": PAGE,
+                              "cursor_created_at": cursor[0], "cursor_id": cursor[1]}).all()),
+        ("liked_feed_ids",
+         lambda s: set(s.execute(_inline_liked_feed_ids(user_id, feed_ids)).scalars().all()),
+         lambda s: set(s.execute(feed_repo._LIKED_FEED_IDS,
+                                 {"user_id": user_id, "feed_ids": feed_ids}).scalars().all())),
+    ]
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    now = datetime.now(timezone.utc)
+    users = [{"id": uuid4(), "email": f"user{i}@test.com", "name": f"user{i}", "created_at": now, "provider": "local"}
+             for i in range(10)]
+    sessions = [{"id": uuid4(), "user_id": user["id"], "provider": "strava", "activity_id": n * 100 + d,
+                 "created_at": now, "train_date": now - timedelta(days=d), "distance": 5000.0}
+                for n, user in enumerate(users) for d in range(30)]
+    feeds = [{"id": uuid4(), "user_id": users[i % len(users)]["id"], "created_at": now - timedelta(minutes=i),
+              "train_date": now, "title": "t", "train_summary": "s", "likes_count": 0}
+             for i in range(200)]
+    likes = [{"id": uuid4(), "feed_id": feed["id"], "user_id": users[0]["id"], "created_at": now}
+             for feed in feeds[::3]]
+    with engine.begin() as conn:
+        for model, rows in ((User, users), (TrainSession, sessions), (Feed, feeds), (FeedLikes, likes)):
+            conn.execute(model.__table__.insert(), rows)
+
+    ids = {
+        "user_id": users[0]["id"],
+        "start_date": now - timedelta(days=14),
+        "cursor": feeds[PAGE - 1],
+        "feed_ids": [feed["id"] for feed in feeds[:PAGE]],
+    }
+    yield engine, ids
+    engine.dispose()
+
+
+def _plain(rows):
+    """ORM 인스턴스는 식별자로 비교"""
+    if isinstance(rows, set):
+        return rows
+    return [tuple(getattr(c, "id", c) for c in row) if isinstance(row, Row) else row.id for row in rows]
+
+
+def test_module_statements_match_inline(seeded):
+    engine, ids = seeded
+    for name, inline, module in _cases(ids):
+        with Session(engine) as s:
+            expected = _plain(inline(s))
+        with Session(engine) as s:
+            assert _plain(module(s)) == expected, name
+        assert expected, name
+
+
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARK"), reason="RUN_BENCHMARK 없음 (마이크로 벤치마크 생략)")
+def test_benchmark_module_statements(seeded):
+    """
+    build : 구문 생성 + 캐시 키 계산 (execute 가 DB 에 가기 전 매 호출 지불하는 비용)
+    exec  : sqlite 메모리 DB 에서 ORM Session.execute 왕복
+    """
+    engine, ids = seeded
+    number, repeat = 500, 5
+    build_cases = {
+        "sessions_by_date": (lambda: _inline_sessions_by_date(ids["user_id"], ids["start_date"]),
+                             activity_repo._SESSIONS_BY_DATE),
+        "feed_first_page": (lambda: _inline_feed_page(ids["user_id"], PAGE), feed_repo._FEED_FIRST_PAGE),
+        "feed_next_page": (lambda: _inline_feed_page(ids["user_id"], PAGE,
+                                                     (ids["cursor"]["created_at"], ids["cursor"]["id"])),
+                           feed_repo._FEED_NEXT_PAGE),
+        "liked_feed_ids": (lambda: _inline_liked_feed_ids(ids["user_id"], ids["feed_ids"]),
+                           feed_repo._LIKED_FEED_IDS),
+    }
+
+    def best(fn):
+        return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6  # us/call
+
+    print(f"\n{'query':<18}{'build inline':>14}{'build module':>14}{'exec inline':>13}{'exec module':>13}")
+    with Session(engine) as s:
+        for name, inline, module in _cases(ids):
+            build_inline, stmt = build_cases[name]
+            b_inline = best(lambda: build_inline()._generate_cache_key())
+            b_module = best(lambda: stmt._generate_cache_key())
+            e_inline = best(lambda: inline(s))
+            e_module = best(lambda: module(s))
+            print(f"{name:<18}{b_inline:>12.1f}us{b_module:>12.1f}us{e_inline:>11.1f}us{e_module:>11.1f}us")
+            assert b_module < b_inline, name
@@ -0,0 +1,172 @@
+"""
+strava 토큰 캐시 테스트 (sqlite 파일 db + fakeredis)
+- 조회 순서: 프로세스 캐시 -> redis (암호화 값 복호화) -> db
+- 무효화: 연결 해제 (db 토큰 삭제), 갱신 실패시 두 단계 모두 삭제
+"""
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import fakeredis
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlmodel import SQLModel
+
+from adapters import StravaAdapter, StravaTokenCacheAdapter
+from adapters import token_cache_adapter
+from infra.db.orm.models import User, ThirdPartyToken
+from infra.security import encrypt_token
+from use_cases.auth import auth_strava
+from use_cases.auth.auth_strava import StravaHandler
+from schemas.models import TokenPayload
+from config.settings import strava, security
+from config.exceptions import InternalError, NotFoundError
+
+pytestmark = pytest.mark.anyio
+
+
+def _encrypt(value:str) -> str:
+    return encrypt_token(data=value, key=security.encryption_key_strava, token_type="strava_access")
+
+
+@pytest.fixture
+async def env(tmp_path, monkeypatch):
+    """(session_factory, user_id, redis, db 조회 횟수)"""
+    token_cache_adapter._local.clear()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'token.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    user_id = uuid4()
+    async with engine.begin() as conn:
+        await conn.execute(User.__table__.insert(), [{"id": user_id, "email": "a@test.com", "name": "a",
+                                                      "created_at": datetime.now(timezone.utc),
+                                                      "provider": "local"}])
+        await conn.execute(ThirdPartyToken.__table__.insert(), [{
+            "id": uuid4(), "user_id": user_id, "provider": "strava", "provider_user_id": "1",
+            "access_token": _encrypt("access-1"), "refresh_token": _encrypt("refresh-1"),
+            "expires_at": int(time.time()) + 6 * 3600}])
+
+    db_reads = []
+    get_token = auth_strava.get_third_party_token_by_user_id
+
+    async def counting_get_token(**kwargs):
+        db_reads.append(kwargs["user_id"])
+        return await get_token(**kwargs)
+    monkeypatch.setattr(auth_strava, "get_third_party_token_by_user_id", counting_get_token)
+
+    yield async_sessionmaker(engine, expire_on_commit=False), user_id, fakeredis.FakeAsyncRedis(decode_responses=True), db_reads
+    token_cache_adapter._local.clear()
+    await engine.dispose()
+
+
+class _Strava:
+    def __init__(self, fail:bool = False):
+        self.fail = fail
+
+    async def is_token_expired(self, expires_at:int) -> bool:
+        return expires_at - strava.token_refresh_margin <= int(time.time())
+
+    async def refresh_token(self, refresh_token:str) -> dict:
+        if self.fail:
+            raise InternalError(context="strava refresh 400")
+        return {"access_token": "access-2", "refresh_token": "refresh-2", "expires_at": int(time.time()) + 6 * 3600}
+
+
+async def _get(db, adapter, redis, user_id) -> str:
+    handler = StravaHandler(db=db, adapter=adapter, token_cache=StravaTokenCacheAdapter(db=redis))
+    return await handler.get_access_and_refresh_if_expired(payload=TokenPayload(user_id=user_id, exp=0, iat=0))
+
+
+async def test_read_through_local_redis_db(env):
+    session_factory, user_id, redis, db_reads = env
+    cache = StravaTokenCacheAdapter(db=redis)
+    async with session_factory() as db:
+        # 캐시 없음 -> db 에서 읽고 두 단계 모두 채움
+        assert await _get(db, _Strava(), redis, user_id) == "access-1"
+        assert len(db_reads) == 1
+        assert user_id in token_cache_adapter._local
+        stored = await redis.hgetall(cache._key(user_id))
+        assert stored["access_token"] != "access-1"  # redis 에는 암호화된 값만
+        assert 0 < await redis.ttl(cache._key(user_id)) <= 6 * 3600 - strava.token_refresh_margin
+
+        # 프로세스 캐시 hit
+        assert await _get(db, _Strava(), redis, user_id) == "access-1"
+        # 프로세스 캐시 미스 (다른 replica / 로컬 ttl 만료) -> redis 값 복호화, 프로세스 캐시 다시 채움
+        token_cache_adapter._local.clear()
+        assert await _get(db, _Strava(), redis, user_id) == "access-1"
+        assert user_id in token_cache_adapter._local
+        assert len(db_reads) == 1
+
+        # 두 단계 모두 미스 -> db
+        token_cache_adapter._local.clear()
+        await redis.delete(cache._key(user_id))
+        assert await _get(db, _Strava(), redis, user_id) == "access-1"
+        assert len(db_reads) == 2
+
+
+async def test_token_inside_refresh_margin_is_not_cached(env):
+    _, user_id, redis, _ = env
+    cache = StravaTokenCacheAdapter(db=redis)
+    await cache.set(user_id=user_id, access_token="access-1", encrypted_access=_encrypt("access-1"),
+                    expires_at=int(time.time()) + 6 * 3600)
+    # 갱신 시점이 지난 토큰을 저장하면 이전 값도 삭제
+    await cache.set(user_id=user_id, access_token="access-0", encrypted_access=_encrypt("access-0"),
+                    expires_at=int(time.time()) + strava.token_refresh_margin // 2)
+    assert user_id not in token_cache_adapter._local
+    assert not await redis.exists(cache._key(user_id))
+    assert await cache.get(user_id) is None
+
+
+async def test_disconnect_invalidates_both_tiers(env):
+    session_factory, user_id, redis, _ = env
+    cache = StravaTokenCacheAdapter(db=redis)
+    posted = []
+
+    def deauthorize(request:httpx.Request):
+        posted.append(request.headers["Authorization"])
+        return httpx.Response(200, json={})
+
+    async with session_factory() as db, httpx.AsyncClient(transport=httpx.MockTransport(deauthorize)) as client:
+        adapter = StravaAdapter(db=db, client=client, rate_limiter=object())
+        assert await _get(db, adapter, redis, user_id) == "access-1"
+
+        handler = StravaHandler(db=db, adapter=adapter, token_cache=cache)
+        await handler.disconnect(payload=TokenPayload(user_id=user_id, exp=0, iat=0))
+
+        assert posted == ["Bearer access-1"]  # strava 에는 복호화된 토큰으로 해제 요청
+        assert user_id not in token_cache_adapter._local
+        assert not await redis.exists(cache._key(user_id))
+        # 삭제된 토큰을 캐시에서 돌려주지 않음
+        with pytest.raises(NotFoundError):
+            await _get(db, adapter, redis, user_id)
+
+
+async def test_refresh_failure_invalidates_both_tiers(env):
+    session_factory, user_id, redis, _ = env
+    cache = StravaTokenCacheAdapter(db=redis)
+    async with session_factory() as db:
+        assert await _get(db, _Strava(), redis, user_id) == "access-1"
+
+        # strava 에서 연결이 끊겨 갱신 실패 (리프레시 토큰 폐기) -> 같은 권한의 액세스 토큰도 캐시에서 제거
+        handler = StravaHandler(db=db, adapter=_Strava(fail=True), token_cache=cache)
+        token = await handler._get_token(user_id=user_id)
+        with pytest.raises(InternalError):
+            await handler._refresh(user_id=user_id, token=token)
+        assert user_id not in token_cache_adapter._local
+        assert not await redis.exists(cache._key(user_id))
+
+
+async def test_refresh_replaces_both_tiers(env):
+    session_factory, user_id, redis, db_reads = env
+    cache = StravaTokenCacheAdapter(db=redis)
+    async with session_factory() as db:
+        assert await _get(db, _Strava(), redis, user_id) == "access-1"
+        handler = StravaHandler(db=db, adapter=_Strava(), token_cache=cache)
+        assert await handler._refresh(user_id=user_id, token=await handler._get_token(user_id=user_id)) == "access-2"
+
+        reads = len(db_reads)
+        assert await _get(db, _Strava(), redis, user_id) == "access-2"
+        token_cache_adapter._local.clear()
+        assert await _get(db, _Strava(), redis, user_id) == "access-2"
+        assert len(db_reads) == reads
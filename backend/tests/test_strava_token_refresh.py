@@ -0,0 +1,143 @@
+"""
+strava 액세스 토큰 갱신 테스트 (sqlite 파일 db + fakeredis)
+- 만료 임박 (margin 안, 아직 유효): 현재 토큰 바로 반환, 백그라운드에서 사용자당 한번만 갱신
+- 실제 만료: 동시 요청 모두 갱신을 기다리고 strava 갱신 호출은 한번 (single-flight)
+"""
+import asyncio
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import fakeredis
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlmodel import SQLModel
+
+from adapters import StravaTokenCacheAdapter
+from adapters import token_cache_adapter
+from infra.db.orm.models import User, ThirdPartyToken
+from infra.db.storage.third_party_token_repo import get_third_party_token_by_user_id
+from infra.security import encrypt_token
+from use_cases.auth import auth_strava
+from use_cases.auth.auth_strava import StravaHandler
+from schemas.models import TokenPayload
+from config.settings import strava, security
+
+pytestmark = pytest.mark.anyio
+
+CALLERS = 10
+
+
+class _Strava:
+    """strava 갱신 api. release 될 때까지 응답 지연"""
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def is_token_expired(self, expires_at:int) -> bool:
+        return expires_at - strava.token_refresh_margin <= int(time.time())
+
+    async def refresh_token(self, refresh_token:str) -> dict:
+        self.calls += 1
+        await self.release.wait()
+        return {"access_token": f"new-{self.calls}", "refresh_token": "refresh-2",
+                "expires_at": int(time.time()) + 6 * 3600}
+
+
+def _encrypt(value:str, token_type:str) -> str:
+    return encrypt_token(data=value, key=security.encryption_key_strava, token_type=token_type)
+
+
+@pytest.fixture
+async def env(tmp_path):
+    """(session_factory, user_id, insert_token)"""
+    token_cache_adapter._local.clear()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'token.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    user_id = uuid4()
+
+    async def insert_token(expires_at:int):
+        async with engine.begin() as conn:
+            await conn.execute(User.__table__.insert(), [{"id": user_id, "email": "a@test.com", "name": "a",
+                                                          "created_at": datetime.now(timezone.utc),
+                                                          "provider": "local"}])
+            await conn.execute(ThirdPartyToken.__table__.insert(), [{
+                "id": uuid4(), "user_id": user_id, "provider": "strava", "provider_user_id": "1",
+                "access_token": _encrypt("old", "strava_access"),
+                "refresh_token": _encrypt("refresh-1", "strava_access"),
+                "expires_at": expires_at}])
+
+    yield session_factory, user_id, insert_token
+    for task in list(auth_strava._background_refreshes.values()):
+        task.cancel()
+    token_cache_adapter._local.clear()
+    await engine.dispose()
+
+
+async def _call(session_factory, strava_api, cache, user_id) -> str:
+    """요청 하나 (요청마다 db 세션)"""
+    async with session_factory() as db:
+        handler = StravaHandler(db=db, adapter=strava_api, token_cache=cache, session_factory=session_factory)
+        return await handler.get_access_and_refresh_if_expired(payload=TokenPayload(user_id=user_id, exp=0, iat=0))
+
+
+async def test_expiring_token_is_returned_and_refreshed_in_background(env):
+    session_factory, user_id, insert_token = env
+    await insert_token(expires_at=int(time.time()) + strava.token_refresh_margin // 2)
+    strava_api, cache = _Strava(), StravaTokenCacheAdapter(db=fakeredis.FakeAsyncRedis(decode_responses=True))
+
+    # 갱신 응답이 오기 전에도 모든 요청이 현재 토큰으로 바로 응답
+    results = await asyncio.gather(*(_call(session_factory, strava_api, cache, user_id) for _ in range(CALLERS)))
+    assert results == ["old"] * CALLERS
+
+    task = auth_strava._background_refreshes[user_id]
+    await asyncio.sleep(0.05)
+    assert strava_api.calls == 1
+    strava_api.release.set()
+    await task
+
+    assert strava_api.calls == 1
+    assert user_id not in auth_strava._background_refreshes
+    async with session_factory() as db:
+        token = await get_third_party_token_by_user_id(user_id=user_id, provider="strava", db=db)
+    assert token.expires_at > int(time.time()) + strava.token_refresh_margin
+    # 이후 요청은 캐시된 새 토큰
+    assert await _call(session_factory, strava_api, cache, user_id) == "new-1"
+    assert strava_api.calls == 1
+
+
+async def test_expired_token_blocks_until_single_refresh(env):
+    session_factory, user_id, insert_token = env
+    await insert_token(expires_at=int(time.time()) - 10)
+    strava_api, cache = _Strava(), StravaTokenCacheAdapter(db=fakeredis.FakeAsyncRedis(decode_responses=True))
+
+    callers = [asyncio.create_task(_call(session_factory, strava_api, cache, user_id)) for _ in range(CALLERS)]
+    await asyncio.sleep(0.05)
+    # 만료된 토큰은 반환하지 않고 갱신을 기다림
+    assert not any(c.done() for c in callers)
+    assert strava_api.calls == 1
+
+    strava_api.release.set()
+    assert await asyncio.gather(*callers) == ["new-1"] * CALLERS
+    assert strava_api.calls == 1
+    assert not auth_strava._background_refreshes
+
+
+async def test_background_refresh_failure_keeps_serving_valid_token(env):
+    session_factory, user_id, insert_token = env
+    await insert_token(expires_at=int(time.time()) + strava.token_refresh_margin // 2)
+    strava_api, cache = _Strava(), StravaTokenCacheAdapter(db=fakeredis.FakeAsyncRedis(decode_responses=True))
+
+    async def failing_refresh(refresh_token):
+        strava_api.calls += 1
+        raise RuntimeError("strava down")
+    strava_api.refresh_token = failing_refresh
+
+    assert await _call(session_factory, strava_api, cache, user_id) == "old"
+    await auth_strava._background_refreshes[user_id]
+    # 실패는 로그만. 다음 요청도 현재 토큰으로 응답하고 다시 백그라운드 갱신 시도
+    assert await _call(session_factory, strava_api, cache, user_id) == "old"
+    await auth_strava._background_refreshes[user_id]
+    assert strava_api.calls == 2
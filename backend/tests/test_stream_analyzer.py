@@ -0,0 +1,207 @@
+"""
+스트림 지표 정확도 + 10k 샘플 분석 시간
+
+- 마이크로 벤치마크: RUN_BENCHMARK=1 일 때만 실행 (CI 타이밍 흔들림 방지)
+    RUN_BENCHMARK=1 python -m pytest -q -s tests/test_stream_analyzer.py
+"""
+import os
+import timeit
+
+import numpy as np
+import pytest
+
+from domains.stream_analyzer import StreamAnalyzer
+from schemas.models import StreamData, UserInfoData
+from infra.stream_codec import stream_to_arrays
+from use_cases.train_session.handle_train_session import TrainSessionHandler
+
+
+def _minetti(grade:float) -> float:
+    """Minetti 2002 에너지 비용 (J/kg/m)"""
+    return 155.4 * grade**5 - 30.4 * grade**4 - 43.3 * grade**3 + 46.3 * grade**2 + 19.5 * grade + 3.6
+
+
+@pytest.fixture
+def analyzer():
+    return StreamAnalyzer(max_hr=190)
+
+
+@pytest.fixture
+def steady_run():
+    """4 m/s 로 3000초 (12km) 평지"""
+    t = np.arange(3001, dtype=np.float64)
+    return t, t * 4.0
+
+
+def test_best_efforts_constant_pace(analyzer, steady_run):
+    t, d = steady_run
+    assert analyzer.best_efforts(t, d) == {"1k": 250.0, "5k": 1250.0, "10k": 2500.0}
+
+
+def test_best_efforts_picks_fastest_segment(analyzer):
+    # 앞 1km 는 5 m/s, 이후 2 m/s
+    t = np.arange(1201, dtype=np.float64)
+    d = np.where(t <= 200, t * 5.0, 1000 + (t - 200) * 2.0)
+    assert analyzer.best_efforts(t, d)["1k"] == 200.0
+
+
+def test_best_efforts_skips_unreached_distance(analyzer):
+    t = np.arange(100, dtype=np.float64)
+    assert analyzer.best_efforts(t, t * 4.0) is None
+
+
+def test_best_efforts_ignores_gps_dips(analyzer, steady_run):
+    t, d = steady_run
+    d = d.copy()
+    d[100] = 0.0  # 튄 값 (누적거리 감소). 직전 값으로 보정되어 샘플 1개 이내 오차
+    assert analyzer.best_efforts(t, d)["1k"] == pytest.approx(250.0, abs=1.0)
+
+
+def test_minetti_cost_is_normalized_to_flat():
+    assert _minetti(0.0) / 3.6 == pytest.approx(1.0)
+
+
+def test_gap_flat_equals_actual_pace(analyzer, steady_run):
+    t, d = steady_run
+    assert analyzer.grade_adjusted_pace(t, d, np.zeros_like(d)) == pytest.approx(250.0)
+
+
+def test_gap_uphill_uses_minetti_cost(analyzer, steady_run):
+    t, d = steady_run
+    grade = 0.1
+    gap = analyzer.grade_adjusted_pace(t, d, d * grade)
+    assert gap == pytest.approx(250.0 / (_minetti(grade) / 3.6))
+    assert gap < 250.0  # 오르막은 같은 시간이면 더 빠른 평지 페이스
+
+
+def test_gap_clips_extreme_grade(analyzer, steady_run):
+    t, d = steady_run
+    clipped = analyzer.grade_adjusted_pace(t, d, d * 1.0)
+    assert clipped == pytest.approx(250.0 / (_minetti(StreamAnalyzer.MAX_GRADE) / 3.6))
+
+
+def test_gap_requires_movement(analyzer):
+    t = np.arange(10, dtype=np.float64)
+    assert analyzer.grade_adjusted_pace(t, np.zeros(10), np.zeros(10)) is None
+
+
+def test_hr_zone_times(analyzer):
+    t = np.arange(601, dtype=np.float64)
+    hr = np.where(t <= 300, 0.65 * 190, 0.85 * 190)
+    zones = analyzer.hr_zone_times(t, hr)
+    assert zones == pytest.approx([0.0, 300.0, 0.0, 300.0, 0.0])
+    assert sum(zones) == pytest.approx(t[-1] - t[0])
+
+
+def test_analyze_misaligned_channels_returns_none(analyzer):
+    metrics = analyzer.analyze(StreamData(time=[0, 1, 2], distance=[0, 4], heartrate=None))
+    assert metrics.best_efforts is None
+    assert metrics.gap is None
+    assert metrics.hr_zones is None
+
+
+def test_hr_zone_times_uses_given_max_hr(analyzer):
+    t = np.arange(601, dtype=np.float64)
+    hr = np.full(601, 0.65 * 190)
+    # 최대심박 170 기준 0.73 -> 존3
+    assert analyzer.hr_zone_times(t, hr, max_hr=170) == pytest.approx([0.0, 0.0, 600.0, 0.0, 0.0])
+    assert analyzer.analyze({"time": t, "heartrate": hr}, max_hr=170).hr_zones == pytest.approx(
+        [0.0, 0.0, 600.0, 0.0, 0.0])
+
+
+def test_estimate_max_hr_from_age():
+    assert StreamAnalyzer.estimate_max_hr(40) == 180
+    assert StreamAnalyzer.estimate_max_hr(None) is None
+    assert StreamAnalyzer.estimate_max_hr(0) is None
+
+
+class _AccountAdapter:
+    def __init__(self, info):
+        self.info = info
+
+    async def get_user_info_by_id(self, user_id):
+        return self.info
+
+
+@pytest.mark.anyio
+async def test_sync_max_hr_comes_from_user_info():
+    def handler(info):
+        return TrainSessionHandler(data_adapter=None, db_adapter=None, redis_adapter=None, auth_handler=None,
+                                   account_adapter=_AccountAdapter(info))
+    assert await handler(UserInfoData(age=40))._get_max_hr(user_id=None) == 180
+    assert await handler(UserInfoData())._get_max_hr(user_id=None) is None
+    assert await handler(None)._get_max_hr(user_id=None) is None
+
+
+# ------------------------
+# 10k 샘플 (약 2시간 45분 1Hz 기록)
+# ------------------------
+def _long_run(n:int = 10000) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(0)
+    t = np.arange(n, dtype=np.float64)
+    velocity = 3.0 + 0.3 * np.sin(t / 100)
+    return {
+        "time": t,
+        "distance": np.cumsum(velocity),
+        "heartrate": 140 + 20 * np.sin(t / 500) + rng.normal(0, 2, n),
+        "velocity": velocity,
+        "altitude": 50 + np.cumsum(rng.normal(0, 0.1, n)),
+        "cadence": 176 + rng.normal(0, 4, n),
+    }
+
+
+def _searchsorted_best_efforts(time, distance, targets):
+    """기존 방식: 목표거리마다 모든 시작점에서 도달 샘플을 이진탐색 (샘플 단위)"""
+    distance = np.maximum.accumulate(distance)
+    res = {}
+    for name, target in targets.items():
+        end = np.searchsorted(distance, distance + target, side="left")
+        valid = end < distance.size
+        res[name] = float(np.min(time[end[valid]] - time[valid]))
+    return res
+
+
+def test_analyze_arrays_match_stream_data(analyzer):
+    arrays = _long_run()
+    stream = StreamData(**{name: arr.tolist() for name, arr in arrays.items()})
+    assert analyzer.analyze(arrays) == analyzer.analyze(stream)
+    assert analyzer.analyze(stream_to_arrays(stream)) == analyzer.analyze(stream)
+
+
+def test_best_efforts_within_one_sample_of_searchsorted(analyzer):
+    arrays = _long_run()
+    expected = _searchsorted_best_efforts(arrays["time"], arrays["distance"], analyzer.BEST_EFFORTS)
+    got = analyzer.best_efforts(arrays["time"], arrays["distance"])
+    assert got.keys() == expected.keys()
+    for name in expected:
+        # 보간한 도달 시각은 도달 샘플 시각 이하, 1초(샘플 간격) 이내
+        assert expected[name] - 1.0 <= got[name] <= expected[name]
+
+
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARK"), reason="RUN_BENCHMARK 없음 (마이크로 벤치마크 생략)")
+def test_benchmark_analyze_10k(analyzer):
+    """
+    arrays     : stream_to_arrays 결과를 그대로 분석 (sync 경로)
+    StreamData : list -> ndarray 변환 포함
+    """
+    arrays = _long_run()
+    stream = StreamData(**{name: arr.tolist() for name, arr in arrays.items()})
+    number, repeat = 200, 5
+
+    def best(fn):
+        return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e3  # ms/call
+
+    t, d = arrays["time"], arrays["distance"]
+    res = {
+        "analyze(arrays)": best(lambda: analyzer.analyze(arrays)),
+        "analyze(StreamData)": best(lambda: analyzer.analyze(stream)),
+        "best_efforts": best(lambda: analyzer.best_efforts(t, d)),
+        "best_efforts(searchsorted)": best(lambda: _searchsorted_best_efforts(t, d, analyzer.BEST_EFFORTS)),
+        "hr_zone_times": best(lambda: analyzer.hr_zone_times(t, arrays["heartrate"])),
+        "grade_adjusted_pace": best(lambda: analyzer.grade_adjusted_pace(t, d, arrays["altitude"])),
+    }
+    print()
+    for name, ms in res.items():
+        print(f"{name:<28}{ms:>8.3f}ms")
+    assert res["best_efforts"] < res["best_efforts(searchsorted)"]
+    assert res["analyze(arrays)"] < 1.0
@@ -0,0 +1,64 @@
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from infra.stream_codec import (encode_stream_arrays, decode_stream_arrays, encode_stream, decode_stream,
+                                MAGIC, FORMAT_VERSION)
+from schemas.models import StreamData
+
+
+def _sample_stream(n:int = 120) -> StreamData:
+    t = np.arange(n, dtype=np.float64)
+    return StreamData(
+        time=t.tolist(),
+        distance=(t * 3.1).tolist(),
+        heartrate=(140 + np.sin(t / 10) * 10).round().tolist(),
+        cadence=np.full(n, 88.0).tolist(),
+        velocity=np.full(n, 3.1).tolist(),
+        altitude=(50 + np.cos(t / 20) * 5).tolist(),
+    )
+
+
+def test_round_trip_within_quantization():
+    stream = _sample_stream()
+    decoded = decode_stream_arrays(encode_stream(stream))
+
+    assert set(decoded) == {"time", "distance", "heartrate", "cadence", "velocity", "altitude"}
+    np.testing.assert_allclose(decoded["time"], stream.time)
+    np.testing.assert_allclose(decoded["heartrate"], stream.heartrate)
+    # 채널별 양자화 단위 (0.1 m, 0.01 m/s) 이내
+    np.testing.assert_allclose(decoded["distance"], stream.distance, atol=0.05)
+    np.testing.assert_allclose(decoded["altitude"], stream.altitude, atol=0.05)
+    np.testing.assert_allclose(decoded["velocity"], stream.velocity, atol=0.005)
+
+
+def test_delta_channels_do_not_accumulate_error():
+    """누적 채널은 delta 전에 양자화하므로 오차가 길이에 비례해 커지지 않음"""
+    distance = np.cumsum(np.full(10_000, 2.37))
+    decoded = decode_stream_arrays(encode_stream_arrays({"distance": distance}))
+    assert np.max(np.abs(decoded["distance"] - distance)) <= 0.05
+
+
+def test_missing_channels_are_omitted():
+    decoded = decode_stream(encode_stream(StreamData(time=[0, 1, 2], heartrate=[120, 121, 122])))
+    assert decoded.time == [0, 1, 2]
+    assert decoded.heartrate == [120, 121, 122]
+    assert decoded.distance is None
+
+
+def test_empty_stream():
+    assert decode_stream_arrays(encode_stream_arrays({})) == {}
+
+
+def test_rejects_unknown_magic():
+    blob = encode_stream(_sample_stream(10))
+    with pytest.raises(ValueError, match="invalid stream blob"):
+        decode_stream_arrays(b"XXXX" + blob[4:])
+
+
+def test_rejects_unknown_version():
+    header = struct.pack("<4sBB", MAGIC, FORMAT_VERSION + 1, 0)
+    with pytest.raises(ValueError, match="unsupported stream format version"):
+        decode_stream_arrays(header + zlib.compress(b""))
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from uuid import uuid4
+
+from domains.stream_downsampler import lttb_indices, downsample_stream
+
+
+def _arrays(n:int = 2000) -> dict:
+    t = np.arange(n, dtype=np.float64)
+    rng = np.random.default_rng(0)
+    return {
+        "time": t,
+        "heartrate": 140 + 10 * np.sin(t / 50) + rng.normal(0, 1, n),
+        "velocity": 3 + 0.5 * np.cos(t / 30),
+        "altitude": 50 + np.cumsum(rng.normal(0, 0.1, n)),
+        "cadence": np.full(n, 88.0),
+        "distance": t * 3.0,
+    }
+
+
+def test_lttb_keeps_endpoints_and_size():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.sin(x / 20)
+    idx = lttb_indices(x, y, 100)
+    assert idx.size == 100
+    assert idx[0] == 0 and idx[-1] == 999
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_keeps_peak():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.zeros(1000)
+    y[537] = 100.0
+    assert 537 in lttb_indices(x, y, 50)
+
+
+@pytest.mark.parametrize("threshold", [2, 1000, 5000])
+def test_lttb_returns_all_when_not_reducing(threshold):
+    x = np.arange(1000, dtype=np.float64)
+    assert lttb_indices(x, x, threshold).size == 1000
+
+
+@pytest.mark.parametrize("points", [2, 3, 5, 10, 17, 18, 100, 300, 500])
+def test_downsample_exact_size_and_keeps_endpoints(points):
+    arrays = _arrays()
+    res = downsample_stream(arrays, points)
+    sizes = {v.size for v in res.values()}
+    assert sizes == {points}
+    assert np.all(np.diff(res["time"]) > 0)
+    np.testing.assert_array_equal(res["time"][[0, -1]], arrays["time"][[0, -1]])
+
+
+def test_downsample_exact_size_when_channel_indices_overlap():
+    """평평한 채널은 LTTB 인덱스가 서로 겹쳐 합집합이 작아짐 -> 채워서 요청 수 맞춤"""
+    n = 5000
+    t = np.arange(n, dtype=np.float64)
+    arrays = {"time": t, "heartrate": np.full(n, 150.0), "cadence": np.full(n, 88.0), "velocity": np.full(n, 3.0)}
+    assert downsample_stream(arrays, 300)["time"].size == 300
+
+
+def test_downsample_noop_when_short():
+    arrays = _arrays(50)
+    assert downsample_stream(arrays, 100) is arrays
+
+
+def test_downsample_keeps_channel_alignment():
+    arrays = _arrays()
+    res = downsample_stream(arrays, 200)
+    # 같은 인덱스로 잘랐으면 time 으로 원본 값을 다시 찾을 수 있음
+    idx = res["time"].astype(np.int64)
+    for k, v in res.items():
+        np.testing.assert_array_equal(v, arrays[k][idx])
+
+
+def test_detail_stream_uses_full_data_when_preview_too_small():
+    """채널 합집합으로 저장된 이전 preview 가 요청 포인트보다 적으면 원본에서 다운샘플링"""
+    from adapters.training_adapter import TrainingAdapter
+    from infra.db.orm.models import TrainSessionStream
+    from infra.stream_codec import encode_stream_arrays
+
+    arrays = _arrays(5000)
+    small_preview = {k: v[::100] for k, v in arrays.items()}  # 50 개
+    stream = TrainSessionStream(session_id=uuid4(),
+                                data=encode_stream_arrays(arrays),
+                                preview=encode_stream_arrays(small_preview))
+    adapter = TrainingAdapter(db=None)
+
+    res = adapter._to_stream_data(stream, points=100, channels=["heartrate"])
+    assert len(res.time) == len(res.heartrate) == 100
+    assert res.velocity is None
+
+    # 충분한 preview 는 그대로 사용
+    stream.preview = encode_stream_arrays(downsample_stream(arrays, 300))
+    res = adapter._to_stream_data(stream, points=100, channels=["heartrate"])
+    assert len(res.heartrate) == 100
+    assert len(adapter._to_stream_data(stream, points=300).time) == 300
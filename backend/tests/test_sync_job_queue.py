@@ -0,0 +1,239 @@
+"""
+redis sync 작업 큐 (SyncJobAdapter) + worker 복구 / 취소 테스트 (fakeredis)
+"""
+import asyncio
+from uuid import uuid4
+
+import fakeredis
+import pytest
+
+from adapters.sync_job_adapter import SyncJobAdapter, QUEUE_KEY, PROCESSING_KEY, DELAYED_KEY
+from config.constants import (SYNC_JOB_LEASE_SEC, SYNC_JOB_QUEUED, SYNC_JOB_RUNNING, SYNC_JOB_DONE,
+                              SYNC_JOB_FAILED, SYNC_JOB_MAX_DEFER_SEC, SYNC_JOB_MAX_DEFERS)
+from config.exceptions import RateLimitError
+from interfaces.worker import sync_worker
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def redisdb():
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+
+@pytest.fixture
+def adapter(redisdb):
+    return SyncJobAdapter(db=redisdb)
+
+
+async def _expire_lease(redisdb, job_id:str):
+    """worker 가 죽어 lease 가 만료된 상황"""
+    await redisdb.pexpire(f"sync:lease:{job_id}", 1)
+    await asyncio.sleep(0.01)
+
+
+async def test_enqueue_dedupes_per_user(adapter, redisdb):
+    user_id = uuid4()
+    job = await adapter.enqueue(user_id, start_date=100)
+    assert job.status == SYNC_JOB_QUEUED and job.start_date == 100
+
+    again = await adapter.enqueue(user_id)
+    assert again.job_id == job.job_id
+    assert await redisdb.lrange(QUEUE_KEY, 0, -1) == [job.job_id]
+
+
+async def test_dequeue_moves_to_processing_with_lease(adapter, redisdb):
+    first = await adapter.enqueue(uuid4())
+    second = await adapter.enqueue(uuid4())
+
+    job = await adapter.dequeue(timeout=1)
+    assert job.job_id == first.job_id  # FIFO
+    assert await redisdb.lrange(PROCESSING_KEY, 0, -1) == [first.job_id]
+    assert await redisdb.lrange(QUEUE_KEY, 0, -1) == [second.job_id]
+    assert 0 < await redisdb.ttl(f"sync:lease:{job.job_id}") <= SYNC_JOB_LEASE_SEC
+
+
+async def test_dequeue_empty_returns_none(adapter):
+    assert await adapter.dequeue(timeout=1) is None
+
+
+async def test_recover_skips_live_lease(adapter, redisdb):
+    await adapter.enqueue(uuid4())
+    job = await adapter.dequeue(timeout=1)
+    await adapter.mark_running(job)
+
+    assert await adapter.recover() == 0
+    assert await redisdb.lrange(PROCESSING_KEY, 0, -1) == [job.job_id]
+
+
+async def test_recover_requeues_after_lease_expiry(adapter, redisdb):
+    user_id = uuid4()
+    await adapter.enqueue(user_id)
+    job = await adapter.dequeue(timeout=1)
+    await adapter.mark_running(job)
+    await _expire_lease(redisdb, job.job_id)
+
+    assert await adapter.recover() == 1
+    assert await redisdb.lrange(PROCESSING_KEY, 0, -1) == []
+    assert await redisdb.lrange(QUEUE_KEY, 0, -1) == [job.job_id]
+    assert (await adapter.get_job(job.job_id)).status == SYNC_JOB_QUEUED
+    # 중복 복구 없음 / 다시 등록해도 같은 작업
+    assert await adapter.recover() == 0
+    assert (await adapter.enqueue(user_id)).job_id == job.job_id
+    assert (await adapter.dequeue(timeout=1)).job_id == job.job_id
+
+
+async def test_mark_done_acks_and_releases_user(adapter, redisdb):
+    user_id = uuid4()
+    await adapter.enqueue(user_id)
+    job = await adapter.dequeue(timeout=1)
+    await adapter.mark_done(job)
+
+    assert (await adapter.get_job(job.job_id)).status == SYNC_JOB_DONE
+    assert await redisdb.lrange(PROCESSING_KEY, 0, -1) == []
+    assert await redisdb.exists(f"sync:lease:{job.job_id}") == 0
+    assert (await adapter.enqueue(user_id)).job_id != job.job_id
+
+
+async def test_defer_moves_job_to_delayed_until_due(adapter, redisdb):
+    user_id = uuid4()
+    await adapter.enqueue(user_id)
+    job = await adapter.dequeue(timeout=1)
+
+    assert await adapter.defer(job, delay=600)
+    assert await redisdb.lrange(PROCESSING_KEY, 0, -1) == []
+    assert await redisdb.exists(f"sync:lease:{job.job_id}") == 0
+    stored = await adapter.get_job(job.job_id)
+    assert stored.status == SYNC_JOB_QUEUED and stored.retry_at == job.retry_at
+    # 미뤄진 동안 다시 등록해도 같은 작업
+    assert (await adapter.enqueue(user_id)).job_id == job.job_id
+
+    # 재실행 시각 전에는 대기열로 가지 않음
+    assert await adapter.promote_delayed() == 0
+    assert await redisdb.lrange(QUEUE_KEY, 0, -1) == []
+
+    await redisdb.zadd(DELAYED_KEY, {job.job_id: 0})  # 시각 도래
+    assert await adapter.promote_delayed() == 1
+    assert await redisdb.lrange(QUEUE_KEY, 0, -1) == [job.job_id]
+    assert await adapter.promote_delayed() == 0
+
+
+async def test_defer_refuses_long_or_repeated_waits(adapter):
+    await adapter.enqueue(uuid4())
+    job = await adapter.dequeue(timeout=1)
+
+    assert not await adapter.defer(job, delay=None)
+    assert not await adapter.defer(job, delay=SYNC_JOB_MAX_DEFER_SEC + 1)
+    for _ in range(SYNC_JOB_MAX_DEFERS):
+        assert await adapter.defer(job, delay=1)
+    assert not await adapter.defer(job, delay=1)
+
+
+async def test_rate_limited_job_is_deferred(redisdb, monkeypatch):
+    """stream 호출 한도 초과 -> 작업 실패가 아니라 윈도우 리셋까지 연기"""
+    adapter = SyncJobAdapter(db=redisdb)
+    await adapter.enqueue(uuid4())
+    job = await adapter.dequeue(timeout=1)
+
+    class RateLimitedHandler:
+        def __init__(self, **kwargs):
+            pass
+
+        async def fetch_new_schedules(self, payload, start_date):
+            raise RateLimitError(context="strava rate limit", retry_after=300)
+
+    class Dummy:
+        def __init__(self, **kwargs):
+            pass
+
+    monkeypatch.setattr(sync_worker, "TrainSessionHandler", RateLimitedHandler)
+    monkeypatch.setattr(sync_worker, "StravaAdapter", Dummy)
+    monkeypatch.setattr(sync_worker, "StravaHandler", Dummy)
+
+    await sync_worker._run_job(job=job, job_adapter=adapter, redisdb=redisdb)
+    stored = await adapter.get_job(job.job_id)
+    assert stored.status == SYNC_JOB_QUEUED and stored.retry_at is not None
+    assert await redisdb.zscore(DELAYED_KEY, job.job_id) == stored.retry_at
+
+    # 윈도우를 넘는 대기 (일 한도) 는 실패 처리
+    await redisdb.zrem(DELAYED_KEY, job.job_id)
+    await redisdb.lpush(PROCESSING_KEY, job.job_id)
+    monkeypatch.setattr(RateLimitedHandler, "fetch_new_schedules",
+                        lambda self, payload, start_date: _raise(RateLimitError(retry_after=60 * 60 * 5)))
+    await sync_worker._run_job(job=job, job_adapter=adapter, redisdb=redisdb)
+    assert (await adapter.get_job(job.job_id)).status == SYNC_JOB_FAILED
+    assert await redisdb.lrange(PROCESSING_KEY, 0, -1) == []
+
+
+async def _raise(e:Exception):
+    raise e
+
+
+async def test_worker_recovers_expired_lease_periodically(redisdb, monkeypatch):
+    """worker 가 떠 있는 동안 다른 worker 가 죽어 lease 가 만료되면 재시작 없이 복구"""
+    adapter = SyncJobAdapter(db=redisdb)
+    await adapter.enqueue(uuid4())
+    stuck = await adapter.dequeue(timeout=1)
+    await adapter.mark_running(stuck)
+
+    picked = asyncio.Event()
+
+    async def fake_run_job(job, job_adapter, redisdb):
+        assert job.job_id == stuck.job_id
+        picked.set()
+
+    monkeypatch.setattr(sync_worker, "_run_job", fake_run_job)
+    monkeypatch.setattr(sync_worker, "SYNC_JOB_RECOVER_INTERVAL_SEC", 0)
+
+    original_dequeue = SyncJobAdapter.dequeue
+
+    async def waiting_dequeue(self, timeout:int = 5):
+        await asyncio.sleep(0.01)  # fakeredis blmove 는 대기하지 않음. 이벤트 루프 양보
+        return await original_dequeue(self, timeout=timeout)
+
+    monkeypatch.setattr(SyncJobAdapter, "dequeue", waiting_dequeue)
+
+    worker = asyncio.create_task(sync_worker.run_sync_worker(redisdb))
+    try:
+        await asyncio.sleep(0.1)
+        assert not picked.is_set()  # lease 살아있는 동안은 건드리지 않음
+        await _expire_lease(redisdb, stuck.job_id)
+        await asyncio.wait_for(picked.wait(), timeout=3)
+    finally:
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+
+
+async def test_cancelled_job_is_requeued(redisdb, monkeypatch):
+    """종료 (SIGTERM -> task cancel) 시 실행중 작업은 대기열로 돌아감"""
+    adapter = SyncJobAdapter(db=redisdb)
+    await adapter.enqueue(uuid4())
+    job = await adapter.dequeue(timeout=1)
+    started = asyncio.Event()
+
+    class BlockingHandler:
+        def __init__(self, **kwargs):
+            pass
+
+        async def fetch_new_schedules(self, payload, start_date):
+            started.set()
+            await asyncio.Event().wait()
+
+    class Dummy:
+        def __init__(self, **kwargs):
+            pass
+
+    monkeypatch.setattr(sync_worker, "TrainSessionHandler", BlockingHandler)
+    monkeypatch.setattr(sync_worker, "StravaAdapter", Dummy)
+    monkeypatch.setattr(sync_worker, "StravaHandler", Dummy)
+
+    task = asyncio.create_task(sync_worker._run_job(job=job, job_adapter=adapter, redisdb=redisdb))
+    await asyncio.wait_for(started.wait(), timeout=3)
+    assert (await adapter.get_job(job.job_id)).status == SYNC_JOB_RUNNING
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert task.cancelled()
+    assert (await adapter.get_job(job.job_id)).status == SYNC_JOB_QUEUED
+    assert await redisdb.lrange(PROCESSING_KEY, 0, -1) == []
+    assert await redisdb.lrange(QUEUE_KEY, 0, -1) == [job.job_id]
@@ -0,0 +1,165 @@
+"""
+훈련 세션 etag 테스트 (fakeredis)
+- If-None-Match 비교 (weak, 콤마 목록)
+- 스케줄: 조회 기간(window)별 etag / 응답 캐시, 버전 증가 후 내용 비교
+- 세션 lap / stream: 세션별 버전, 삭제시 버전 제거
+"""
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import fakeredis
+import pytest
+
+from adapters import RedisAdapter
+from infra.etag import etag_matches, session_part_etag
+from schemas.models import TokenPayload, TrainResponse, LapData
+from use_cases.train_session.handle_train_session import TrainSessionHandler
+from config.constants import ETAG_TRAIN_SESSION
+from config.exceptions import NotModifiedError, NotFoundError
+
+pytestmark = pytest.mark.anyio
+
+WINDOW = 1_700_000_000
+OTHER_WINDOW = WINDOW - 86400
+
+
+@pytest.mark.parametrize("if_none_match, matched", [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('abc', True),
+    ('"x", W/"abc"', True),
+    ('*', True),
+    ('"x", "y"', False),
+    (None, False),
+])
+def test_etag_matches(if_none_match, matched):
+    assert etag_matches(if_none_match, '"abc"') is matched
+    assert etag_matches(if_none_match, 'W/"abc"') is matched
+
+
+class _TrainingAdapter:
+    """조회 기간별 세션 목록 + 세션 lap. 호출 기록"""
+    def __init__(self):
+        self.sessions = {}
+        self.laps = {}
+        self.calls = []
+
+    async def get_sessions_by_date(self, user_id, start_date=None, replica=False):
+        self.calls.append(("sessions", start_date))
+        return list(self.sessions.get(start_date, []))
+
+    async def get_session_laps(self, user_id, session_id):
+        self.calls.append(("laps", session_id))
+        if session_id not in self.laps:
+            raise NotFoundError(detail="session not found")
+        return self.laps[session_id]
+
+    async def delete_session(self, user_id, session_id):
+        self.laps.pop(session_id, None)
+        return True
+
+
+@pytest.fixture
+def adapter():
+    return _TrainingAdapter()
+
+
+@pytest.fixture
+def handler(adapter):
+    return TrainSessionHandler(data_adapter=None, db_adapter=adapter, auth_handler=None,
+                               redis_adapter=RedisAdapter(db=fakeredis.FakeAsyncRedis(decode_responses=True)))
+
+
+@pytest.fixture
+def payload():
+    return TokenPayload(user_id=uuid4(), exp=0, iat=0)
+
+
+def _session(distance:float) -> TrainResponse:
+    return TrainResponse(session_id=uuid4(), train_date=datetime(2025, 5, 1, tzinfo=timezone.utc),
+                         distance=distance)
+
+
+# ------------------------
+# 스케줄 (기간별)
+# ------------------------
+async def test_schedule_etag_is_keyed_by_window(handler, adapter, payload):
+    adapter.sessions = {WINDOW: [_session(5000.0)], OTHER_WINDOW: [_session(8000.0)]}
+    first = await handler.get_schedules(payload=payload, start_date=WINDOW)
+    other = await handler.get_schedules(payload=payload, start_date=OTHER_WINDOW)
+    assert first.etag != other.etag
+    assert len(adapter.calls) == 2
+
+    # 같은 기간 + 같은 버전: db 조회 없이 304 (weak / 목록 형태도 매칭)
+    for if_none_match in (first.etag, f'W/"{first.etag}"', f'"stale", "{first.etag}"'):
+        with pytest.raises(NotModifiedError):
+            await handler.get_schedules(payload=payload, etag=if_none_match, start_date=WINDOW)
+    # 다른 기간 etag 로는 304 아님. 저장된 응답 본문 반환 (db 조회 없음)
+    res = await handler.get_schedules(payload=payload, etag=other.etag, start_date=WINDOW)
+    assert res == first
+    assert len(adapter.calls) == 2
+
+
+async def test_schedule_etag_after_version_bump(handler, adapter, payload):
+    adapter.sessions = {WINDOW: [_session(5000.0)], OTHER_WINDOW: [_session(8000.0)]}
+    first = await handler.get_schedules(payload=payload, start_date=WINDOW)
+
+    # 다른 기간만 바뀐 쓰기 (버전 증가): db 재조회 후 내용이 같으면 304
+    adapter.sessions[OTHER_WINDOW].append(_session(3000.0))
+    await handler.redis_adapter.incr_etag_version(user_id=payload.user_id, page=ETAG_TRAIN_SESSION)
+    with pytest.raises(NotModifiedError):
+        await handler.get_schedules(payload=payload, etag=f'W/"{first.etag}"', start_date=WINDOW)
+    assert adapter.calls.count(("sessions", WINDOW)) == 2
+
+    # 이 기간이 바뀐 쓰기: 새 etag 로 200
+    adapter.sessions[WINDOW].append(_session(10000.0))
+    await handler.redis_adapter.incr_etag_version(user_id=payload.user_id, page=ETAG_TRAIN_SESSION)
+    res = await handler.get_schedules(payload=payload, etag=first.etag, start_date=WINDOW)
+    assert res.etag != first.etag
+    assert len(res.data) == 2
+
+
+# ------------------------
+# 세션 lap / stream (세션별 버전)
+# ------------------------
+async def test_session_laps_etag_uses_session_version(handler, adapter, payload):
+    session_id = uuid4()
+    adapter.laps[session_id] = ("v1", [LapData(lap_index=0, distance=1000.0, elapsed_time=300,
+                                               average_speed=3.3, max_speed=4.0)])
+    etag, laps = await handler.get_schedule_laps(payload=payload, session_id=session_id)
+    assert etag == session_part_etag("v1", "laps")
+    assert len(adapter.calls) == 1
+
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}'):
+        with pytest.raises(NotModifiedError):
+            await handler.get_schedule_laps(payload=payload, session_id=session_id, etag=if_none_match)
+    assert len(adapter.calls) == 1
+
+    # 다른 사용자는 같은 etag 라도 버전이 없어 db 조회 (소유권 확인)
+    other = TokenPayload(user_id=uuid4(), exp=0, iat=0)
+    await handler.get_schedule_laps(payload=other, session_id=session_id, etag=etag)
+    assert len(adapter.calls) == 2
+
+
+async def test_session_stream_etag_is_per_params(handler, payload):
+    session_id = uuid4()
+    await handler._set_session_version(payload=payload, session_id=session_id, version="v1")
+    etag = session_part_etag("v1", "stream", 100, ["heartrate"])
+    with pytest.raises(NotModifiedError):
+        await handler._check_session_etag(payload=payload, session_id=session_id, etag=f"W/{etag}",
+                                          part="stream", params=(100, ["heartrate"]))
+    # points 가 다르면 다른 etag
+    await handler._check_session_etag(payload=payload, session_id=session_id, etag=etag,
+                                      part="stream", params=(200, ["heartrate"]))
+
+
+async def test_delete_removes_session_version(handler, adapter, payload):
+    session_id = uuid4()
+    adapter.laps[session_id] = ("v1", [])
+    etag, _ = await handler.get_schedule_laps(payload=payload, session_id=session_id)
+
+    await handler.delete_schedule(payload=payload, session_id=session_id)
+    # 삭제 후에는 이전 etag 로 304 를 주지 않고 db 에서 확인 (404)
+    with pytest.raises(NotFoundError):
+        await handler.get_schedule_laps(payload=payload, session_id=session_id, etag=etag)
+    assert adapter.calls[-1] == ("laps", session_id)
@@ -118,6 +118,19 @@ export async function fetchTrainDetail(session_id: string) {
   return fetchWithAuth(`${API_BASE_URL}/trainsession/${session_id}`);
 }
 
+// Fetch train session laps (GET /trainsession/{session_id}/laps). 브라우저 캐시 + ETag 재검증
+export async function fetchTrainLaps(session_id: string) {
+  return fetchWithAuth(`${API_BASE_URL}/trainsession/${session_id}/laps`);
+}
+
+// Fetch train session stream (GET /trainsession/{session_id}/stream)
+export async function fetchTrainStream(session_id: string, points?: number, channels?: string[]) {
+  const url = new URL(`${API_BASE_URL}/trainsession/${session_id}/stream`);
+  if (points) url.searchParams.append('points', points.toString());
+  if (channels && channels.length) url.searchParams.append('channels', channels.join(','));
+  return fetchWithAuth(url.toString());
+}
+
 
 // Fetch train schedules (GET /trainsession/fetch-schedules)
 export async function fetchSchedules(date?: number, etag?: string) {
@@ -137,15 +150,36 @@ export async function fetchSchedules(date?: number, etag?: string) {
   return { notModified: false, ...data };
 }
 
+// sync 작업 상태 polling 간격 / 최대 대기시간
+const SYNC_POLL_INTERVAL_MS = 1000;
+const SYNC_POLL_TIMEOUT_MS = 3 * 60 * 1000;
+
 // Fetch new schedules (GET /trainsession/fetch-new-schedules)
+// 서버는 sync 작업을 등록하고 job 을 반환. 완료될 때까지 상태 polling (최대 SYNC_POLL_TIMEOUT_MS)
 export async function fetchNewSchedules(date?: number) {
   const url = new URL(`${API_BASE_URL}/trainsession/fetch-new-schedules`);
   if (date) url.searchParams.append('date', date.toString());
     
-    const {status, data} = await fetchWithAuth(url.toString())
+  const {status, data} = await fetchWithAuth(url.toString())
 
   if (status == 404) throw new Error("no connected party to fetch from");
-  return data;
+  if (!data?.job_id) return data;
+
+  let job = data;
+  const deadline = Date.now() + SYNC_POLL_TIMEOUT_MS;
+  while (job.status === "queued" || job.status === "running") {
+    if (Date.now() >= deadline) throw new Error("sync is taking too long. please try again later");
+    // strava 호출 한도 초과로 미뤄진 작업. 서버에서 자동으로 이어서 실행
+    if (job.retry_at && job.retry_at * 1000 > Date.now()) {
+      throw new Error("strava rate limit reached. sync will resume automatically in a few minutes");
+    }
+    await new Promise(resolve => setTimeout(resolve, SYNC_POLL_INTERVAL_MS));
+    const res = await fetchWithAuth(`${API_BASE_URL}/trainsession/sync-jobs/${job.job_id}`);
+    if (res.status !== 200) throw new Error("failed to fetch sync status");
+    job = res.data;
+  }
+  if (job.status === "failed") throw new Error(job.error || "sync failed");
+  return true;
 }
 
 // Upload new train session (POST /trainsession/upload)
@@ -254,8 +288,12 @@ export async function connectStrava() {
 
 
 // Feed API
-export async function fetchFeeds(pageSize: number = 5, pageNumber: number = 1) {
-  return fetchWithAuth(`${API_BASE_URL}/feed/?page_number=${pageNumber}&page_size=${pageSize}`);
+// cursor: 이전 응답의 next_cursor (첫 페이지는 생략)
+export async function fetchFeeds(pageSize: number = 5, cursor?: string | null) {
+  const url = new URL(`${API_BASE_URL}/feed/`);
+  url.searchParams.append('page_size', pageSize.toString());
+  if (cursor) url.searchParams.append('cursor', cursor);
+  return fetchWithAuth(url.toString());
 }
 
 export async function likeFeed(feed_id: string) {
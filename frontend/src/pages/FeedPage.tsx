@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
 import { fetchFeeds, likeFeed, unlikeFeed, deleteFeed } from '../api';
-import type { FeedResponse } from '../types';
+import type { FeedResponse, FeedLikeResponse } from '../types';
 
 interface FeedPageProps {
     user: any; // 나중에 구체적인 타입으로 바꾸는 게 좋음
@@ -13,6 +13,9 @@ const FeedPage: React.FC<FeedPageProps> = ({user}) => {
   const [error, setError] = useState<string | null>(null);
   const [page, setPage] = useState(1);
   const [pageSize] = useState(5);
+  // cursors[i] = i+1 페이지 요청 cursor. 첫 페이지는 null
+  const [cursors, setCursors] = useState<(string | null)[]>([null]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
 
   useEffect(() => {
     loadFeeds();
@@ -23,8 +26,11 @@ const FeedPage: React.FC<FeedPageProps> = ({user}) => {
     setLoading(true);
     setError(null);
     try {
-      const { status, data } = await fetchFeeds(pageSize, page);
-      if (status === 200) setFeeds(data);
+      const { status, data } = await fetchFeeds(pageSize, cursors[page - 1]);
+      if (status === 200) {
+        setFeeds(data.data);
+        setNextCursor(data.next_cursor ?? null);
+      }
       else setError('Failed to fetch feeds');
     } catch (e: any) {
       setError(e.message || 'Failed to fetch feeds');
@@ -33,10 +39,23 @@ const FeedPage: React.FC<FeedPageProps> = ({user}) => {
     }
   };
 
+  const goNext = () => {
+    if (!nextCursor) return;
+    setCursors([...cursors.slice(0, page), nextCursor]);
+    setPage(page + 1);
+  };
+
+  // 좋아요 응답(likes_count, my_like)만 반영. 목록 재조회 없음
+  const applyLike = (res: FeedLikeResponse) => {
+    setFeeds(feeds.map(f => f.feed_id === res.feed_id
+      ? { ...f, likes_count: res.likes_count, my_like: res.my_like }
+      : f));
+  };
+
   const handleLike = async (feed_id: string) => {
     try {
-      await likeFeed(feed_id);
-      loadFeeds();
+      const { status, data } = await likeFeed(feed_id);
+      if (status === 200) applyLike(data);
     } catch (e) {
       setError('Failed to like feed');
     }
@@ -44,8 +63,8 @@ const FeedPage: React.FC<FeedPageProps> = ({user}) => {
 
   const handleUnlike = async (feed_id: string) => {
     try {
-      await unlikeFeed(feed_id);
-      loadFeeds();
+      const { status, data } = await unlikeFeed(feed_id);
+      if (status === 200) applyLike(data);
     } catch (e) {
       setError('Failed to unlike feed');
     }
@@ -117,7 +136,7 @@ const FeedPage: React.FC<FeedPageProps> = ({user}) => {
               <div style={{ display: 'flex', justifyContent: 'center', gap: 10, marginTop: 20 }}>
                 <button className="btn" onClick={() => setPage(page - 1)} disabled={page === 1}>Prev</button>
                 <span>Page {page}</span>
-                <button className="btn" onClick={() => setPage(page + 1)} disabled={feeds.length < pageSize}>Next</button>
+                <button className="btn" onClick={goNext} disabled={!nextCursor}>Next</button>
               </div>
             </>
           )}
@@ -11,6 +11,15 @@ export interface FeedResponse {
   likes_count: number;
   my_like: boolean;
 }
+export interface FeedLikeResponse {
+  feed_id: string;
+  likes_count: number;
+  my_like: boolean;
+}
+export interface FeedPageResponse {
+  data: FeedResponse[];
+  next_cursor?: string | null;
+}
 // ConnectPage
 export interface ConnectPageProps {
 //   user: any;